@@ -14,6 +14,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import integration_platform
 from homeassistant.helpers.device_registry import DeviceEntry, async_get
+from homeassistant.helpers.entity import async_get_write_stats
 from homeassistant.helpers.json import ExtendedJSONEncoder
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util.json import (
@@ -187,6 +188,10 @@ class DownloadDiagnosticsView(http.HomeAssistantView):
             if info[d_type.value] is None:
                 return web.Response(status=HTTPStatus.NOT_FOUND)
             data = await info[d_type.value](hass, config_entry)
+            if isinstance(data, dict) and (
+                write_stats := async_get_write_stats(hass, config_entry.entry_id)
+            ):
+                data = {**data, "entity_write_stats": write_stats}
             filename = f"{d_type}-{filename}"
             return _get_json_file_response(data, filename, d_type.value, d_id)
 
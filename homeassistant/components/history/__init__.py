@@ -1,10 +1,12 @@
 """Provide pre-made queries on top of the recorder component."""
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Iterable
 from datetime import datetime as dt, timedelta
 from http import HTTPStatus
 import logging
+import threading
 import time
 from typing import cast
 
@@ -20,7 +22,13 @@ from homeassistant.components.recorder.statistics import (
     statistics_during_period,
 )
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.const import CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE
+from homeassistant.const import (
+    CONF_DOMAINS,
+    CONF_ENTITIES,
+    CONF_EXCLUDE,
+    CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
+)
 from homeassistant.core import HomeAssistant
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.deprecation import deprecated_class, deprecated_function
@@ -28,6 +36,7 @@ from homeassistant.helpers.entityfilter import (
     CONF_ENTITY_GLOBS,
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
 )
+from homeassistant.helpers.json import json_bytes
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
@@ -38,6 +47,9 @@ _LOGGER = logging.getLogger(__name__)
 DOMAIN = "history"
 CONF_ORDER = "use_include_order"
 
+# The number of encoded entities that may wait to be sent to a client
+STREAM_QUEUE_SIZE = 10
+
 GLOB_TO_SQL_CHARS = {
     42: "%",  # *
     46: "_",  # .
@@ -186,7 +198,7 @@ class HistoryPeriodView(HomeAssistantView):
 
     async def get(
         self, request: web.Request, datetime: str | None = None
-    ) -> web.Response:
+    ) -> web.StreamResponse:
         """Return history over a period of time."""
         datetime_ = None
         if datetime and (datetime_ := dt_util.parse_datetime(datetime)) is None:
@@ -221,6 +233,14 @@ class HistoryPeriodView(HomeAssistantView):
 
         minimal_response = "minimal_response" in request.query
 
+        max_points = None
+        if (max_points_str := request.query.get("max_points")) is not None:
+            if (
+                not max_points_str.isdigit()
+                or (max_points := int(max_points_str)) < history.MIN_POINTS
+            ):
+                return self.json_message("Invalid max_points", HTTPStatus.BAD_REQUEST)
+
         hass = request.app["hass"]
 
         if (
@@ -230,6 +250,20 @@ class HistoryPeriodView(HomeAssistantView):
         ):
             return self.json([])
 
+        # The include order can only be applied once all entities are known
+        if "stream" in request.query and not (self.filters and self.use_include_order):
+            return await self._async_stream_significant_states_json(
+                request,
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                max_points,
+            )
+
         return cast(
             web.Response,
             await hass.async_add_executor_job(
@@ -241,6 +275,7 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                max_points,
             ),
         )
 
@@ -253,6 +288,7 @@ class HistoryPeriodView(HomeAssistantView):
         include_start_time_state,
         significant_changes_only,
         minimal_response,
+        max_points,
     ):
         """Fetch significant stats from the database as json."""
         timer_start = time.perf_counter()
@@ -268,6 +304,7 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                max_points,
             )
 
         result = list(result.values())
@@ -290,6 +327,104 @@ class HistoryPeriodView(HomeAssistantView):
 
         return self.json(result)
 
+    async def _async_stream_significant_states_json(
+        self,
+        request: web.Request,
+        hass: HomeAssistant,
+        start_time: dt,
+        end_time: dt,
+        entity_ids: list[str] | None,
+        include_start_time_state: bool,
+        significant_changes_only: bool,
+        minimal_response: bool,
+        max_points: int | None,
+    ) -> web.StreamResponse:
+        """Stream significant states from the database as json.
+
+        The states are read in the executor one entity at a time and
+        written to the client as soon as they are encoded, so only the states
+        of a few entities are held in memory at a time.
+
+        The response is only started once the first states are read, so
+        errors reading them are answered like for the buffered response.
+        Errors after that abort the response.
+        """
+        to_write: asyncio.Queue[bytes | None] = asyncio.Queue(STREAM_QUEUE_SIZE)
+        stop = threading.Event()
+
+        def _put(chunk: bytes | None) -> None:
+            """Queue a chunk for the client, waiting while the queue is full."""
+            asyncio.run_coroutine_threadsafe(to_write.put(chunk), hass.loop).result()
+
+        def _stream_significant_states() -> None:
+            """Fetch and encode the states of each entity."""
+            timer_start = time.perf_counter()
+            try:
+                with session_scope(hass=hass) as session:
+                    for ent_results in history.stream_significant_states_with_session(
+                        hass,
+                        session,
+                        start_time,
+                        end_time,
+                        entity_ids,
+                        self.filters,
+                        include_start_time_state,
+                        significant_changes_only,
+                        minimal_response,
+                        max_points,
+                    ):
+                        _put(json_bytes(ent_results))
+                        if stop.is_set():
+                            return
+            finally:
+                _put(None)
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    elapsed = time.perf_counter() - timer_start
+                    _LOGGER.debug("Streamed states in %fs", elapsed)
+
+        producer = hass.async_add_executor_job(_stream_significant_states)
+        response: web.StreamResponse | None = None
+        separator = b"["
+        try:
+            while (chunk := await to_write.get()) is not None:
+                if response is None:
+                    response = await self._async_prepare_stream(request)
+                await response.write(separator + chunk)
+                separator = b","
+        except (asyncio.CancelledError, ConnectionResetError):
+            _LOGGER.debug("History stream closed by the client")
+            stop.set()
+            # Unblock the producer if it is waiting to queue a chunk
+            while await to_write.get() is not None:
+                pass
+            raise
+
+        try:
+            await producer
+        except Exception:
+            if response is not None:
+                # The status was sent, leave the array open and close the
+                # connection so the client sees the response is incomplete
+                _LOGGER.exception("Error streaming history, aborting the response")
+                if request.transport is not None:
+                    request.transport.close()
+            raise
+
+        if response is None:
+            response = await self._async_prepare_stream(request)
+        await response.write(b"[]" if separator == b"[" else b"]")
+        await response.write_eof()
+        return response
+
+    @staticmethod
+    async def _async_prepare_stream(request: web.Request) -> web.StreamResponse:
+        """Start streaming a JSON response."""
+        response = web.StreamResponse()
+        response.content_type = CONTENT_TYPE_JSON
+        response.enable_compression()
+        await response.prepare(request)
+        return response
+
 
 def sqlalchemy_filter_from_include_exclude_conf(conf: ConfigType) -> Filters | None:
     """Build a sql filter from config."""
@@ -3,14 +3,13 @@ from __future__ import annotations
 
 from ast import literal_eval
 import asyncio
+from collections import deque
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 import datetime as dt
-from functools import lru_cache, partial, wraps
+from functools import partial, wraps
 import inspect
-from itertools import groupby
 import logging
-from operator import attrgetter
 import ssl
 import time
 from typing import Any, Union, cast
@@ -97,6 +96,7 @@ from .models import (
     ReceiveMessage,
     ReceivePayloadType,
 )
+from .topic_trie import TopicTrie
 from .util import _VALID_QOS_SCHEMA, valid_publish_topic, valid_subscribe_topic
 
 _LOGGER = logging.getLogger(__name__)
@@ -133,6 +133,8 @@ CONNECTION_FAILED = "connection_failed"
 CONNECTION_FAILED_RECOVERABLE = "connection_failed_recoverable"
 
 DISCOVERY_COOLDOWN = 2
+SUBSCRIBE_COOLDOWN = 0.1
+MAX_SUBSCRIBES_PER_CALL = 500
 TIMEOUT_ACK = 10
 
 PLATFORMS = [
@@ -587,6 +589,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     websocket_api.async_register_command(hass, websocket_subscribe)
     websocket_api.async_register_command(hass, websocket_remove_device)
     websocket_api.async_register_command(hass, websocket_mqtt_info)
+    websocket_api.async_register_command(hass, websocket_message_statistics)
 
     if conf is None:
         # If we have a config entry, setup is done by that config entry.
@@ -751,7 +754,6 @@ class Subscription:
     """Class to hold data about an active subscription."""
 
     topic: str = attr.ib()
-    matcher: Any = attr.ib()
     job: HassJob = attr.ib()
     qos: int = attr.ib(default=0)
     encoding: str | None = attr.ib(default="utf-8")
@@ -775,6 +777,7 @@ class MQTT:
         self.config_entry = config_entry
         self.conf = conf
         self.subscriptions: list[Subscription] = []
+        self._subscription_trie: TopicTrie[Subscription] = TopicTrie()
         self.connected = False
         self._ha_started = asyncio.Event()
         self._last_subscribe = time.time()
@@ -782,6 +785,16 @@ class MQTT:
         self._paho_lock = asyncio.Lock()
 
         self._pending_operations: dict[str, asyncio.Event] = {}
+        # Topics to (un)subscribe with the next SUBSCRIBE and UNSUBSCRIBE
+        self._pending_subscribes: set[str] = set()
+        self._pending_unsubscribes: set[str] = set()
+        self._subscribe_task: asyncio.Task | None = None
+        # Resolved once the broker acknowledged the next (un)subscriptions
+        self._subscribe_future: asyncio.Future[None] | None = None
+        # Messages received by paho with the time they were received
+        self._pending_messages: deque[tuple[Any, float]] = deque()
+        self._messages_scheduled = False
+        self._message_statistics = debug_info.message_statistics(hass)
 
         if self.hass.state == CoreState.running:
             self._ha_started.set()
@@ -948,16 +961,15 @@ class MQTT:
         if not isinstance(topic, str):
             raise HomeAssistantError("Topic needs to be a string!")
 
-        subscription = Subscription(
-            topic, _matcher_for_topic(topic), HassJob(msg_callback), qos, encoding
-        )
+        subscription = Subscription(topic, HassJob(msg_callback), qos, encoding)
         self.subscriptions.append(subscription)
-        self._matching_subscriptions.cache_clear()
+        self._subscription_trie.add(topic, subscription)
 
         # Only subscribe if currently connected.
         if self.connected:
             self._last_subscribe = time.time()
-            await self._async_perform_subscription(topic, qos)
+            self._async_queue_subscribe(topic)
+            await self._async_wait_for_subscriptions()
 
         @callback
         def async_remove() -> None:
@@ -965,42 +977,130 @@ class MQTT:
             if subscription not in self.subscriptions:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
-            self._matching_subscriptions.cache_clear()
+            self._subscription_trie.remove(topic, subscription)
 
-            if any(other.topic == topic for other in self.subscriptions):
+            if self._subscription_trie.has_topic_filter(topic):
                 # Other subscriptions on topic remaining - don't unsubscribe.
                 return
 
             # Only unsubscribe if currently connected.
             if self.connected:
-                self.hass.async_create_task(self._async_unsubscribe(topic))
+                self._async_queue_unsubscribe(topic)
 
         return async_remove
 
-    async def _async_unsubscribe(self, topic: str) -> None:
-        """Unsubscribe from a topic.
+    @callback
+    def _async_queue_subscribe(self, topic: str) -> None:
+        """Subscribe to a topic with the next SUBSCRIBE."""
+        self._pending_unsubscribes.discard(topic)
+        self._pending_subscribes.add(topic)
+        self._async_schedule_subscriptions()
 
-        This method is a coroutine.
-        """
-        async with self._paho_lock:
-            result: int | None = None
-            result, mid = await self.hass.async_add_executor_job(
-                self._mqttc.unsubscribe, topic
+    @callback
+    def _async_queue_unsubscribe(self, topic: str) -> None:
+        """Unsubscribe from a topic with the next UNSUBSCRIBE."""
+        self._pending_subscribes.discard(topic)
+        self._pending_unsubscribes.add(topic)
+        self._async_schedule_subscriptions()
+
+    async def _async_wait_for_subscriptions(self) -> None:
+        """Wait for the broker to acknowledge the queued (un)subscriptions."""
+        if self._subscribe_future is None:
+            self._subscribe_future = self.hass.loop.create_future()
+        # Other subscribers wait for the same batch
+        await asyncio.shield(self._subscribe_future)
+
+    @callback
+    def _async_schedule_subscriptions(self) -> None:
+        """Schedule sending the queued (un)subscriptions."""
+        if self._subscribe_task is None:
+            self._subscribe_task = self.hass.async_create_task(
+                self._async_perform_subscriptions()
             )
-            _LOGGER.debug("Unsubscribing from %s, mid: %s", topic, mid)
-            _raise_on_error(result)
-        await self._wait_for_mid(mid)
 
-    async def _async_perform_subscription(self, topic: str, qos: int) -> None:
-        """Perform a paho-mqtt subscription."""
+    async def _async_perform_subscriptions(self) -> None:
+        """Send the (un)subscriptions queued during the cooldown.
+
+        Entities subscribe to their topics one by one while being set up,
+        coalescing them saves a round trip to the broker for each topic.
+        """
+        await asyncio.sleep(SUBSCRIBE_COOLDOWN)
         async with self._paho_lock:
-            result: int | None = None
-            result, mid = await self.hass.async_add_executor_job(
-                self._mqttc.subscribe, topic, qos
-            )
-            _LOGGER.debug("Subscribing to %s, mid: %s", topic, mid)
-            _raise_on_error(result)
-        await self._wait_for_mid(mid)
+            # Later (un)subscriptions are sent with the next batch
+            self._subscribe_task = None
+            future = self._subscribe_future
+            self._subscribe_future = None
+            pending_subscribes = self._pending_subscribes
+            pending_unsubscribes = self._pending_unsubscribes
+            self._pending_subscribes = set()
+            self._pending_unsubscribes = set()
+
+            # A topic is subscribed again for each new subscription, for the
+            # broker to send its retained messages again
+            subscriptions = [
+                # Subscribe with the highest requested qos
+                (topic, max(subscription.qos for subscription in subs))
+                for topic in sorted(pending_subscribes)
+                if (subs := self._subscription_trie.get(topic))
+            ]
+            unsubscribes = sorted(pending_unsubscribes)
+
+            mids = []
+            sent_subscribes = sent_unsubscribes = 0
+            error: HomeAssistantError | None = None
+            try:
+                while sent_subscribes < len(subscriptions):
+                    chunk = subscriptions[
+                        sent_subscribes : sent_subscribes + MAX_SUBSCRIBES_PER_CALL
+                    ]
+                    result, mid = await self.hass.async_add_executor_job(
+                        self._mqttc.subscribe, chunk
+                    )
+                    _LOGGER.debug("Subscribing to %s, mid: %s", chunk, mid)
+                    _raise_on_error(result)
+                    mids.append(mid)
+                    sent_subscribes += len(chunk)
+                while sent_unsubscribes < len(unsubscribes):
+                    topics = unsubscribes[
+                        sent_unsubscribes : sent_unsubscribes + MAX_SUBSCRIBES_PER_CALL
+                    ]
+                    result, mid = await self.hass.async_add_executor_job(
+                        self._mqttc.unsubscribe, topics
+                    )
+                    _LOGGER.debug("Unsubscribing from %s, mid: %s", topics, mid)
+                    _raise_on_error(result)
+                    mids.append(mid)
+                    sent_unsubscribes += len(topics)
+            except HomeAssistantError as err:
+                error = err
+                _LOGGER.error(
+                    "Failed to send MQTT (un)subscriptions, "
+                    "they are sent again with the next ones: %s",
+                    err,
+                )
+                # Queue the unsent ones again unless they were changed since
+                for topic, _ in subscriptions[sent_subscribes:]:
+                    if topic not in self._pending_unsubscribes:
+                        self._pending_subscribes.add(topic)
+                for topic in unsubscribes[sent_unsubscribes:]:
+                    if topic not in self._pending_subscribes:
+                        self._pending_unsubscribes.add(topic)
+        await asyncio.gather(*(self._wait_for_mid(mid) for mid in mids))
+        if future is None:
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(None)
+
+    @callback
+    def _async_resubscribe(self) -> None:
+        """Subscribe again to the topics of all subscriptions."""
+        self._pending_unsubscribes.clear()
+        for subscription in self.subscriptions:
+            self._pending_subscribes.add(subscription.topic)
+        if self._pending_subscribes:
+            self._async_schedule_subscriptions()
 
     def _mqtt_on_connect(self, _mqttc, _userdata, _flags, result_code: int) -> None:
         """On connect callback.
@@ -1027,12 +1127,7 @@ class MQTT:
             result_code,
         )
 
-        # Group subscriptions to only re-subscribe once for each topic.
-        keyfunc = attrgetter("topic")
-        for topic, subs in groupby(sorted(self.subscriptions, key=keyfunc), keyfunc):
-            # Re-subscribe with the highest requested qos
-            max_qos = max(subscription.qos for subscription in subs)
-            self.hass.add_job(self._async_perform_subscription, topic, max_qos)
+        self.hass.loop.call_soon_threadsafe(self._async_resubscribe)
 
         if (
             CONF_BIRTH_MESSAGE in self.conf
@@ -1055,44 +1150,77 @@ class MQTT:
             )
 
     def _mqtt_on_message(self, _mqttc, _userdata, msg) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
 
-    @lru_cache(2048)
-    def _matching_subscriptions(self, topic):
-        subscriptions = []
-        for subscription in self.subscriptions:
-            if subscription.matcher(topic):
-                subscriptions.append(subscription)
-        return subscriptions
+        The event loop is woken up once for all messages received until it
+        gets to handle them.
+        """
+        self._pending_messages.append((msg, time.monotonic()))
+        if not self._messages_scheduled:
+            self._messages_scheduled = True
+            self.hass.loop.call_soon_threadsafe(self._async_handle_messages)
+
+    @callback
+    def _async_handle_messages(self) -> None:
+        """Handle the messages received since the previous batch."""
+        # Reset before taking the messages, messages received from now
+        # on schedule the next batch
+        self._messages_scheduled = False
+        pending = self._pending_messages
+        if not (size := len(pending)):
+            return
+        now = time.monotonic()
+        max_latency = now - pending[0][1]
+        total_latency = 0.0
+        for _ in range(size):
+            msg, received = pending.popleft()
+            total_latency += now - received
+            try:
+                self._mqtt_handle_message(msg)
+            except Exception:  # pylint: disable=broad-except
+                # Keep handling the rest of the batch
+                _LOGGER.exception("Error handling MQTT message on %s", msg.topic)
+        self._message_statistics.add_batch(size, total_latency, max_latency)
+
+    def _matching_subscriptions(self, topic: str) -> list[Subscription]:
+        """Return the subscriptions matching a topic."""
+        return self._subscription_trie.match(topic)
 
     @callback
     def _mqtt_handle_message(self, msg) -> None:
-        _LOGGER.debug(
-            "Received message on %s%s: %s",
-            msg.topic,
-            " (retained)" if msg.retain else "",
-            msg.payload[0:8192],
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Received message on %s%s: %s",
+                msg.topic,
+                " (retained)" if msg.retain else "",
+                msg.payload[0:8192],
+            )
         timestamp = dt_util.utcnow()
 
         subscriptions = self._matching_subscriptions(msg.topic)
 
+        # The payload decoded with each encoding, None if it can't be decoded
+        payloads: dict[str | None, SubscribePayloadType | None] = {None: msg.payload}
         for subscription in subscriptions:
 
-            payload: SubscribePayloadType = msg.payload
-            if subscription.encoding is not None:
+            encoding = subscription.encoding
+            if encoding in payloads:
+                payload = payloads[encoding]
+            else:
                 try:
-                    payload = msg.payload.decode(subscription.encoding)
+                    payload = msg.payload.decode(encoding)
                 except (AttributeError, UnicodeDecodeError):
-                    _LOGGER.warning(
-                        "Can't decode payload %s on %s with encoding %s (for %s)",
-                        msg.payload[0:8192],
-                        msg.topic,
-                        subscription.encoding,
-                        subscription.job,
-                    )
-                    continue
+                    payload = None
+                payloads[encoding] = payload
+            if payload is None:
+                _LOGGER.warning(
+                    "Can't decode payload %s on %s with encoding %s (for %s)",
+                    msg.payload[0:8192],
+                    msg.topic,
+                    encoding,
+                    subscription.job,
+                )
+                continue
 
             self.hass.async_run_hass_job(
                 subscription.job,
@@ -1176,16 +1304,6 @@ def _raise_on_error(result_code: int | None) -> None:
         )
 
 
-def _matcher_for_topic(subscription: str) -> Any:
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-
-    return lambda topic: next(matcher.iter_match(topic), False)
-
-
 @websocket_api.websocket_command(
     {vol.Required("type"): "mqtt/device/debug_info", vol.Required("device_id"): str}
 )
@@ -1198,6 +1316,16 @@ async def websocket_mqtt_info(hass, connection, msg):
     connection.send_result(msg["id"], mqtt_info)
 
 
+@websocket_api.websocket_command({vol.Required("type"): "mqtt/message_statistics"})
+@callback
+def websocket_message_statistics(hass, connection, msg):
+    """Get the throughput and latency of the received MQTT messages."""
+    if not connection.user.is_admin:
+        raise Unauthorized
+
+    connection.send_result(msg["id"], debug_info.message_statistics(hass).as_dict())
+
+
 @websocket_api.websocket_command(
     {vol.Required("type"): "mqtt/device/remove", vol.Required("device_id"): str}
 )
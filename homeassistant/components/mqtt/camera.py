@@ -19,7 +19,12 @@ from . import PLATFORMS, subscription
 from .. import mqtt
 from .const import CONF_QOS, CONF_TOPIC, DOMAIN
 from .debug_info import log_messages
-from .mixins import MQTT_ENTITY_COMMON_SCHEMA, MqttEntity, async_setup_entry_helper
+from .mixins import (
+    MQTT_ENTITY_COMMON_SCHEMA,
+    MqttEntity,
+    async_batch_add_entities,
+    async_setup_entry_helper,
+)
 
 DEFAULT_NAME = "MQTT Camera"
 
@@ -60,7 +65,10 @@ async def async_setup_entry(
 ) -> None:
     """Set up MQTT camera dynamically through MQTT discovery."""
     setup = functools.partial(
-        _async_setup_entity, hass, async_add_entities, config_entry=config_entry
+        _async_setup_entity,
+        hass,
+        async_batch_add_entities(hass, async_add_entities),
+        config_entry=config_entry,
     )
     await async_setup_entry_helper(hass, camera.DOMAIN, setup, DISCOVERY_SCHEMA)
 
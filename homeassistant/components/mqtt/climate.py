@@ -66,7 +66,12 @@ from . import (
 from .. import mqtt
 from .const import CONF_ENCODING, CONF_QOS, CONF_RETAIN, DOMAIN
 from .debug_info import log_messages
-from .mixins import MQTT_ENTITY_COMMON_SCHEMA, MqttEntity, async_setup_entry_helper
+from .mixins import (
+    MQTT_ENTITY_COMMON_SCHEMA,
+    MqttEntity,
+    async_batch_add_entities,
+    async_setup_entry_helper,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -314,7 +319,10 @@ async def async_setup_entry(
 ) -> None:
     """Set up MQTT climate device dynamically through MQTT discovery."""
     setup = functools.partial(
-        _async_setup_entity, hass, async_add_entities, config_entry=config_entry
+        _async_setup_entity,
+        hass,
+        async_batch_add_entities(hass, async_add_entities),
+        config_entry=config_entry,
     )
     await async_setup_entry_helper(hass, climate.DOMAIN, setup, DISCOVERY_SCHEMA)
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 from collections import deque
 from collections.abc import Callable
 from functools import wraps
+import time
 from typing import Any
 
 from homeassistant.core import HomeAssistant
@@ -12,9 +13,68 @@ from .const import ATTR_DISCOVERY_PAYLOAD, ATTR_DISCOVERY_TOPIC
 from .models import MessageCallbackType
 
 DATA_MQTT_DEBUG_INFO = "mqtt_debug_info"
+DATA_MQTT_MESSAGE_STATISTICS = "mqtt_message_statistics"
 STORED_MESSAGES = 10
 
 
+class MessageStatistics:
+    """Throughput and latency of the received messages.
+
+    The latency is the time a message waits between being received by the
+    MQTT client and being handled in the event loop.
+    """
+
+    __slots__ = (
+        "started",
+        "messages",
+        "batches",
+        "max_batch_size",
+        "total_latency",
+        "max_latency",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.started = time.monotonic()
+        self.messages = 0
+        self.batches = 0
+        self.max_batch_size = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def add_batch(self, size: int, total_latency: float, max_latency: float) -> None:
+        """Add a batch of messages handled together."""
+        self.messages += size
+        self.batches += 1
+        self.total_latency += total_latency
+        if size > self.max_batch_size:
+            self.max_batch_size = size
+        if max_latency > self.max_latency:
+            self.max_latency = max_latency
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        duration = time.monotonic() - self.started
+        return {
+            "messages": self.messages,
+            "messages_per_second": self.messages / duration if duration else 0.0,
+            "batches": self.batches,
+            "average_batch_size": self.messages / self.batches if self.batches else 0,
+            "max_batch_size": self.max_batch_size,
+            "average_latency": self.total_latency / self.messages
+            if self.messages
+            else 0.0,
+            "max_latency": self.max_latency,
+        }
+
+
+def message_statistics(hass: HomeAssistant) -> MessageStatistics:
+    """Return the statistics of the received messages."""
+    if (stats := hass.data.get(DATA_MQTT_MESSAGE_STATISTICS)) is None:
+        stats = hass.data[DATA_MQTT_MESSAGE_STATISTICS] = MessageStatistics()
+    return stats
+
+
 def log_messages(
     hass: HomeAssistant, entity_id: str
 ) -> Callable[[MessageCallbackType], MessageCallbackType]:
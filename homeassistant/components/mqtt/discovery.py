@@ -58,6 +58,7 @@ SUPPORTED_COMPONENTS = [
 ]
 
 ALREADY_DISCOVERED = "mqtt_discovered_components"
+DISCOVERY_PAYLOADS = "mqtt_discovery_payloads"
 PENDING_DISCOVERED = "mqtt_pending_components"
 CONFIG_ENTRY_IS_SETUP = "mqtt_config_entry_is_setup"
 DATA_CONFIG_ENTRY_LOCK = "mqtt_config_entry_lock"
@@ -112,6 +113,27 @@ async def async_start(  # noqa: C901
             _LOGGER.warning("Integration %s is not supported", component)
             return
 
+        # If present, the node_id will be included in the discovered object id
+        discovery_id = " ".join((node_id, object_id)) if node_id else object_id
+        discovery_hash = (component, discovery_id)
+
+        # Retained discovery messages are received again after reconnecting
+        # to the broker, skip processing them if nothing changed. This is only
+        # kept in memory: validated configs hold Template objects and other
+        # values coerced by the platform schemas, so they cannot be stored as
+        # JSON, and storing the parsed payloads would not skip the validation.
+        if (
+            discovery_hash in hass.data[ALREADY_DISCOVERED]
+            and hass.data[DISCOVERY_PAYLOADS].get(discovery_hash) == payload
+        ):
+            _LOGGER.debug(
+                "Ignoring unchanged discovery payload for %s %s",
+                component,
+                discovery_id,
+            )
+            return
+        hass.data[DISCOVERY_PAYLOADS][discovery_hash] = payload
+
         if payload:
             try:
                 payload = json.loads(payload)
@@ -151,10 +173,6 @@ async def async_start(  # noqa: C901
                         if topic[-1] == TOPIC_BASE:
                             availability_conf[CONF_TOPIC] = f"{topic[:-1]}{base}"
 
-        # If present, the node_id will be included in the discovered object id
-        discovery_id = " ".join((node_id, object_id)) if node_id else object_id
-        discovery_hash = (component, discovery_id)
-
         if payload:
             # Attach MQTT topic to the payload, used for debug prints
             setattr(payload, "__configuration_source__", f"MQTT (topic: '{topic}')")
@@ -257,6 +275,7 @@ async def async_start(  # noqa: C901
     hass.data[CONFIG_ENTRY_IS_SETUP] = set()
 
     hass.data[ALREADY_DISCOVERED] = {}
+    hass.data[DISCOVERY_PAYLOADS] = {}
     hass.data[PENDING_DISCOVERED] = {}
 
     discovery_topics = [
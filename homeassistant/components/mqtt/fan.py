@@ -51,7 +51,12 @@ from .const import (
     DOMAIN,
 )
 from .debug_info import log_messages
-from .mixins import MQTT_ENTITY_COMMON_SCHEMA, MqttEntity, async_setup_entry_helper
+from .mixins import (
+    MQTT_ENTITY_COMMON_SCHEMA,
+    MqttEntity,
+    async_batch_add_entities,
+    async_setup_entry_helper,
+)
 
 CONF_STATE_VALUE_TEMPLATE = "state_value_template"
 CONF_COMMAND_TEMPLATE = "command_template"
@@ -223,7 +228,10 @@ async def async_setup_entry(
 ) -> None:
     """Set up MQTT fan dynamically through MQTT discovery."""
     setup = functools.partial(
-        _async_setup_entity, hass, async_add_entities, config_entry=config_entry
+        _async_setup_entity,
+        hass,
+        async_batch_add_entities(hass, async_add_entities),
+        config_entry=config_entry,
     )
     await async_setup_entry_helper(hass, fan.DOMAIN, setup, DISCOVERY_SCHEMA)
 
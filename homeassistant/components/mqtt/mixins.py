@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 import json
 import logging
 
@@ -23,7 +23,7 @@ from homeassistant.const import (
     CONF_UNIQUE_ID,
     CONF_VALUE_TEMPLATE,
 )
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.dispatcher import (
     async_dispatcher_connect,
@@ -36,6 +36,7 @@ from homeassistant.helpers.entity import (
     EntityCategory,
     async_generate_entity_id,
 )
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType
 
 from . import DATA_MQTT, MqttValueTemplate, debug_info, publish, subscription
@@ -223,6 +224,40 @@ async def async_setup_entry_helper(hass, domain, async_setup, schema):
     )
 
 
+@callback
+def async_batch_add_entities(
+    hass: HomeAssistant, async_add_entities: AddEntitiesCallback
+) -> AddEntitiesCallback:
+    """Wrap async_add_entities to add the entities discovered together at once.
+
+    Retained discovery messages are received in a burst when connecting to
+    the broker, the entities set up in the same event loop iteration are
+    added to the platform with a single call.
+    """
+    pending: list[Entity] = []
+
+    @callback
+    def async_add_pending() -> None:
+        """Add the entities set up since the previous call."""
+        entities = pending.copy()
+        pending.clear()
+        async_add_entities(entities)
+
+    @callback
+    def async_add(
+        new_entities: Iterable[Entity], update_before_add: bool = False
+    ) -> None:
+        """Add entities with the next batch."""
+        if update_before_add:
+            async_add_entities(new_entities, update_before_add)
+            return
+        if not pending:
+            hass.loop.call_soon(async_add_pending)
+        pending.extend(new_entities)
+
+    return async_add
+
+
 def init_entity_id_from_config(hass, entity, config, entity_id_format):
     """Set entity_id from object_id if defined in config."""
     if CONF_OBJECT_ID in config:
@@ -23,6 +23,7 @@ from .mixins import (
     MQTT_AVAILABILITY_SCHEMA,
     MqttAvailability,
     MqttDiscoveryUpdate,
+    async_batch_add_entities,
     async_setup_entry_helper,
     init_entity_id_from_config,
 )
@@ -63,7 +64,10 @@ async def async_setup_entry(
 ) -> None:
     """Set up MQTT scene dynamically through MQTT discovery."""
     setup = functools.partial(
-        _async_setup_entity, hass, async_add_entities, config_entry=config_entry
+        _async_setup_entity,
+        hass,
+        async_batch_add_entities(hass, async_add_entities),
+        config_entry=config_entry,
     )
     await async_setup_entry_helper(hass, scene.DOMAIN, setup, DISCOVERY_SCHEMA)
 
@@ -0,0 +1,114 @@
+"""Match MQTT topics against the topic filters of subscriptions."""
+from __future__ import annotations
+
+from itertools import count
+from operator import itemgetter
+from typing import Generic, TypeVar
+
+_T = TypeVar("_T")
+
+
+class _Node(Generic[_T]):
+    """A level of the topic filters in the trie."""
+
+    __slots__ = ("children", "items")
+
+    def __init__(self) -> None:
+        """Initialize the level."""
+        self.children: dict[str, _Node[_T]] = {}
+        # The items of the topic filters ending at this level, with a
+        # sequence number to return matches in the order they were added
+        self.items: list[tuple[int, _T]] = []
+
+
+class TopicTrie(Generic[_T]):
+    """Items indexed by the levels of their MQTT topic filter.
+
+    Matching a topic only visits the levels of the topic filters which can
+    match it, following the + and # wildcards, instead of testing every
+    topic filter. Like brokers do, wildcards at the first level do not
+    match topics starting with $.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the trie."""
+        self._root: _Node[_T] = _Node()
+        self._sequence = count()
+
+    def add(self, topic_filter: str, item: _T) -> None:
+        """Add an item for a topic filter."""
+        node = self._root
+        for level in topic_filter.split("/"):
+            if (child := node.children.get(level)) is None:
+                child = node.children[level] = _Node()
+            node = child
+        node.items.append((next(self._sequence), item))
+
+    def remove(self, topic_filter: str, item: _T) -> None:
+        """Remove an item added for a topic filter.
+
+        Raises KeyError if the item was not added for the topic filter.
+        """
+        levels = topic_filter.split("/")
+        path = [self._root]
+        for level in levels:
+            if (child := path[-1].children.get(level)) is None:
+                raise KeyError(topic_filter)
+            path.append(child)
+
+        items = path[-1].items
+        for idx, (_, other) in enumerate(items):
+            if other is item:
+                del items[idx]
+                break
+        else:
+            raise KeyError(topic_filter)
+
+        # Drop the levels no other topic filter uses
+        for idx in range(len(levels), 0, -1):
+            node = path[idx]
+            if node.items or node.children:
+                break
+            del path[idx - 1].children[levels[idx - 1]]
+
+    def get(self, topic_filter: str) -> list[_T]:
+        """Return the items added for a topic filter."""
+        node = self._root
+        for level in topic_filter.split("/"):
+            if (child := node.children.get(level)) is None:
+                return []
+            node = child
+        return [item for _, item in node.items]
+
+    def has_topic_filter(self, topic_filter: str) -> bool:
+        """Return if any item was added for a topic filter."""
+        return bool(self.get(topic_filter))
+
+    def match(self, topic: str) -> list[_T]:
+        """Return the items of the topic filters matching a topic."""
+        matches: list[tuple[int, _T]] = []
+        _match(self._root, topic.split("/"), 0, not topic.startswith("$"), matches)
+        if len(matches) > 1:
+            matches.sort(key=itemgetter(0))
+        return [item for _, item in matches]
+
+
+def _match(
+    node: _Node[_T],
+    levels: list[str],
+    idx: int,
+    wildcards: bool,
+    matches: list[tuple[int, _T]],
+) -> None:
+    """Collect the items of the topic filters below node matching levels[idx:]."""
+    children = node.children
+    if idx == len(levels):
+        matches.extend(node.items)
+    else:
+        if (child := children.get(levels[idx])) is not None:
+            _match(child, levels, idx + 1, True, matches)
+        if wildcards and (child := children.get("+")) is not None:
+            _match(child, levels, idx + 1, True, matches)
+    # A # also matches the level it follows, a/# matches a
+    if wildcards and (child := children.get("#")) is not None:
+        matches.extend(child.items)
@@ -7,7 +7,7 @@ from homeassistant.components.vacuum import DOMAIN
 from homeassistant.helpers.reload import async_setup_reload_service
 
 from .. import DOMAIN as MQTT_DOMAIN, PLATFORMS
-from ..mixins import async_setup_entry_helper
+from ..mixins import async_batch_add_entities, async_setup_entry_helper
 from .schema import CONF_SCHEMA, LEGACY, MQTT_VACUUM_SCHEMA, STATE
 from .schema_legacy import (
     DISCOVERY_SCHEMA_LEGACY,
@@ -51,7 +51,10 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up MQTT vacuum dynamically through MQTT discovery."""
     setup = functools.partial(
-        _async_setup_entity, hass, async_add_entities, config_entry=config_entry
+        _async_setup_entity,
+        hass,
+        async_batch_add_entities(hass, async_add_entities),
+        config_entry=config_entry,
     )
     await async_setup_entry_helper(hass, DOMAIN, setup, DISCOVERY_SCHEMA)
 
@@ -3,12 +3,12 @@ from __future__ import annotations
 
 import abc
 import asyncio
-from collections.abc import Callable, Iterable
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
 import concurrent.futures
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
-import queue
 import sqlite3
 import threading
 import time
@@ -31,8 +31,10 @@ from homeassistant.const import (
     EVENT_STATE_CHANGED,
     EVENT_TIME_CHANGED,
     MATCH_ALL,
+    Platform,
 )
-from homeassistant.core import CoreState, HomeAssistant, ServiceCall, callback
+from homeassistant.core import CoreState, Event, HomeAssistant, ServiceCall, callback
+from homeassistant.helpers import discovery
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
@@ -51,25 +53,36 @@ from homeassistant.helpers.integration_platform import (
 from homeassistant.helpers.service import async_extract_entity_ids
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import bind_hass
+from homeassistant.setup import async_when_setup
 import homeassistant.util.dt as dt_util
 
 from . import history, migration, purge, statistics, websocket_api
+from .backlog import RecorderQueue
+from .bulk import BulkWriter
 from .const import (
     CONF_DB_INTEGRITY_CHECK,
     DATA_INSTANCE,
     DOMAIN,
     MAX_QUEUE_BACKLOG,
+    QUEUE_COALESCE_THRESHOLD,
+    QUEUE_SPILL_FILE,
+    QUEUE_SPILL_READ_BATCH_SIZE,
+    RECENT_STATES_MAX_AGE,
+    RECENT_STATES_MAX_ENTRIES,
     SQLITE_URL_PREFIX,
+    STATE_ATTRIBUTES_ID_CACHE_SIZE,
 )
 from .models import (
     Base,
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
     StatisticsRuns,
     process_timestamp,
 )
 from .pool import RecorderPool
+from .recent_states import RecentStates
 from .util import (
     dburl_to_path,
     end_incomplete_runs,
@@ -120,6 +133,7 @@ DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 1
+DEFAULT_PURGE_TIME_BUDGET = 0.5
 KEEPALIVE_TIME = 30
 
 # Controls how often we clean up
@@ -130,6 +144,7 @@ DB_LOCK_TIMEOUT = 30
 DB_LOCK_QUEUE_CHECK_TIMEOUT = 1
 
 CONF_AUTO_PURGE = "auto_purge"
+CONF_BULK_INSERT = "bulk_insert"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
@@ -137,6 +152,7 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_PURGE_TIME_BUDGET = "purge_time_budget"
 
 INVALIDATED_ERR = "Database connection invalidated"
 CONNECTIVITY_ERR = "Error in database connectivity during commit"
@@ -165,6 +181,9 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
                     ): cv.positive_int,
+                    vol.Optional(
+                        CONF_PURGE_TIME_BUDGET, default=DEFAULT_PURGE_TIME_BUDGET
+                    ): cv.positive_float,
                     vol.Optional(
                         CONF_DB_MAX_RETRIES, default=DEFAULT_DB_MAX_RETRIES
                     ): cv.positive_int,
@@ -174,6 +193,7 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(CONF_BULK_INSERT, default=False): cv.boolean,
                 }
             ),
         )
@@ -263,6 +283,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_t=exclude_t,
+        bulk_insert=conf[CONF_BULK_INSERT],
+        purge_time_budget=conf[CONF_PURGE_TIME_BUDGET],
     )
     instance.async_initialize()
     instance.start()
@@ -272,6 +294,12 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     websocket_api.async_setup(hass)
     await async_process_integration_platforms(hass, DOMAIN, _process_recorder_platform)
 
+    async def _async_load_sensor_platform(hass: HomeAssistant, component: str) -> None:
+        """Add the queue sensors once the sensor integration is set up."""
+        await discovery.async_load_platform(hass, Platform.SENSOR, DOMAIN, {}, config)
+
+    async_when_setup(hass, Platform.SENSOR, _async_load_sensor_platform)
+
     return await instance.async_db_ready
 
 
@@ -368,19 +396,48 @@ class PurgeTask(RecorderTask):
     purge_before: datetime
     repack: bool
     apply_filter: bool
+    progress: purge.PurgeProgress | None = None
 
     def run(self, instance: Recorder) -> None:
-        """Purge the database."""
-        if purge.purge_old_data(
-            instance, self.purge_before, self.repack, self.apply_filter
+        """Purge the database.
+
+        Chunks are purged until the purge time budget is used up, the
+        purge then continues after the next commit.
+        """
+        # pylint: disable-next=[protected-access]
+        if (pending := instance._pending_purge) is not None:
+            # Continue the purge which ran out of time instead of starting
+            # over, it purges up to the later purge_before
+            instance._pending_purge = None  # pylint: disable=[protected-access]
+            self._merge(pending)
+        # Commit pending states first so none of them can refer
+        # to shared attributes which are about to be purged
+        instance._commit_event_session_or_retry()  # pylint: disable=[protected-access]
+        if self.progress is None:
+            self.progress = purge.PurgeProgress(self.purge_before)
+        instance.purge_progress = self.progress
+        deadline = time.monotonic() + instance.purge_time_budget
+        while not purge.purge_old_data(
+            instance, self.purge_before, self.repack, self.apply_filter, self.progress
         ):
-            # We always need to do the db cleanups after a purge
-            # is finished to ensure the WAL checkpoint and other
-            # tasks happen after a vacuum.
-            perodic_db_cleanups(instance)
-            return
-        # Schedule a new purge task if this one didn't finish
-        instance.queue.put(PurgeTask(self.purge_before, self.repack, self.apply_filter))
+            if time.monotonic() >= deadline:
+                # Continue the purge after the next commit
+                # pylint: disable-next=[protected-access]
+                instance._pending_purge = self
+                return
+        # We always need to do the db cleanups after a purge
+        # is finished to ensure the WAL checkpoint and other
+        # tasks happen after a vacuum.
+        perodic_db_cleanups(instance)
+
+    def _merge(self, pending: PurgeTask) -> None:
+        """Take over the progress of a pending purge."""
+        self.repack = self.repack or pending.repack
+        self.apply_filter = self.apply_filter or pending.apply_filter
+        self.purge_before = max(self.purge_before, pending.purge_before)
+        if (progress := pending.progress) is not None:
+            progress.extend(self.purge_before)
+            self.progress = progress
 
 
 @dataclass
@@ -391,7 +448,12 @@ class PurgeEntitiesTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Purge entities from the database."""
+        # Commit pending states first so none of them can refer
+        # to shared attributes which are about to be purged
+        instance._commit_event_session_or_retry()  # pylint: disable=[protected-access]
         if purge.purge_entity_data(instance, self.entity_filter):
+            if instance.recent_states:
+                instance.recent_states.purge_entities(self.entity_filter)
             return
         # Schedule a new purge task if this one didn't finish
         instance.queue.put(PurgeEntitiesTask(self.entity_filter))
@@ -470,7 +532,7 @@ class StopTask(RecorderTask):
 class EventTask(RecorderTask):
     """An object to insert into the recorder queue to stop the event handler."""
 
-    event: bool
+    event: Event
 
     def run(self, instance: Recorder) -> None:
         """Handle the task."""
@@ -494,6 +556,8 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool],
         exclude_t: list[str],
+        bulk_insert: bool = False,
+        purge_time_budget: float = DEFAULT_PURGE_TIME_BUDGET,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -502,11 +566,22 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.keep_days = keep_days
         self.commit_interval = commit_interval
-        self.queue: queue.SimpleQueue[RecorderTask] = queue.SimpleQueue()
+        self.queue = RecorderQueue(
+            EventTask,
+            hass.config.path(QUEUE_SPILL_FILE),
+            MAX_QUEUE_BACKLOG,
+            min(QUEUE_COALESCE_THRESHOLD, MAX_QUEUE_BACKLOG),
+            QUEUE_SPILL_READ_BATCH_SIZE,
+        )
+        self.queue_latency: float | None = None
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
+        self.bulk_insert = bulk_insert
+        self.purge_time_budget = purge_time_budget
+        self.purge_progress: purge.PurgeProgress | None = None
+        self._pending_purge: PurgeTask | None = None
         self.async_db_ready: asyncio.Future = asyncio.Future()
         self.async_recorder_ready = asyncio.Event()
         self._queue_watch = threading.Event()
@@ -515,12 +590,26 @@ class Recorder(threading.Thread):
 
         self.entity_filter = entity_filter
         self.exclude_t = exclude_t
+        self.recent_states: RecentStates | None = None
+        if EVENT_STATE_CHANGED not in exclude_t:
+            self.recent_states = RecentStates(
+                RECENT_STATES_MAX_AGE, RECENT_STATES_MAX_ENTRIES
+            )
 
         self._timechanges_seen = 0
         self._commits_without_expire = 0
         self._keepalive_count = 0
         self._old_states: dict[str, States] = {}
+        self._old_attributes: dict[str, tuple[Mapping[str, Any], str]] = {}
+        self._state_attributes_ids: OrderedDict[str, int] = OrderedDict()
+        self._pending_state_attributes: dict[str, StateAttributes] = {}
         self._pending_expunge: list[States] = []
+        self._pending_last_states: list[States] = []
+        # The state_id and last_updated of the last state of each entity
+        # committed to the database, read by history queries to look up
+        # the state at the start of a window by primary key
+        self.last_state_ids: dict[str, tuple[int, datetime]] = {}
+        self._bulk_writer: BulkWriter | None = None
         self.event_session = None
         self.get_session = None
         self._completed_first_database_setup = None
@@ -540,28 +629,39 @@ class Recorder(threading.Thread):
     @callback
     def async_initialize(self):
         """Initialize the recorder."""
-        self._event_listener = self.hass.bus.async_listen(
+        self._event_listener = self.hass.bus.async_listen_batch(
             MATCH_ALL, self.event_listener, event_filter=self._async_event_filter
         )
+        if self.recent_states:
+            self.recent_states.start(
+                state
+                for state in self.hass.states.async_all()
+                if self.entity_filter(state.entity_id)
+            )
         self._queue_watcher = async_track_time_interval(
             self.hass, self._async_check_queue, timedelta(minutes=10)
         )
 
     @callback
     def _async_check_queue(self, *_):
-        """Periodic check of the queue size to ensure we do not exaust memory.
+        """Periodic check of the queue size.
 
         The queue grows during migraton or if something really goes wrong.
+        Its memory use is bounded by spilling events to disk, so we only
+        report the backlog.
         """
         size = self.queue.qsize()
         _LOGGER.debug("Recorder queue size is: %s", size)
-        if self.queue.qsize() <= MAX_QUEUE_BACKLOG:
+        if not (spill_size := self.queue.spill_size):
             return
-        _LOGGER.error(
-            "The recorder queue reached the maximum size of %s; Events are no longer being recorded",
-            MAX_QUEUE_BACKLOG,
+        _LOGGER.warning(
+            "The recorder queue holds %s tasks, %s of them spilled to disk; "
+            "%s state changes were collapsed and %s events were dropped",
+            size,
+            spill_size,
+            self.queue.coalesced,
+            self.queue.dropped,
         )
-        self._async_stop_queue_watcher_and_event_listener()
 
     @callback
     def _async_stop_queue_watcher_and_event_listener(self):
@@ -627,12 +727,9 @@ class Recorder(threading.Thread):
             #
             # We drain all the events in the queue and then insert
             # an empty one to ensure the next thing the recorder sees
-            # is a request to shutdown.
-            while True:
-                try:
-                    self.queue.get_nowait()
-                except queue.Empty:
-                    break
+            # is a request to shutdown. Spilled events stay on disk
+            # and are recorded on the next start.
+            self.queue.clear()
             self.queue.put(StopTask())
 
         self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_FINAL_WRITE, _empty_queue)
@@ -736,6 +833,7 @@ class Recorder(threading.Thread):
         hass_started = concurrent.futures.Future()
 
         self.hass.add_job(self.async_register, shutdown_task, hass_started)
+        self.queue.load_spill_file()
 
         current_version = self._setup_recorder()
 
@@ -762,13 +860,7 @@ class Recorder(threading.Thread):
         # since it can be cpu intensive and we do not want it to compete
         # with startup which is also cpu intensive
         if not schema_is_current:
-            if self._migrate_schema_and_setup_run(current_version):
-                if not self._event_listener:
-                    # If the schema migration takes so long that the end
-                    # queue watcher safety kicks in because MAX_QUEUE_BACKLOG
-                    # is reached, we need to reinitialize the listener.
-                    self.hass.add_job(self.async_initialize)
-            else:
+            if not self._migrate_schema_and_setup_run(current_version):
                 persistent_notification.create(
                     self.hass,
                     "The database migration failed, check [the logs](/config/logs)."
@@ -888,7 +980,14 @@ class Recorder(threading.Thread):
             self.queue.qsize(),
         )
 
+    def _queue_pending_purge(self) -> None:
+        """Queue the next chunks of a purge which ran out of time."""
+        if self._pending_purge:
+            self.queue.put(self._pending_purge)
+            self._pending_purge = None
+
     def _process_one_event(self, event):
+        self.queue_latency = (dt_util.utcnow() - event.time_fired).total_seconds()
         if event.event_type == EVENT_TIME_CHANGED:
             self._keepalive_count += 1
             if self._keepalive_count >= KEEPALIVE_TIME:
@@ -899,11 +998,29 @@ class Recorder(threading.Thread):
                 if self._timechanges_seen >= self.commit_interval:
                     self._timechanges_seen = 0
                     self._commit_event_session_or_retry()
+                    self._queue_pending_purge()
+            else:
+                self._queue_pending_purge()
             return
 
         if not self.enabled:
             return
 
+        if event.event_type == EVENT_STATE_CHANGED:
+            statistics.record_state_change(self, event)
+            if self.recent_states:
+                self.recent_states.add_event(event)
+
+        if self._bulk_writer:
+            try:
+                self._bulk_writer.add_event(event)
+            except (TypeError, ValueError):
+                _LOGGER.warning("Event is not JSON serializable: %s", event)
+                return
+            if not self.commit_interval:
+                self._commit_event_session_or_retry()
+            return
+
         try:
             if event.event_type == EVENT_STATE_CHANGED:
                 dbevent = Events.from_event(event, event_data="{}")
@@ -918,6 +1035,7 @@ class Recorder(threading.Thread):
         if event.event_type == EVENT_STATE_CHANGED:
             try:
                 dbstate = States.from_event(event)
+                self._link_state_attributes(dbstate, event)
                 has_new_state = event.data.get("new_state")
                 if dbstate.entity_id in self._old_states:
                     old_state = self._old_states.pop(dbstate.entity_id)
@@ -930,6 +1048,7 @@ class Recorder(threading.Thread):
                 dbstate.event = dbevent
                 dbstate.created = event.time_fired
                 self.event_session.add(dbstate)
+                self._pending_last_states.append(dbstate)
                 if has_new_state:
                     self._old_states[dbstate.entity_id] = dbstate
                     self._pending_expunge.append(dbstate)
@@ -944,6 +1063,75 @@ class Recorder(threading.Thread):
         if not self.commit_interval:
             self._commit_event_session_or_retry()
 
+    def _link_state_attributes(self, dbstate: States, event: Event) -> None:
+        """Link a state to its shared attributes row, inserting it if needed."""
+        shared_attrs = self._shared_attrs_from_event(dbstate.entity_id, event)
+
+        # Matching attributes found in the pending commit
+        if pending_attributes := self._pending_state_attributes.get(shared_attrs):
+            dbstate.state_attributes = pending_attributes
+            return
+
+        # Matching attributes id found in the cache
+        if (attributes_id := self._state_attributes_ids.get(shared_attrs)) is not None:
+            self._state_attributes_ids.move_to_end(shared_attrs)
+            dbstate.attributes_id = attributes_id
+            return
+
+        attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        # Matching attributes found in the database
+        if attributes_id := self._find_shared_attrs_in_db(attr_hash, shared_attrs):
+            dbstate.attributes_id = attributes_id
+            self._cache_state_attributes_id(shared_attrs, attributes_id)
+            return
+
+        # No matching attributes found, save them in the database
+        dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=attr_hash)
+        dbstate.state_attributes = dbstate_attributes
+        self._pending_state_attributes[shared_attrs] = dbstate_attributes
+        assert self.event_session is not None
+        self.event_session.add(dbstate_attributes)
+
+    def _shared_attrs_from_event(self, entity_id: str, event: Event) -> str:
+        """Return the JSON encoded attributes of the new state.
+
+        The encoding of the previous state of the entity is reused when
+        the attributes did not change to avoid serializing them again.
+        """
+        if (new_state := event.data.get("new_state")) is None:
+            self._old_attributes.pop(entity_id, None)
+            return StateAttributes.shared_attrs_from_event(event)
+
+        attributes = new_state.attributes
+        if (old := self._old_attributes.get(entity_id)) and old[0] == attributes:
+            shared_attrs = old[1]
+        else:
+            shared_attrs = StateAttributes.shared_attrs_from_event(event)
+        self._old_attributes[entity_id] = (attributes, shared_attrs)
+        return shared_attrs
+
+    def _find_shared_attrs_in_db(self, attr_hash: int, shared_attrs: str) -> int | None:
+        """Find shared attributes in the db from the hash and shared_attrs."""
+        # Avoid flushing the pending states and events just to look up
+        # the attributes, the pending attributes are checked by the caller
+        assert self.event_session is not None
+        with self.event_session.no_autoflush:
+            if attributes := (
+                self.event_session.query(StateAttributes.attributes_id)
+                .filter(StateAttributes.hash == attr_hash)
+                .filter(StateAttributes.shared_attrs == shared_attrs)
+                .first()
+            ):
+                return attributes[0]
+        return None
+
+    def _cache_state_attributes_id(self, shared_attrs: str, attributes_id: int) -> None:
+        """Remember the attributes_id of shared attributes, evicting the oldest."""
+        self._state_attributes_ids[shared_attrs] = attributes_id
+        self._state_attributes_ids.move_to_end(shared_attrs)
+        if len(self._state_attributes_ids) > STATE_ATTRIBUTES_ID_CACHE_SIZE:
+            self._state_attributes_ids.popitem(last=False)
+
     def _handle_database_error(self, err):
         """Handle a database error that may result in moving away the corrupt db."""
         if isinstance(err.__cause__, sqlite3.DatabaseError):
@@ -956,7 +1144,11 @@ class Recorder(threading.Thread):
 
     def _commit_event_session_or_retry(self):
         """Commit the event session if there is work to do."""
-        if not self.event_session.new and not self.event_session.dirty:
+        if (
+            not self.event_session.new
+            and not self.event_session.dirty
+            and not (self._bulk_writer and self._bulk_writer.has_pending_rows)
+        ):
             return
         tries = 1
         while tries <= self.db_max_retries:
@@ -979,6 +1171,20 @@ class Recorder(threading.Thread):
     def _commit_event_session(self):
         self._commits_without_expire += 1
 
+        if self._bulk_writer:
+            self._bulk_writer.flush(self.event_session)
+
+        if self._pending_last_states:
+            self.event_session.flush()
+            # The ids are only assigned once flushed
+            last_state_ids = {
+                dbstate.entity_id: (dbstate.state_id, dbstate.last_updated)
+                for dbstate in self._pending_last_states
+            }
+            self._pending_last_states = []
+        else:
+            last_state_ids = None
+
         if self._pending_expunge:
             self.event_session.flush()
             for dbstate in self._pending_expunge:
@@ -988,6 +1194,15 @@ class Recorder(threading.Thread):
                     self.event_session.expunge(dbstate)
             self._pending_expunge = []
         self.event_session.commit()
+        if self._bulk_writer:
+            self._bulk_writer.committed()
+        if last_state_ids:
+            self.last_state_ids.update(last_state_ids)
+
+        # Map the shared attributes to the ids assigned by the database
+        for shared_attrs, attributes_row in self._pending_state_attributes.items():
+            self._cache_state_attributes_id(shared_attrs, attributes_row.attributes_id)
+        self._pending_state_attributes = {}
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -1007,6 +1222,12 @@ class Recorder(threading.Thread):
     def _close_event_session(self):
         """Close the event session."""
         self._old_states = {}
+        self._old_attributes = {}
+        self._state_attributes_ids = OrderedDict()
+        self._pending_state_attributes = {}
+        self._pending_last_states = []
+        if self._bulk_writer:
+            self._bulk_writer.reset()
 
         if not self.event_session:
             return
@@ -1028,6 +1249,8 @@ class Recorder(threading.Thread):
         """Open the event session."""
         self.event_session = self.get_session()
         self.event_session.expire_on_commit = False
+        if self._bulk_writer:
+            self._bulk_writer.setup(self.event_session)
 
     def _send_keep_alive(self):
         """Send a keep alive to keep the db connection open."""
@@ -1035,9 +1258,9 @@ class Recorder(threading.Thread):
         self.event_session.connection().scalar(select([1]))
 
     @callback
-    def event_listener(self, event):
+    def event_listener(self, events):
         """Listen for new events and put them in the process queue."""
-        self.queue.put(EventTask(event))
+        self.queue.put_events(events)
 
     def block_till_done(self):
         """Block till all events processed.
@@ -1136,6 +1359,17 @@ class Recorder(threading.Thread):
 
         Base.metadata.create_all(self.engine)
         self.get_session = scoped_session(sessionmaker(bind=self.engine))
+
+        self._bulk_writer = None
+        if self.bulk_insert:
+            if BulkWriter.supports_dialect(self.engine.dialect.name):
+                self._bulk_writer = BulkWriter(self)
+            else:
+                _LOGGER.warning(
+                    "Bulk insert is not supported with the %s database; "
+                    "using the default write path",
+                    self.engine.dialect.name,
+                )
         _LOGGER.debug("Connected to recorder database")
 
     @property
@@ -1153,6 +1387,7 @@ class Recorder(threading.Thread):
 
     def _setup_run(self):
         """Log the start of the current run and schedule any needed jobs."""
+        self.last_state_ids = {}
         with session_scope(session=self.get_session()) as session:
             start = self.recording_start
             end_incomplete_runs(session, start)
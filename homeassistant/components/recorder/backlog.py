@@ -0,0 +1,469 @@
+"""Bounded, coalescing task queue for the recorder."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterable
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+from typing import IO, Any, cast
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, EventOrigin, State
+from homeassistant.helpers.json import json_bytes_allow_nan
+import homeassistant.util.dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _SpillSegment:
+    """Placeholder for a run of consecutive events written to the spill file."""
+
+    __slots__ = ("count",)
+
+    def __init__(self, count: int) -> None:
+        """Initialize the segment."""
+        self.count = count
+
+
+class RecorderQueue:
+    """A queue of recorder tasks that keeps its memory use bounded.
+
+    Tasks are handed to the recorder thread in the order they were put,
+    like with a SimpleQueue. Once the number of tasks held in memory
+    reaches coalesce_threshold, a state_changed event for an entity that
+    already has a state_changed event waiting replaces the event of the
+    waiting task instead of being queued. Once max_memory tasks are held
+    in memory, events are handed to a writer thread which appends them
+    to a spill file, and they are read back in batches when the recorder
+    reaches them.
+
+    The spill file is written, read and parsed without holding the
+    lock of the queue, so putting events never waits for disk I/O.
+
+    Only events are coalesced or spilled; other tasks are always queued
+    in memory.
+    """
+
+    def __init__(
+        self,
+        event_task_factory: Callable[[Event], Any],
+        spill_path: str,
+        max_memory: int,
+        coalesce_threshold: int,
+        read_batch_size: int,
+    ) -> None:
+        """Initialize the queue."""
+        self._event_task_factory = event_task_factory
+        self._spill_path = spill_path
+        self._max_memory = max_memory
+        self._coalesce_threshold = coalesce_threshold
+        self._read_batch_size = read_batch_size
+        lock = threading.Lock()
+        # Waited on by the recorder thread for tasks and spill file writes
+        self._cond = threading.Condition(lock)
+        # Waited on by the spill thread for events to write
+        self._spill_cond = threading.Condition(lock)
+        # Held by the recorder thread while it reads the spill file
+        self._read_lock = threading.Lock()
+        self._queue: deque[Any] = deque()
+        self._in_memory = 0
+        self._spilled = 0
+        self._pending_states: dict[str, Any] = {}
+        self._spill_buffer: list[Event] = []
+        self._spill_thread: threading.Thread | None = None
+        self._spill_writing = False
+        self._spill_closing = False
+        self._spill_failed = False
+        self._written_lines = 0
+        self._read_lines = 0
+        self._spill_reader: IO[bytes] | None = None
+        self.coalesced = 0
+        self.spilled = 0
+        self.dropped = 0
+
+    @property
+    def max_memory(self) -> int:
+        """Return the maximum number of tasks kept in memory."""
+        return self._max_memory
+
+    @property
+    def spill_size(self) -> int:
+        """Return the number of events waiting in the spill file."""
+        return self._spilled
+
+    def qsize(self) -> int:
+        """Return the number of tasks waiting, including spilled events."""
+        return self._in_memory + self._spilled
+
+    def empty(self) -> bool:
+        """Return if there are no tasks waiting."""
+        return self.qsize() == 0
+
+    def put(self, task: Any) -> None:
+        """Put a task in the queue."""
+        with self._cond:
+            self._queue.append(task)
+            self._in_memory += 1
+            self._cond.notify()
+
+    def put_event(self, event: Event) -> None:
+        """Put an event in the queue, coalescing or spilling under pressure."""
+        with self._cond:
+            self._put_event(event)
+            self._cond.notify()
+
+    def put_events(self, events: Iterable[Event]) -> None:
+        """Put events in the queue at once, like with put_event."""
+        with self._cond:
+            for event in events:
+                self._put_event(event)
+            self._cond.notify()
+
+    def _put_event(self, event: Event) -> None:
+        """Put an event in the queue, the condition must be held."""
+        if self._spilled or self._in_memory >= self._max_memory:
+            # Keep spilling until the spill file has been read back,
+            # otherwise events would be recorded out of order.
+            self._spill_event(event)
+            return
+
+        entity_id: str | None = None
+        if event.event_type == EVENT_STATE_CHANGED:
+            entity_id = cast(str, event.data["entity_id"])
+            if (
+                self._in_memory >= self._coalesce_threshold
+                and (task := self._pending_states.get(entity_id)) is not None
+            ):
+                task.event = event
+                self.coalesced += 1
+                return
+
+        task = self._event_task_factory(event)
+        if entity_id is not None:
+            self._pending_states[entity_id] = task
+        self._queue.append(task)
+        self._in_memory += 1
+
+    def get(self) -> Any:
+        """Remove and return a task, blocking until one is available."""
+        return self._get(True)
+
+    def get_nowait(self) -> Any:
+        """Remove and return a task if one is immediately available.
+
+        Spilled events count as available, this may wait for the spill
+        thread to write them.
+        """
+        return self._get(False)
+
+    def _get(self, block: bool) -> Any:
+        """Remove and return a task, reading spilled events if needed."""
+        while True:
+            with self._cond:
+                while not self._queue:
+                    if not block:
+                        raise queue.Empty
+                    self._cond.wait()
+                segment = self._queue[0]
+                if not isinstance(segment, _SpillSegment):
+                    return self._pop()
+                # Only lines the spill thread has written can be read,
+                # wait for it to write a full batch.
+                count = min(segment.count, self._read_batch_size)
+                while self._written_lines - self._read_lines < count and (
+                    self._spill_buffer or self._spill_writing
+                ):
+                    self._cond.wait()
+                count = min(count, self._written_lines - self._read_lines)
+            self._read_spilled(segment, count)
+
+    def clear(self) -> int:
+        """Drop all tasks held in memory and return how many were dropped.
+
+        Events in the spill file which were not read back yet are kept on
+        disk so they can be recorded the next time the recorder starts.
+        """
+        with self._read_lock:
+            with self._cond:
+                dropped = self._in_memory
+                self._queue.clear()
+                self._pending_states.clear()
+                self._in_memory = 0
+                spill_thread = self._spill_thread
+                self._spill_closing = True
+                self._spill_cond.notify()
+            if spill_thread is not None:
+                # Let the spill thread write the events it was handed
+                spill_thread.join()
+            if self._spilled and self._spill_reader is not None:
+                self._truncate_spill_file()
+            self._close_spill_reader()
+            with self._cond:
+                self._spill_buffer.clear()
+                self._spilled = 0
+                self._reset_spill_state()
+        return dropped
+
+    def load_spill_file(self) -> None:
+        """Queue events left in the spill file by a previous run.
+
+        Must be called before the first event is spilled.
+        """
+        try:
+            with open(self._spill_path, "rb") as spill_file:
+                count = sum(1 for _ in spill_file)
+        except FileNotFoundError:
+            return
+        except OSError as err:
+            _LOGGER.error("Could not read the recorder spill file: %s", err)
+            return
+
+        if not count:
+            self._remove_spill_file()
+            return
+
+        with self._cond:
+            _LOGGER.info("Recording %s events spilled by a previous run", count)
+            # These events happened before anything currently queued
+            self._queue.appendleft(_SpillSegment(count))
+            self._spilled += count
+            self._written_lines += count
+            self._cond.notify()
+
+    def _pop(self) -> Any:
+        """Remove and return the next task, the lock must be held."""
+        task = self._queue.popleft()
+        self._in_memory -= 1
+        if (
+            isinstance(event := getattr(task, "event", None), Event)
+            and event.event_type == EVENT_STATE_CHANGED
+            and self._pending_states.get(entity_id := event.data["entity_id"]) is task
+        ):
+            del self._pending_states[entity_id]
+        return task
+
+    def _spill_event(self, event: Event) -> None:
+        """Hand an event to the spill thread, the lock must be held."""
+        if self._spill_failed:
+            # Dropped until the events that made it to disk were read back
+            self.dropped += 1
+            return
+
+        self._spill_buffer.append(event)
+        if self._queue and isinstance(segment := self._queue[-1], _SpillSegment):
+            segment.count += 1
+        else:
+            self._queue.append(_SpillSegment(1))
+        self._spilled += 1
+        self.spilled += 1
+
+        if self._spill_thread is None:
+            _LOGGER.warning(
+                "The recorder queue reached the maximum size of %s; "
+                "Events are being written to %s until the recorder catches up",
+                self._max_memory,
+                self._spill_path,
+            )
+            self._spill_thread = threading.Thread(
+                target=self._write_spill_file, name="RecorderSpill", daemon=True
+            )
+            self._spill_thread.start()
+        else:
+            self._spill_cond.notify()
+
+    def _write_spill_file(self) -> None:
+        """Append the events handed to the spill thread to the spill file."""
+        current = threading.current_thread()
+        spill_file: IO[bytes] | None = None
+        try:
+            while True:
+                with self._spill_cond:
+                    while (
+                        not self._spill_buffer
+                        and not self._spill_closing
+                        and self._spill_thread is current
+                    ):
+                        self._spill_cond.wait()
+                    if self._spill_thread is not current or not self._spill_buffer:
+                        return
+                    events = self._spill_buffer
+                    self._spill_buffer = []
+                    self._spill_writing = True
+
+                # Events which cannot be serialized are written as a corrupt
+                # line so the lines still match the spilled event count.
+                lines = [_event_to_json(event) for event in events]
+                try:
+                    if spill_file is None:
+                        spill_file = open(  # pylint: disable=consider-using-with
+                            self._spill_path, "ab"
+                        )
+                    spill_file.writelines(lines)
+                    spill_file.flush()
+                except OSError as err:
+                    with self._cond:
+                        _LOGGER.error(
+                            "Could not write to the recorder spill file, "
+                            "events are no longer being recorded: %s",
+                            err,
+                        )
+                        self._spill_failed = True
+                        self.dropped += len(lines) + len(self._spill_buffer)
+                        self._spill_buffer.clear()
+                        self._spill_writing = False
+                        self._cond.notify()
+                    return
+
+                with self._cond:
+                    self._written_lines += len(lines)
+                    self._spill_writing = False
+                    self._cond.notify()
+        finally:
+            if spill_file is not None:
+                spill_file.close()
+
+    def _read_spilled(self, segment: _SpillSegment, count: int) -> None:
+        """Move the next batch of spilled events from disk to memory."""
+        with self._read_lock:
+            with self._cond:
+                if not self._queue or self._queue[0] is not segment:
+                    # The queue was cleared in the meantime
+                    return
+
+            tasks = []
+            read = 0
+            try:
+                if count and self._spill_reader is None:
+                    self._spill_reader = open(  # pylint: disable=consider-using-with
+                        self._spill_path, "rb"
+                    )
+                for _ in range(count):
+                    assert self._spill_reader is not None
+                    if not (line := self._spill_reader.readline()):
+                        break
+                    read += 1
+                    try:
+                        tasks.append(self._event_task_factory(_json_to_event(line)))
+                    except (KeyError, TypeError, ValueError) as err:
+                        _LOGGER.warning("Discarding corrupt spilled event: %s", err)
+                        with self._cond:
+                            self.dropped += 1
+            except OSError as err:
+                _LOGGER.error("Could not read the recorder spill file: %s", err)
+
+            spill_thread = None
+            with self._cond:
+                self._read_lines += read
+                if not count or read < count:
+                    # The rest of the segment is lost, do not try to read it
+                    # again. Events the spill thread failed to write were
+                    # already counted as dropped.
+                    if not self._spill_failed:
+                        self.dropped += segment.count - read
+                    count = segment.count
+                segment.count -= count
+                self._spilled -= count
+                if not segment.count:
+                    self._queue.popleft()
+                self._queue.extendleft(reversed(tasks))
+                self._in_memory += len(tasks)
+
+                if not self._spilled:
+                    # The spill file is removed before the lock is released,
+                    # otherwise the next spill thread could append to it.
+                    spill_thread = self._spill_thread
+                    self._close_spill_reader()
+                    self._reset_spill_state()
+                    self._spill_cond.notify_all()
+                    self._remove_spill_file()
+
+            if spill_thread is not None:
+                # It has nothing left to write and exits right away
+                spill_thread.join()
+
+    def _reset_spill_state(self) -> None:
+        """Reset the spill file state, the lock must be held."""
+        self._spill_thread = None
+        self._spill_writing = False
+        self._spill_closing = False
+        self._spill_failed = False
+        self._written_lines = 0
+        self._read_lines = 0
+
+    def _truncate_spill_file(self) -> None:
+        """Drop the events already read back from the spill file."""
+        assert self._spill_reader is not None
+        tmp_path = f"{self._spill_path}.tmp"
+        try:
+            with open(tmp_path, "wb") as tmp_file:
+                shutil.copyfileobj(self._spill_reader, tmp_file)
+            self._close_spill_reader()
+            os.replace(tmp_path, self._spill_path)
+        except OSError as err:
+            _LOGGER.error("Could not rewrite the recorder spill file: %s", err)
+
+    def _close_spill_reader(self) -> None:
+        """Close the spill file handle of the recorder thread."""
+        if self._spill_reader is not None:
+            self._spill_reader.close()
+        self._spill_reader = None
+
+    def _remove_spill_file(self) -> None:
+        """Remove the spill file once it has been read back."""
+        try:
+            os.unlink(self._spill_path)
+        except FileNotFoundError:
+            # Nothing made it to disk
+            pass
+        except OSError as err:
+            _LOGGER.error("Could not remove the recorder spill file: %s", err)
+
+
+def _event_to_json(event: Event) -> bytes:
+    """Serialize an event to a line of the spill file."""
+    if event.event_type == EVENT_STATE_CHANGED:
+        # The recorder only stores the new state
+        data = {
+            "entity_id": event.data["entity_id"],
+            "new_state": event.data.get("new_state"),
+        }
+    else:
+        data = event.data
+    try:
+        line = json_bytes_allow_nan(
+            {
+                "event_type": event.event_type,
+                "data": data,
+                "origin": event.origin.value,
+                "time_fired": event.time_fired.isoformat(),
+                "context": event.context.as_dict(),
+            }
+        )
+    except (TypeError, ValueError):
+        _LOGGER.warning("Event is not JSON serializable: %s", event)
+        line = b"null"
+    return line + b"\n"
+
+
+def _json_to_event(line: bytes) -> Event:
+    """Rebuild an event from a line of the spill file."""
+    event_dict = json.loads(line)
+    data = event_dict["data"]
+    if event_dict["event_type"] == EVENT_STATE_CHANGED:
+        data["new_state"] = State.from_dict(data["new_state"])
+    context = event_dict["context"]
+    return Event(
+        event_dict["event_type"],
+        data,
+        EventOrigin(event_dict["origin"]),
+        dt_util.parse_datetime(event_dict["time_fired"]),
+        Context(
+            user_id=context["user_id"],
+            parent_id=context["parent_id"],
+            id=context["id"],
+        ),
+    )
@@ -0,0 +1,211 @@
+"""Bulk insert write path for the recorder."""
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import func
+from sqlalchemy.orm.session import Session
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, split_entity_id
+
+from .models import Events, StateAttributes, States
+
+if TYPE_CHECKING:
+    from . import Recorder
+
+_LOGGER = logging.getLogger(__name__)
+
+# Dialects where inserting explicit primary keys moves the auto increment
+# counter along, so rows inserted by the ORM later on do not collide.
+SUPPORTED_DIALECTS = {"mysql", "sqlite"}
+
+
+class BulkWriter:
+    """Buffer events and states and write them with executemany.
+
+    Building ORM objects and resolving the old_state relationship on
+    flush dominates the recorder thread at high event rates. This writer
+    keeps plain row dicts instead and assigns the primary keys itself,
+    so the old_state_id and attributes_id of a state can be resolved from
+    memory and each table is written with a single multi-row INSERT per
+    commit.
+    """
+
+    def __init__(self, instance: Recorder) -> None:
+        """Initialize the bulk writer."""
+        self.instance = instance
+        self._event_rows: list[dict[str, Any]] = []
+        self._state_rows: list[dict[str, Any]] = []
+        self._attributes_rows: list[dict[str, Any]] = []
+        self._pending_attributes_ids: dict[str, int] = {}
+        self._old_state_ids: dict[str, int] = {}
+        self._next_event_id = 0
+        self._next_state_id = 0
+        self._next_attributes_id = 0
+
+    @staticmethod
+    def supports_dialect(dialect_name: str) -> bool:
+        """Return if the bulk writer can be used with a database dialect."""
+        return dialect_name in SUPPORTED_DIALECTS
+
+    @property
+    def has_pending_rows(self) -> bool:
+        """Return if there are rows waiting to be written."""
+        return bool(self._event_rows)
+
+    @property
+    def old_state_ids(self) -> dict[str, int]:
+        """Return the state_id of the last state by entity_id."""
+        return self._old_state_ids
+
+    def setup(self, session: Session) -> None:
+        """Load the next free primary keys from the database."""
+        self.reset()
+        self._next_event_id = _next_id(session, Events.event_id)
+        self._next_state_id = _next_id(session, States.state_id)
+        self._next_attributes_id = _next_id(session, StateAttributes.attributes_id)
+
+    def reset(self) -> None:
+        """Drop all buffered rows and the old state map."""
+        self._event_rows = []
+        self._state_rows = []
+        self._attributes_rows = []
+        self._pending_attributes_ids = {}
+        self._old_state_ids = {}
+
+    def add_event(self, event: Event) -> None:
+        """Buffer an event and, for state_changed events, its state.
+
+        Raises TypeError or ValueError when the event or its state
+        are not JSON serializable.
+        """
+        if event.event_type == EVENT_STATE_CHANGED:
+            # The states are not stored in the event data
+            event_data = "{}"
+            # Serialize the attributes before assigning any ids
+            attributes_id = self._attributes_id_from_event(event)
+        else:
+            event_data = Events.event_data_from_event(event)
+            attributes_id = None
+
+        event_id = self._next_event_id
+        self._next_event_id += 1
+        context = event.context
+        self._event_rows.append(
+            {
+                "event_id": event_id,
+                "event_type": event.event_type,
+                "event_data": event_data,
+                "origin": str(event.origin.value),
+                "time_fired": event.time_fired,
+                "created": event.time_fired,
+                "context_id": context.id,
+                "context_user_id": context.user_id,
+                "context_parent_id": context.parent_id,
+            }
+        )
+
+        if event.event_type != EVENT_STATE_CHANGED:
+            return
+
+        entity_id = event.data["entity_id"]
+        state_id = self._next_state_id
+        self._next_state_id += 1
+        row = {
+            "state_id": state_id,
+            "entity_id": entity_id,
+            "attributes": None,
+            "event_id": event_id,
+            "created": event.time_fired,
+            "old_state_id": self._old_state_ids.pop(entity_id, None),
+            "attributes_id": attributes_id,
+        }
+        if (new_state := event.data.get("new_state")) is None:
+            # State got deleted
+            row["domain"] = split_entity_id(entity_id)[0]
+            row["state"] = ""
+            row["last_changed"] = event.time_fired
+            row["last_updated"] = event.time_fired
+        else:
+            row["domain"] = new_state.domain
+            row["state"] = new_state.state
+            row["last_changed"] = new_state.last_changed
+            row["last_updated"] = new_state.last_updated
+            self._old_state_ids[entity_id] = state_id
+        self._state_rows.append(row)
+
+    def _attributes_id_from_event(self, event: Event) -> int:
+        """Return the attributes_id for the new state, inserting it if needed."""
+        instance = self.instance
+        # pylint: disable-next=protected-access
+        shared_attrs = instance._shared_attrs_from_event(event.data["entity_id"], event)
+
+        # Matching attributes found in the pending commit
+        if (
+            attributes_id := self._pending_attributes_ids.get(shared_attrs)
+        ) is not None:
+            return attributes_id
+
+        # Matching attributes id found in the cache
+        # pylint: disable-next=protected-access
+        state_attributes_ids = instance._state_attributes_ids
+        if (attributes_id := state_attributes_ids.get(shared_attrs)) is not None:
+            state_attributes_ids.move_to_end(shared_attrs)
+            return attributes_id
+
+        attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        # Matching attributes found in the database
+        # pylint: disable-next=protected-access
+        if attributes_id := instance._find_shared_attrs_in_db(attr_hash, shared_attrs):
+            # pylint: disable-next=protected-access
+            instance._cache_state_attributes_id(shared_attrs, attributes_id)
+            return attributes_id
+
+        # No matching attributes found, save them in the database
+        attributes_id = self._next_attributes_id
+        self._next_attributes_id += 1
+        self._attributes_rows.append(
+            {
+                "attributes_id": attributes_id,
+                "hash": attr_hash,
+                "shared_attrs": shared_attrs,
+            }
+        )
+        self._pending_attributes_ids[shared_attrs] = attributes_id
+        return attributes_id
+
+    def flush(self, session: Session) -> None:
+        """Write all buffered rows in the session transaction."""
+        # Order matters, states refer to the attributes and events
+        for table, rows in (
+            (StateAttributes.__table__, self._attributes_rows),
+            (Events.__table__, self._event_rows),
+            (States.__table__, self._state_rows),
+        ):
+            if rows:
+                session.execute(table.insert(), rows)
+        _LOGGER.debug(
+            "Bulk inserted %s events and %s states",
+            len(self._event_rows),
+            len(self._state_rows),
+        )
+
+    def committed(self) -> None:
+        """Clear the buffers after the rows were committed."""
+        for shared_attrs, attributes_id in self._pending_attributes_ids.items():
+            # pylint: disable-next=protected-access
+            self.instance._cache_state_attributes_id(shared_attrs, attributes_id)
+        last_state_ids = self.instance.last_state_ids
+        for row in self._state_rows:
+            last_state_ids[row["entity_id"]] = (row["state_id"], row["last_updated"])
+        self._pending_attributes_ids = {}
+        self._event_rows = []
+        self._state_rows = []
+        self._attributes_rows = []
+
+
+def _next_id(session: Session, column: Any) -> int:
+    """Return the next free id of a primary key column."""
+    return (session.query(func.max(column)).scalar() or 0) + 1
@@ -6,8 +6,28 @@ DOMAIN = "recorder"
 
 CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
 
+# The maximum number of tasks the recorder queue keeps in memory before
+# events are spilled to disk
 MAX_QUEUE_BACKLOG = 30000
 
+# Above this number of queued tasks, pending state changes of the same
+# entity are collapsed to the latest one
+QUEUE_COALESCE_THRESHOLD = 10000
+
+# The number of spilled events read back into memory at once
+QUEUE_SPILL_READ_BATCH_SIZE = 1000
+
+QUEUE_SPILL_FILE = ".recorder_queue_spill"
+
+# The number of recently used shared state attributes ids to keep in memory
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
+
+# How long recent state changes are kept in memory to answer history queries
+RECENT_STATES_MAX_AGE = 24 * 60 * 60
+
+# The maximum number of recent state changes kept in memory per entity
+RECENT_STATES_MAX_ENTRIES = 1024
+
 # The maximum number of rows (events) we purge in one delete statement
 
 # sqlite3 has a limit of 999 until version 3.32.0
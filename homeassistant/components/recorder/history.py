@@ -2,18 +2,31 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from collections.abc import Iterator
+from datetime import datetime
 from itertools import groupby
 import logging
+import math
 import time
+from typing import Any
 
 from sqlalchemy import and_, bindparam, func
 from sqlalchemy.ext import baked
+from sqlalchemy.orm.session import Session
 
 from homeassistant.components import recorder
-from homeassistant.core import split_entity_id
+from homeassistant.core import HomeAssistant, split_entity_id
 import homeassistant.util.dt as dt_util
 
-from .models import LazyState, States, process_timestamp_to_utc_isoformat
+from .const import DATA_INSTANCE
+from .models import (
+    LazyState,
+    StateAttributes,
+    States,
+    process_timestamp,
+    process_timestamp_to_utc_isoformat,
+)
+from .recent_states import recent_row_to_state
 from .util import execute, session_scope
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -44,12 +57,19 @@ QUERY_STATES = [
     States.entity_id,
     States.state,
     States.attributes,
+    StateAttributes.shared_attrs,
     States.last_changed,
     States.last_updated,
 ]
 
 HISTORY_BAKERY = "recorder_history_bakery"
 
+# The number of rows fetched at once when streaming states
+STREAM_BATCH_SIZE = 1000
+
+# The smallest number of points a series can be downsampled to
+MIN_POINTS = 3
+
 
 def async_setup(hass):
     """Set up the history hooks."""
@@ -72,6 +92,7 @@ def get_significant_states_with_session(
     include_start_time_state=True,
     significant_changes_only=True,
     minimal_response=False,
+    max_points=None,
 ):
     """
     Return states changes during UTC period start_time - end_time.
@@ -84,12 +105,276 @@ def get_significant_states_with_session(
     Significant states are all states where there is a state change,
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
+
+    With max_points, numeric states of each entity are downsampled to about
+    max_points states, see _downsample_states.
     """
+    if entity_ids and (
+        (
+            recent_result := _significant_states_from_recent(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                max_points,
+            )
+        )
+        is not None
+    ):
+        return recent_result
+
     timer_start = time.perf_counter()
 
+    states = execute(
+        _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+        )
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_dict(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+        max_points,
+    )
+
+
+def _recent_states(hass):
+    """Return the recently recorded states kept in memory."""
+    if (instance := hass.data.get(DATA_INSTANCE)) is None:
+        return None
+    return instance.recent_states
+
+
+def _significant_states_from_recent(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    include_start_time_state,
+    significant_changes_only,
+    minimal_response,
+    max_points=None,
+    significant_domains=SIGNIFICANT_DOMAINS,
+):
+    """Return the significant states from memory, or None if they are not known.
+
+    All states of the significant_domains are significant, only the state
+    changes of other domains are.
+    """
+    if (recent_states := _recent_states(hass)) is None:
+        return None
+
+    rows = []
+    start_states = []
+    for entity_id in entity_ids:
+        changes_only = (
+            significant_changes_only
+            and split_entity_id(entity_id)[0] not in significant_domains
+        )
+        if (
+            entity_rows := recent_states.get_rows(
+                entity_id, start_time, end_time, changes_only
+            )
+        ) is None:
+            return None
+        rows.extend(entity_rows)
+        if include_start_time_state:
+            if (state := recent_states.get_state(entity_id, start_time)) is None:
+                return None
+            start_states.append(state)
+
+    return _sorted_states_to_dict(
+        hass,
+        session,
+        rows,
+        start_time,
+        entity_ids,
+        include_start_time_state=include_start_time_state,
+        minimal_response=minimal_response,
+        max_points=max_points,
+        start_states=start_states,
+        to_state=recent_row_to_state,
+    )
+
+
+def stream_significant_states_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Any = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    max_points: int | None = None,
+) -> Iterator[list[LazyState | dict[str, Any]]]:
+    """Yield the significant state changes during a period, one entity at a time.
+
+    Works like get_significant_states_with_session, but the rows are fetched
+    from the database in batches and the states of an entity are yielded as
+    soon as they have been read, so memory use does not grow with the number
+    of entities. The entities with changes are yielded sorted by entity_id,
+    followed by the entities that only have a state at the start time.
+    The states of each entity are the same as get_significant_states_with_session
+    returns for it.
+    """
+    start_states: dict[str, LazyState] = {}
+    if include_start_time_state:
+        run = recorder.run_information_from_instance(hass, start_time)
+        for state in _get_states_with_session(
+            hass, session, start_time, entity_ids, run=run, filters=filters
+        ):
+            state.last_changed = start_time
+            state.last_updated = start_time
+            start_states[state.entity_id] = state
+
+    query = _significant_states_query(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+    ).with_post_criteria(lambda q: q.yield_per(STREAM_BATCH_SIZE))
+
+    for ent_id, group in groupby(query, lambda state: state.entity_id):
+        ent_results: list[LazyState | dict[str, Any]] = []
+        if (start_state := start_states.pop(ent_id, None)) is not None:
+            ent_results.append(start_state)
+        _extend_entity_states(
+            ent_results, ent_id, group, minimal_response, max_points, LazyState
+        )
+        yield ent_results
+
+    for start_state in start_states.values():
+        yield [start_state]
+
+
+def _downsample_states(db_states, max_points):
+    """Downsample the numeric states of an entity to about max_points states.
+
+    States which are not numeric, like unavailable, are always kept. The
+    runs of numeric states between them share the points in proportion to
+    their length, and are downsampled with the Largest-Triangle-Three-Buckets
+    algorithm, which keeps the first and the last state of a run as well as
+    the states that shape the graph the most.
+    """
+    if len(db_states) <= max_points:
+        return db_states
+
+    runs = []
+    run = []
+    for idx, db_state in enumerate(db_states):
+        try:
+            value = float(db_state.state)
+        except (TypeError, ValueError):
+            value = math.nan
+        if math.isfinite(value):
+            run.append((idx, value))
+        elif run:
+            runs.append(run)
+            run = []
+    if run:
+        runs.append(run)
+
+    if not (numeric_states := sum(len(run) for run in runs)):
+        return db_states
+
+    max_points = max(max_points, MIN_POINTS)
+    keep = [True] * len(db_states)
+    for run in runs:
+        threshold = max(2, max_points * len(run) // numeric_states)
+        if threshold >= len(run):
+            continue
+        for idx, _ in run:
+            keep[idx] = False
+        times = [
+            process_timestamp(db_states[idx].last_updated).timestamp() for idx, _ in run
+        ]
+        values = [value for _, value in run]
+        for selected in _largest_triangle_three_buckets(times, values, threshold):
+            keep[run[selected][0]] = True
+
+    return [db_state for db_state, kept in zip(db_states, keep) if kept]
+
+
+def _largest_triangle_three_buckets(times, values, threshold):
+    """Return the indexes of the points that best represent a series."""
+    points = len(times)
+    if threshold >= points:
+        return list(range(points))
+    if threshold == 2:
+        return [0, points - 1]
+
+    # The first and the last point are always selected, the points in
+    # between are split into buckets of the same size
+    bucket_size = (points - 2) / (threshold - 2)
+    selected = [0]
+    prev = 0
+    for bucket in range(threshold - 2):
+        # The average of the next bucket is the third point of the triangle
+        next_start = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, points)
+        next_count = next_end - next_start
+        avg_x = sum(times[next_start:next_end]) / next_count
+        avg_y = sum(values[next_start:next_end]) / next_count
+
+        prev_x = times[prev]
+        prev_y = values[prev]
+        max_area = -1.0
+        for idx in range(int(bucket * bucket_size) + 1, next_start):
+            area = abs(
+                (prev_x - avg_x) * (values[idx] - prev_y)
+                - (prev_x - times[idx]) * (avg_y - prev_y)
+            )
+            if area > max_area:
+                max_area = area
+                prev = idx
+        selected.append(prev)
+
+    selected.append(points - 1)
+    return selected
+
+
+def _significant_states_query(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+):
+    """Return the query for the significant states during a period."""
     baked_query = hass.data[HISTORY_BAKERY](
         lambda session: session.query(*QUERY_STATES)
     )
+    baked_query += lambda q: q.outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
 
     if significant_changes_only:
         baked_query += lambda q: q.filter(
@@ -116,34 +401,38 @@ def get_significant_states_with_session(
 
     baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
-    )
-
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
-
-    return _sorted_states_to_dict(
-        hass,
-        session,
-        states,
-        start_time,
-        entity_ids,
-        filters,
-        include_start_time_state,
-        minimal_response,
+    return baked_query(session).params(
+        start_time=start_time, end_time=end_time, entity_ids=entity_ids
     )
 
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
+    if entity_id is not None and (
+        (
+            recent_result := _significant_states_from_recent(
+                hass,
+                None,
+                start_time,
+                end_time,
+                [entity_id.lower()],
+                include_start_time_state=True,
+                significant_changes_only=True,
+                minimal_response=False,
+                significant_domains=(),
+            )
+        )
+        is not None
+    ):
+        return recent_result
+
     with session_scope(hass=hass) as session:
         baked_query = hass.data[HISTORY_BAKERY](
             lambda session: session.query(*QUERY_STATES)
         )
+        baked_query += lambda q: q.outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        )
 
         baked_query += lambda q: q.filter(
             (States.last_changed == States.last_updated)
@@ -156,7 +445,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -180,10 +471,15 @@ def get_last_state_changes(hass, number_of_states, entity_id):
         baked_query = hass.data[HISTORY_BAKERY](
             lambda session: session.query(*QUERY_STATES)
         )
+        baked_query += lambda q: q.outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        )
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
@@ -229,8 +525,20 @@ def _get_states_with_session(
     hass, session, utc_point_in_time, entity_ids=None, run=None, filters=None
 ):
     """Return the states at a specific point in time."""
+    states = []
+    if entity_ids:
+        # States that did not change since the point in time can be
+        # read by primary key
+        state_ids, entity_ids = _last_state_ids_before(
+            hass, entity_ids, utc_point_in_time
+        )
+        if state_ids:
+            states = _get_states_by_id_with_session(hass, session, state_ids)
+        if not entity_ids:
+            return states
+
     if entity_ids and len(entity_ids) == 1:
-        return _get_single_entity_states_with_session(
+        return states + _get_single_entity_states_with_session(
             hass, session, utc_point_in_time, entity_ids[0]
         )
 
@@ -239,68 +547,128 @@ def _get_states_with_session(
 
         # History did not run before utc_point_in_time
         if run is None:
-            return []
+            return states
 
     # We have more than one entity to look at so we need to do a query on states
     # since the last recorder run started.
-    query = session.query(*QUERY_STATES)
+    baked_query = hass.data[HISTORY_BAKERY](
+        lambda session: session.query(*QUERY_STATES)
+    )
+    baked_query += lambda q: q.outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
 
     if entity_ids:
         # We got an include-list of entities, accelerate the query by filtering already
         # in the inner query.
-        most_recent_state_ids = (
-            session.query(
-                func.max(States.state_id).label("max_state_id"),
-            )
-            .filter(
-                (States.last_updated >= run.start)
-                & (States.last_updated < utc_point_in_time)
-            )
-            .filter(States.entity_id.in_(entity_ids))
-        )
-        most_recent_state_ids = most_recent_state_ids.group_by(States.entity_id)
-        most_recent_state_ids = most_recent_state_ids.subquery()
-        query = query.join(
-            most_recent_state_ids,
-            States.state_id == most_recent_state_ids.c.max_state_id,
-        )
+        baked_query += _join_most_recent_state_ids_of_entities
     else:
         # We did not get an include-list of entities, query all states in the inner
         # query, then filter out unwanted domains as well as applying the custom filter.
         # This filtering can't be done in the inner query because the domain column is
         # not indexed and we can't control what's in the custom filter.
-        most_recent_states_by_date = (
-            session.query(
-                States.entity_id.label("max_entity_id"),
-                func.max(States.last_updated).label("max_last_updated"),
-            )
-            .filter(
-                (States.last_updated >= run.start)
-                & (States.last_updated < utc_point_in_time)
-            )
-            .group_by(States.entity_id)
-            .subquery()
+        baked_query += _join_most_recent_state_ids
+        baked_query += lambda q: q.filter(~States.domain.in_(IGNORE_DOMAINS))
+        if filters:
+            filters.bake(baked_query)
+
+    query = baked_query(session).params(
+        run_start=run.start, utc_point_in_time=utc_point_in_time, entity_ids=entity_ids
+    )
+
+    return states + [LazyState(row) for row in execute(query)]
+
+
+def _join_most_recent_state_ids_of_entities(query):
+    """Join the most recent state of the given entities in the run."""
+    most_recent_state_ids = (
+        query.session.query(
+            func.max(States.state_id).label("max_state_id"),
         )
-        most_recent_state_ids = (
-            session.query(func.max(States.state_id).label("max_state_id"))
-            .join(
-                most_recent_states_by_date,
-                and_(
-                    States.entity_id == most_recent_states_by_date.c.max_entity_id,
-                    States.last_updated
-                    == most_recent_states_by_date.c.max_last_updated,
-                ),
-            )
-            .group_by(States.entity_id)
-            .subquery()
+        .filter(
+            (States.last_updated >= bindparam("run_start"))
+            & (States.last_updated < bindparam("utc_point_in_time"))
         )
-        query = query.join(
-            most_recent_state_ids,
-            States.state_id == most_recent_state_ids.c.max_state_id,
+        .filter(States.entity_id.in_(bindparam("entity_ids", expanding=True)))
+        .group_by(States.entity_id)
+        .subquery()
+    )
+    return query.join(
+        most_recent_state_ids,
+        States.state_id == most_recent_state_ids.c.max_state_id,
+    )
+
+
+def _join_most_recent_state_ids(query):
+    """Join the most recent state of all entities in the run."""
+    most_recent_states_by_date = (
+        query.session.query(
+            States.entity_id.label("max_entity_id"),
+            func.max(States.last_updated).label("max_last_updated"),
         )
-        query = query.filter(~States.domain.in_(IGNORE_DOMAINS))
-        if filters:
-            query = filters.apply(query)
+        .filter(
+            (States.last_updated >= bindparam("run_start"))
+            & (States.last_updated < bindparam("utc_point_in_time"))
+        )
+        .group_by(States.entity_id)
+        .subquery()
+    )
+    most_recent_state_ids = (
+        query.session.query(func.max(States.state_id).label("max_state_id"))
+        .join(
+            most_recent_states_by_date,
+            and_(
+                States.entity_id == most_recent_states_by_date.c.max_entity_id,
+                States.last_updated == most_recent_states_by_date.c.max_last_updated,
+            ),
+        )
+        .group_by(States.entity_id)
+        .subquery()
+    )
+    return query.join(
+        most_recent_state_ids,
+        States.state_id == most_recent_state_ids.c.max_state_id,
+    )
+
+
+def _last_state_ids_before(hass, entity_ids, utc_point_in_time):
+    """Split entity_ids by whether the recorder knows their state at a point in time.
+
+    The recorder keeps the last state it committed for each entity. If
+    that state was last updated before the point in time, it is also the
+    state at the point in time.
+
+    Returns the state ids that are known and the entity_ids that are not.
+    """
+    if (instance := hass.data.get(DATA_INSTANCE)) is None:
+        return [], entity_ids
+
+    last_state_ids = instance.last_state_ids
+    state_ids = []
+    unknown_entity_ids = []
+    for entity_id in entity_ids:
+        if (last_state := last_state_ids.get(entity_id)) is not None and (
+            last_state[1] < utc_point_in_time
+        ):
+            state_ids.append(last_state[0])
+        else:
+            unknown_entity_ids.append(entity_id)
+    return state_ids, unknown_entity_ids
+
+
+def _get_states_by_id_with_session(hass, session, state_ids):
+    """Return the states with the given state ids."""
+    baked_query = hass.data[HISTORY_BAKERY](
+        lambda session: session.query(*QUERY_STATES)
+    )
+    baked_query += lambda q: q.outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
+    baked_query += lambda q: q.filter(
+        States.state_id.in_(bindparam("state_ids", expanding=True))
+    )
+
+    query = baked_query(session).params(state_ids=state_ids)
 
     return [LazyState(row) for row in execute(query)]
 
@@ -311,6 +679,9 @@ def _get_single_entity_states_with_session(hass, session, utc_point_in_time, ent
     baked_query = hass.data[HISTORY_BAKERY](
         lambda session: session.query(*QUERY_STATES)
     )
+    baked_query += lambda q: q.outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
         States.entity_id == bindparam("entity_id"),
@@ -334,6 +705,9 @@ def _sorted_states_to_dict(
     filters=None,
     include_start_time_state=True,
     minimal_response=False,
+    max_points=None,
+    start_states=None,
+    to_state=LazyState,
 ):
     """Convert SQL results into JSON friendly data structure.
 
@@ -345,6 +719,9 @@ def _sorted_states_to_dict(
     We also need to go back and create a synthetic zero data point for
     each list of states, otherwise our graphs won't start on the Y
     axis correctly.
+
+    The states at the start time are read from the database, unless
+    start_states are given. to_state converts the rows to states.
     """
     result = defaultdict(list)
     # Set all entity IDs to empty lists in result set to maintain the order
@@ -355,10 +732,12 @@ def _sorted_states_to_dict(
     # Get the states at the start time
     timer_start = time.perf_counter()
     if include_start_time_state:
-        run = recorder.run_information_from_instance(hass, start_time)
-        for state in _get_states_with_session(
-            hass, session, start_time, entity_ids, run=run, filters=filters
-        ):
+        if start_states is None:
+            run = recorder.run_information_from_instance(hass, start_time)
+            start_states = _get_states_with_session(
+                hass, session, start_time, entity_ids, run=run, filters=filters
+            )
+        for state in start_states:
             state.last_changed = start_time
             state.last_updated = start_time
             result[state.entity_id].append(state)
@@ -367,54 +746,81 @@ def _sorted_states_to_dict(
         elapsed = time.perf_counter() - timer_start
         _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
 
+    # Append all changes to it
+    for ent_id, group in groupby(states, lambda state: state.entity_id):
+        _extend_entity_states(
+            result[ent_id], ent_id, group, minimal_response, max_points, to_state
+        )
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
+
+def _extend_entity_states(
+    ent_results, ent_id, group, minimal_response, max_points, to_state
+):
+    """Add the states of an entity, which follow its state at the start time."""
+    if max_points:
+        group = iter(_downsample_states(list(group), max_points))
+    domain = split_entity_id(ent_id)[0]
+    if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
+        ent_results.extend(to_state(db_state) for db_state in group)
+
+    # With minimal response we only provide a native
+    # State for the first and last response. All the states
+    # in-between only provide the "state" and the
+    # "last_changed".
+    if not ent_results:
+        ent_results.append(to_state(next(group)))
+
     # Called in a tight loop so cache the function
     # here
     _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
 
-    # Append all changes to it
-    for ent_id, group in groupby(states, lambda state: state.entity_id):
-        domain = split_entity_id(ent_id)[0]
-        ent_results = result[ent_id]
-        if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
-            ent_results.extend(LazyState(db_state) for db_state in group)
-
-        # With minimal response we only provide a native
-        # State for the first and last response. All the states
-        # in-between only provide the "state" and the
-        # "last_changed".
-        if not ent_results:
-            ent_results.append(LazyState(next(group)))
-
-        prev_state = ent_results[-1]
-        initial_state_count = len(ent_results)
-
-        for db_state in group:
-            # With minimal response we do not care about attribute
-            # changes so we can filter out duplicate states
-            if db_state.state == prev_state.state:
-                continue
-
-            ent_results.append(
-                {
-                    STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
-                        db_state.last_changed
-                    ),
-                }
-            )
-            prev_state = db_state
+    prev_state = ent_results[-1]
+    initial_state_count = len(ent_results)
 
-        if prev_state and len(ent_results) != initial_state_count:
-            # There was at least one state change
-            # replace the last minimal state with
-            # a full state
-            ent_results[-1] = LazyState(prev_state)
+    for db_state in group:
+        # With minimal response we do not care about attribute
+        # changes so we can filter out duplicate states
+        if db_state.state == prev_state.state:
+            continue
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+        ent_results.append(
+            {
+                STATE_KEY: db_state.state,
+                LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
+                    db_state.last_changed
+                ),
+            }
+        )
+        prev_state = db_state
+
+    if prev_state and len(ent_results) != initial_state_count:
+        # There was at least one state change
+        # replace the last minimal state with
+        # a full state
+        ent_results[-1] = to_state(prev_state)
+
+
+def get_recent_last_states(
+    hass: HomeAssistant, entity_id: str, start_time: datetime | None, limit: int
+) -> list[LazyState] | None:
+    """Return the last limit states of an entity updated since start_time.
+
+    The states are read from memory, None is returned when they might
+    not all be kept in memory.
+    """
+    if (recent_states := _recent_states(hass)) is None:
+        return None
+    return recent_states.get_last_states(entity_id, start_time, limit)
 
 
 def get_state(hass, utc_point_in_time, entity_id, run=None):
     """Return a state at a specific point in time."""
+    if (recent_states := _recent_states(hass)) is not None and (
+        state := recent_states.get_state(entity_id, utc_point_in_time)
+    ) is not None:
+        return state
     states = get_states(hass, utc_point_in_time, (entity_id,), run)
     return states[0] if states else None
@@ -603,6 +603,11 @@ def _apply_update(instance, session, new_version, old_version):  # noqa: C901
             "statistics_short_term",
             "ix_statistics_short_term_statistic_id_start",
         )
+    elif new_version == 25:
+        # Link states to the shared state_attributes table, which is created
+        # by create_all as it is a new table
+        _add_columns(connection, "states", ["attributes_id INTEGER"])
+        _create_index(connection, "states", "ix_states_attributes_id")
 
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
@@ -4,14 +4,23 @@ from __future__ import annotations
 from collections.abc import Callable
 from datetime import datetime
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from sqlalchemy import func
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import distinct
 
+import homeassistant.util.dt as dt_util
+
 from .const import MAX_ROWS_TO_PURGE
-from .models import Events, RecorderRuns, States, StatisticsRuns, StatisticsShortTerm
+from .models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+    StatisticsRuns,
+    StatisticsShortTerm,
+)
 from .repack import repack_database
 from .util import retryable_database_job, session_scope
 
@@ -21,31 +30,109 @@ if TYPE_CHECKING:
 _LOGGER = logging.getLogger(__name__)
 
 
+class PurgeProgress:
+    """Progress of a purge running in chunks.
+
+    Events and short term statistics are purged in the order of their
+    primary key, starting after the last purged id and up to the newest id
+    which was old enough when the purge started.
+    """
+
+    def __init__(self, purge_before: datetime) -> None:
+        """Initialize the progress."""
+        self.purge_before = purge_before
+        self.started = dt_util.utcnow()
+        self.finished: datetime | None = None
+        self.events_purged = 0
+        self.states_purged = 0
+        self.last_event_id = 0
+        self.max_event_id: int | None = None
+        self.last_short_term_statistics_id = 0
+        self.max_short_term_statistics_id: int | None = None
+
+    def extend(self, purge_before: datetime) -> None:
+        """Continue the purge up to a later purge_before.
+
+        The rows up to the last purged ids are not selected again, the
+        newest ids to purge are looked up again for the new purge_before.
+        """
+        if purge_before <= self.purge_before:
+            return
+        self.purge_before = purge_before
+        self.max_event_id = None
+        self.max_short_term_statistics_id = None
+
+    @property
+    def events_left(self) -> int | None:
+        """Return an estimate of the number of events left to purge."""
+        if self.finished:
+            return 0
+        if self.max_event_id is None:
+            return None
+        return max(self.max_event_id - self.last_event_id, 0)
+
+    @property
+    def eta(self) -> float | None:
+        """Return the estimated number of seconds until the purge is finished."""
+        if self.finished:
+            return 0
+        if not self.events_purged or (events_left := self.events_left) is None:
+            return None
+        elapsed = (dt_util.utcnow() - self.started).total_seconds()
+        return elapsed / self.events_purged * events_left
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the progress as a dict."""
+        return {
+            "purge_before": self.purge_before.isoformat(),
+            "started": self.started.isoformat(),
+            "finished": self.finished.isoformat() if self.finished else None,
+            "events_purged": self.events_purged,
+            "states_purged": self.states_purged,
+            "events_left": self.events_left,
+            "eta": self.eta,
+        }
+
+
 @retryable_database_job("purge")
 def purge_old_data(
-    instance: Recorder, purge_before: datetime, repack: bool, apply_filter: bool = False
+    instance: Recorder,
+    purge_before: datetime,
+    repack: bool,
+    apply_filter: bool = False,
+    progress: PurgeProgress | None = None,
 ) -> bool:
     """Purge events and states older than purge_before.
 
-    Cleans up an timeframe of an hour, based on the oldest record.
+    Cleans up a chunk of MAX_ROWS_TO_PURGE events, based on the oldest records.
+    Pass the progress of an earlier call to continue where it stopped.
     """
     _LOGGER.debug(
         "Purging states and events before target %s",
         purge_before.isoformat(sep=" ", timespec="seconds"),
     )
+    if progress is None:
+        progress = PurgeProgress(purge_before)
 
     with session_scope(session=instance.get_session()) as session:  # type: ignore
         # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
-        event_ids = _select_event_ids_to_purge(session, purge_before)
-        state_ids = _select_state_ids_to_purge(session, purge_before, event_ids)
+        event_ids = _select_event_ids_to_purge(session, progress)
+        state_ids, attributes_ids = _select_state_and_attributes_ids_to_purge(
+            session, purge_before, event_ids
+        )
         statistics_runs = _select_statistics_runs_to_purge(session, purge_before)
         short_term_statistics = _select_short_term_statistics_to_purge(
-            session, purge_before
+            session, progress
         )
 
         if state_ids:
             _purge_state_ids(instance, session, state_ids)
 
+        if unused_attributes_ids := _select_unused_attributes_ids(
+            session, attributes_ids
+        ):
+            _purge_attributes_ids(instance, session, unused_attributes_ids)
+
         if event_ids:
             _purge_event_ids(session, event_ids)
 
@@ -55,26 +142,48 @@ def purge_old_data(
         if short_term_statistics:
             _purge_short_term_statistics(session, short_term_statistics)
 
-        if event_ids or statistics_runs or short_term_statistics:
-            # Return false, as we might not be done yet.
-            _LOGGER.debug("Purging hasn't fully completed yet")
-            return False
+        chunk_purged = bool(event_ids or statistics_runs or short_term_statistics)
+        if not chunk_purged:
+            if apply_filter and _purge_filtered_data(instance, session) is False:
+                _LOGGER.debug("Cleanup filtered data hasn't fully completed yet")
+                return False
 
-        if apply_filter and _purge_filtered_data(instance, session) is False:
-            _LOGGER.debug("Cleanup filtered data hasn't fully completed yet")
-            return False
+            _purge_old_recorder_runs(instance, session, purge_before)
+
+    if chunk_purged:
+        # Only move the cursors once the chunk is committed, a chunk
+        # which failed is selected again by the next call.
+        progress.events_purged += len(event_ids)
+        progress.states_purged += len(state_ids)
+        if event_ids:
+            progress.last_event_id = event_ids[-1]
+        if short_term_statistics:
+            progress.last_short_term_statistics_id = short_term_statistics[-1]
+        # Return false, as we might not be done yet.
+        _LOGGER.debug("Purging hasn't fully completed yet")
+        return False
 
-        _purge_old_recorder_runs(instance, session, purge_before)
     if repack:
         repack_database(instance)
+    progress.finished = dt_util.utcnow()
     return True
 
 
-def _select_event_ids_to_purge(session: Session, purge_before: datetime) -> list[int]:
-    """Return a list of event ids to purge."""
+def _select_event_ids_to_purge(session: Session, progress: PurgeProgress) -> list[int]:
+    """Return a list of event ids to purge, in the order of the event id."""
+    if progress.max_event_id is None:
+        progress.max_event_id = (
+            session.query(func.max(Events.event_id))
+            .filter(Events.time_fired < progress.purge_before)
+            .scalar()
+            or 0
+        )
     events = (
         session.query(Events.event_id)
-        .filter(Events.time_fired < purge_before)
+        .filter(Events.event_id > progress.last_event_id)
+        .filter(Events.event_id <= progress.max_event_id)
+        .filter(Events.time_fired < progress.purge_before)
+        .order_by(Events.event_id)
         .limit(MAX_ROWS_TO_PURGE)
         .all()
     )
@@ -82,20 +191,43 @@ def _select_event_ids_to_purge(session: Session, purge_before: datetime) -> list
     return [event.event_id for event in events]
 
 
-def _select_state_ids_to_purge(
+def _select_state_and_attributes_ids_to_purge(
     session: Session, purge_before: datetime, event_ids: list[int]
-) -> set[int]:
-    """Return a list of state ids to purge."""
+) -> tuple[set[int], set[int]]:
+    """Return a list of state ids and attributes ids to purge."""
     if not event_ids:
-        return set()
+        return set(), set()
     states = (
-        session.query(States.state_id)
+        session.query(States.state_id, States.attributes_id)
         .filter(States.last_updated < purge_before)
         .filter(States.event_id.in_(event_ids))
         .all()
     )
     _LOGGER.debug("Selected %s state ids to remove", len(states))
-    return {state.state_id for state in states}
+    state_ids: set[int] = set()
+    attributes_ids: set[int] = set()
+    for state in states:
+        state_ids.add(state.state_id)
+        if state.attributes_id:
+            attributes_ids.add(state.attributes_id)
+    return state_ids, attributes_ids
+
+
+def _select_unused_attributes_ids(
+    session: Session, attributes_ids: set[int]
+) -> set[int]:
+    """Return the attributes ids which are no longer used by any state."""
+    if not attributes_ids:
+        return set()
+    seen_ids = {
+        attributes_id
+        for (attributes_id,) in session.query(distinct(States.attributes_id))
+        .filter(States.attributes_id.in_(attributes_ids))
+        .all()
+    }
+    to_remove = attributes_ids - seen_ids
+    _LOGGER.debug("Selected %s shared attributes to remove", len(to_remove))
+    return to_remove
 
 
 def _select_statistics_runs_to_purge(
@@ -120,12 +252,22 @@ def _select_statistics_runs_to_purge(
 
 
 def _select_short_term_statistics_to_purge(
-    session: Session, purge_before: datetime
+    session: Session, progress: PurgeProgress
 ) -> list[int]:
-    """Return a list of short term statistics to purge."""
+    """Return a list of short term statistics to purge, in the order of the id."""
+    if progress.max_short_term_statistics_id is None:
+        progress.max_short_term_statistics_id = (
+            session.query(func.max(StatisticsShortTerm.id))
+            .filter(StatisticsShortTerm.start < progress.purge_before)
+            .scalar()
+            or 0
+        )
     statistics = (
         session.query(StatisticsShortTerm.id)
-        .filter(StatisticsShortTerm.start < purge_before)
+        .filter(StatisticsShortTerm.id > progress.last_short_term_statistics_id)
+        .filter(StatisticsShortTerm.id <= progress.max_short_term_statistics_id)
+        .filter(StatisticsShortTerm.start < progress.purge_before)
+        .order_by(StatisticsShortTerm.id)
         .limit(MAX_ROWS_TO_PURGE)
         .all()
     )
@@ -174,6 +316,46 @@ def _evict_purged_states_from_old_states_cache(
     for purged_state_id in purged_state_ids.intersection(old_state_reversed):
         old_states.pop(old_state_reversed[purged_state_id], None)
 
+    # The bulk writer only keeps the state_id of the old states
+    if bulk_writer := instance._bulk_writer:  # pylint: disable=protected-access
+        old_state_ids = bulk_writer.old_state_ids
+        for entity_id, old_state_id in list(old_state_ids.items()):
+            if old_state_id in purged_state_ids:
+                del old_state_ids[entity_id]
+
+    # Evict the last states used by history that no longer exist
+    last_state_ids = instance.last_state_ids
+    for entity_id, (state_id, _) in list(last_state_ids.items()):
+        if state_id in purged_state_ids:
+            last_state_ids.pop(entity_id, None)
+
+
+def _purge_attributes_ids(
+    instance: Recorder, session: Session, attributes_ids: set[int]
+) -> None:
+    """Delete shared attributes by attributes id."""
+    deleted_rows = (
+        session.query(StateAttributes)
+        .filter(StateAttributes.attributes_id.in_(attributes_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s shared attributes", deleted_rows)
+
+    # Evict any entries in the state attributes cache referring to purged attributes
+    _evict_purged_attributes_from_attributes_cache(instance, attributes_ids)
+
+
+def _evict_purged_attributes_from_attributes_cache(
+    instance: Recorder, purged_attributes_ids: set[int]
+) -> None:
+    """Evict purged attributes ids from the state attributes cache."""
+    state_attributes_ids = (
+        instance._state_attributes_ids  # pylint: disable=protected-access
+    )
+    for shared_attrs, attributes_id in list(state_attributes_ids.items()):
+        if attributes_id in purged_attributes_ids:
+            del state_attributes_ids[shared_attrs]
+
 
 def _purge_statistics_runs(session: Session, statistics_runs: list[int]) -> None:
     """Delete by run_id."""
@@ -254,9 +436,10 @@ def _purge_filtered_states(
     """Remove filtered states and linked events."""
     state_ids: list[int]
     event_ids: list[int | None]
-    state_ids, event_ids = zip(
+    attributes_ids: list[int | None]
+    state_ids, event_ids, attributes_ids = zip(
         *(
-            session.query(States.state_id, States.event_id)
+            session.query(States.state_id, States.event_id, States.attributes_id)
             .filter(States.entity_id.in_(excluded_entity_ids))
             .limit(MAX_ROWS_TO_PURGE)
             .all()
@@ -268,6 +451,10 @@ def _purge_filtered_states(
     )
     _purge_state_ids(instance, session, set(state_ids))
     _purge_event_ids(session, event_ids)  # type: ignore  # type of event_ids already narrowed to 'list[int]'
+    if unused_attributes_ids := _select_unused_attributes_ids(
+        session, {id_ for id_ in attributes_ids if id_ is not None}
+    ):
+        _purge_attributes_ids(instance, session, unused_attributes_ids)
 
 
 def _purge_filtered_events(
@@ -285,11 +472,18 @@ def _purge_filtered_events(
         "Selected %s event_ids to remove that should be filtered", len(event_ids)
     )
     states: list[States] = (
-        session.query(States.state_id).filter(States.event_id.in_(event_ids)).all()
+        session.query(States.state_id, States.attributes_id)
+        .filter(States.event_id.in_(event_ids))
+        .all()
     )
     state_ids: set[int] = {state.state_id for state in states}
+    attributes_ids: set[int] = {
+        state.attributes_id for state in states if state.attributes_id
+    }
     _purge_state_ids(instance, session, state_ids)
     _purge_event_ids(session, event_ids)
+    if unused_attributes_ids := _select_unused_attributes_ids(session, attributes_ids):
+        _purge_attributes_ids(instance, session, unused_attributes_ids)
 
 
 @retryable_database_job("purge")
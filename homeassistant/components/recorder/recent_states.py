@@ -0,0 +1,255 @@
+"""Keep the recently recorded state changes in memory."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Mapping
+from datetime import datetime
+import threading
+from typing import Any, NamedTuple
+
+from homeassistant.core import Event, State
+import homeassistant.util.dt as dt_util
+
+from .models import LazyState
+
+
+class RecentRow(NamedTuple):
+    """A recorded state, shaped like a row of the states query."""
+
+    entity_id: str
+    state: str
+    last_changed: datetime
+    last_updated: datetime
+    state_attributes: Mapping[str, Any]
+    attributes: None = None
+    shared_attrs: None = None
+
+
+def recent_row_to_state(row: RecentRow) -> LazyState:
+    """Convert a recent row to a state."""
+    state = LazyState(row)
+    state.attributes = row.state_attributes
+    return state
+
+
+class _EntityStates:
+    """The recent state changes of an entity, stored in columns.
+
+    Every state change that was recorded after covered_since is kept. The
+    oldest entry can be older, it holds the state at covered_since.
+    """
+
+    __slots__ = (
+        "covered_since",
+        "seed",
+        "first",
+        "last_updated",
+        "last_changed",
+        "states",
+        "attributes",
+    )
+
+    def __init__(self, covered_since: float) -> None:
+        """Initialize the entity states."""
+        self.covered_since = covered_since
+        # The state the entity had when the recent states were started
+        self.seed: State | None = None
+        # Entries before first are dropped and reclaimed in batches
+        self.first = 0
+        self.last_updated = array("d")
+        self.last_changed = array("d")
+        self.states: list[str] = []
+        self.attributes: list[Mapping[str, Any]] = []
+
+    def add(self, state: State) -> None:
+        """Add a state change, sharing values that did not change."""
+        last_updated = self.last_updated
+        states = self.states
+        attributes = self.attributes
+        timestamp = state.last_updated.timestamp()
+        if len(states) > self.first and timestamp < last_updated[-1]:
+            # Keep the entries ordered if the clock went back
+            idx = bisect_right(last_updated, timestamp, self.first)
+            last_updated.insert(idx, timestamp)
+            self.last_changed.insert(idx, state.last_changed.timestamp())
+            states.insert(idx, state.state)
+            attributes.insert(idx, state.attributes)
+            return
+
+        state_value = state.state
+        state_attributes: Mapping[str, Any] = state.attributes
+        if len(states) > self.first:
+            if state_value == states[-1]:
+                state_value = states[-1]
+            if state_attributes == attributes[-1]:
+                state_attributes = attributes[-1]
+        last_updated.append(timestamp)
+        self.last_changed.append(state.last_changed.timestamp())
+        states.append(state_value)
+        attributes.append(state_attributes)
+
+    def trim(self, cutoff: float, max_entries: int) -> None:
+        """Drop the entries before the state at cutoff and above max_entries."""
+        last_updated = self.last_updated
+        end = len(last_updated)
+        first = max(self.first, end - max_entries)
+        # The newest entry older than the cutoff holds the state at the cutoff
+        first = max(first, bisect_right(last_updated, cutoff, first, end) - 1)
+        if first <= self.first:
+            return
+        self.first = first
+        self.covered_since = max(self.covered_since, last_updated[first])
+        if first > end // 2:
+            del last_updated[:first]
+            del self.last_changed[:first]
+            del self.states[:first]
+            del self.attributes[:first]
+            self.first = 0
+
+    def row(self, entity_id: str, idx: int) -> RecentRow:
+        """Return the entry at idx as a row."""
+        return RecentRow(
+            entity_id,
+            self.states[idx],
+            dt_util.utc_from_timestamp(self.last_changed[idx]),
+            dt_util.utc_from_timestamp(self.last_updated[idx]),
+            self.attributes[idx],
+        )
+
+
+class RecentStates:
+    """Keep the recently recorded state changes in memory.
+
+    The recorder adds every state change it records, and history queries
+    which only ask for recent state changes are answered from memory. A
+    query returns None when the state changes it asks for might not all be
+    in memory, the caller then reads them from the database.
+    """
+
+    def __init__(self, max_age: float, max_entries: int) -> None:
+        """Initialize the recent states."""
+        self.max_age = max_age
+        self.max_entries = max_entries
+        # Nothing is covered until the recorder starts adding state changes
+        self.covered_since = float("inf")
+        self._entities: dict[str, _EntityStates] = {}
+        self._lock = threading.Lock()
+
+    def start(self, states: Iterable[State]) -> None:
+        """Start covering state changes from now, with the current states."""
+        with self._lock:
+            self.covered_since = dt_util.utcnow().timestamp()
+            for state in states:
+                entity = _EntityStates(state.last_updated.timestamp())
+                entity.seed = state
+                entity.add(state)
+                self._entities[state.entity_id] = entity
+
+    def add_event(self, event: Event) -> None:
+        """Add the state change of a state changed event."""
+        entity_id = event.data["entity_id"]
+        with self._lock:
+            if (new_state := event.data.get("new_state")) is None:
+                # History of the removed entity is read from the database
+                self._entities[entity_id] = _EntityStates(event.time_fired.timestamp())
+                return
+            if (entity := self._entities.get(entity_id)) is None:
+                entity = self._entities[entity_id] = _EntityStates(self.covered_since)
+            elif entity.seed is not None:
+                if new_state is entity.seed:
+                    # Already added when the recent states were started
+                    return
+                if new_state.last_updated > entity.seed.last_updated:
+                    entity.seed = None
+            entity.add(new_state)
+            entity.trim(event.time_fired.timestamp() - self.max_age, self.max_entries)
+
+    def purge_entities(self, entity_filter: Callable[[str], bool]) -> None:
+        """Drop the state changes of entities purged from the database."""
+        with self._lock:
+            for entity_id in [
+                entity_id for entity_id in self._entities if entity_filter(entity_id)
+            ]:
+                self._entities[entity_id] = _EntityStates(dt_util.utcnow().timestamp())
+
+    def _covered_entity(self, entity_id: str, start: float) -> _EntityStates | None:
+        """Return the entity if its state changes after start are all known."""
+        if (entity := self._entities.get(entity_id)) is None:
+            if start < self.covered_since:
+                return None
+            entity = _EntityStates(self.covered_since)
+        if start < entity.covered_since:
+            return None
+        return entity
+
+    def get_state(
+        self, entity_id: str, utc_point_in_time: datetime
+    ) -> LazyState | None:
+        """Return the state just before a point in time, if known."""
+        with self._lock:
+            if (entity := self._entities.get(entity_id)) is None:
+                return None
+            idx = bisect_left(
+                entity.last_updated,
+                utc_point_in_time.timestamp(),
+                entity.first,
+                len(entity.last_updated),
+            )
+            if idx == entity.first:
+                return None
+            return recent_row_to_state(entity.row(entity_id, idx - 1))
+
+    def get_rows(
+        self,
+        entity_id: str,
+        start_time: datetime,
+        end_time: datetime | None = None,
+        changes_only: bool = False,
+    ) -> list[RecentRow] | None:
+        """Return the states updated after start_time and before end_time.
+
+        With changes_only, only states which changed are returned.
+        """
+        start = start_time.timestamp()
+        with self._lock:
+            if (entity := self._covered_entity(entity_id, start)) is None:
+                return None
+            last_updated = entity.last_updated
+            end = len(last_updated)
+            start_idx = bisect_right(last_updated, start, entity.first, end)
+            if end_time is not None:
+                end = bisect_left(last_updated, end_time.timestamp(), start_idx, end)
+            if changes_only:
+                last_changed = entity.last_changed
+                return [
+                    entity.row(entity_id, idx)
+                    for idx in range(start_idx, end)
+                    if last_changed[idx] == last_updated[idx]
+                ]
+            return [entity.row(entity_id, idx) for idx in range(start_idx, end)]
+
+    def get_last_states(
+        self, entity_id: str, start_time: datetime | None, limit: int
+    ) -> list[LazyState] | None:
+        """Return the last limit states updated at or after start_time."""
+        start = start_time.timestamp() if start_time is not None else None
+        with self._lock:
+            if (entity := self._entities.get(entity_id)) is None:
+                if start is not None and start >= self.covered_since:
+                    return []
+                return None
+            last_updated = entity.last_updated
+            end = len(last_updated)
+            start_idx = entity.first
+            if start is not None:
+                start_idx = bisect_left(last_updated, start, start_idx, end)
+            # The last limit states are known when there are enough of them
+            if end - start_idx < limit and (
+                start is None or start < entity.covered_since
+            ):
+                return None
+            return [
+                recent_row_to_state(entity.row(entity_id, idx))
+                for idx in range(max(start_idx, end - limit), end)
+            ]
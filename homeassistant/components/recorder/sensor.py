@@ -0,0 +1,82 @@
+"""Sensors exposing the state of the recorder queue."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.sensor import SensorEntity
+from homeassistant.const import TIME_MILLISECONDS
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
+
+from . import Recorder
+from .const import DATA_INSTANCE
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Set up the recorder queue sensors."""
+    if discovery_info is None:
+        return
+
+    instance: Recorder = hass.data[DATA_INSTANCE]
+    async_add_entities(
+        [RecorderQueueDepthSensor(instance), RecorderQueueLatencySensor(instance)]
+    )
+
+
+class RecorderQueueSensor(SensorEntity):
+    """Base class for the recorder queue sensors."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, instance: Recorder) -> None:
+        """Initialize the sensor."""
+        self._instance = instance
+
+
+class RecorderQueueDepthSensor(RecorderQueueSensor):
+    """Number of tasks waiting for the recorder."""
+
+    _attr_name = "Recorder queue depth"
+    _attr_unique_id = "recorder_queue_depth"
+    _attr_icon = "mdi:tray-full"
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of tasks waiting, including spilled events."""
+        return self._instance.queue.qsize()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the counters of the queue."""
+        recorder_queue = self._instance.queue
+        return {
+            "max_backlog": recorder_queue.max_memory,
+            "spill_size": recorder_queue.spill_size,
+            "coalesced": recorder_queue.coalesced,
+            "spilled": recorder_queue.spilled,
+            "dropped": recorder_queue.dropped,
+        }
+
+
+class RecorderQueueLatencySensor(RecorderQueueSensor):
+    """Time the last event processed by the recorder spent in the queue."""
+
+    _attr_name = "Recorder queue latency"
+    _attr_unique_id = "recorder_queue_latency"
+    _attr_icon = "mdi:timer-sand"
+    _attr_native_unit_of_measurement = TIME_MILLISECONDS
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the latency of the last processed event in milliseconds."""
+        if (latency := self._instance.queue_latency) is None:
+            return None
+        return round(latency * 1000)
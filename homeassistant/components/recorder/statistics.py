@@ -527,6 +527,26 @@ def compile_hourly_statistics(
         session.add(Statistics.from_stats(metadata_id, stat))
 
 
+def record_state_change(instance: Recorder, event: Event) -> None:
+    """Pass a recorded state change to the platforms accumulating statistics.
+
+    Platforms implementing record_state_change can keep running statistics,
+    so compiling a period does not need to query the states of the period.
+    A platform which fails must not keep the state change from being recorded.
+    """
+    for domain, platform in instance.hass.data[DOMAIN].items():
+        if not hasattr(platform, "record_state_change"):
+            continue
+        try:
+            platform.record_state_change(instance.hass, event)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception(
+                "Error accumulating the statistics of %s for %s",
+                event.data.get("entity_id"),
+                domain,
+            )
+
+
 @retryable_database_job("statistics")
 def compile_statistics(instance: Recorder, start: datetime) -> bool:
     """Compile 5-minute statistics for all integrations with a recorder platform.
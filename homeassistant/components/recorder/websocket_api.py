@@ -99,16 +99,24 @@ def ws_info(
     instance: Recorder = hass.data[DATA_INSTANCE]
 
     backlog = instance.queue.qsize() if instance and instance.queue else None
+    spilled = instance.queue.spill_size if instance and instance.queue else None
     migration_in_progress = async_migration_in_progress(hass)
     recording = instance.recording if instance else False
     thread_alive = instance.is_alive() if instance else False
+    purge_progress = (
+        instance.purge_progress.as_dict()
+        if instance and instance.purge_progress
+        else None
+    )
 
     recorder_info = {
         "backlog": backlog,
         "max_backlog": MAX_QUEUE_BACKLOG,
+        "spilled_backlog": spilled,
         "migration_in_progress": migration_in_progress,
         "recording": recording,
         "thread_running": thread_alive,
+        "purge": purge_progress,
     }
     connection.send_result(msg["id"], recorder_info)
 
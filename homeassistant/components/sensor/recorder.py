@@ -44,7 +44,7 @@ from homeassistant.const import (
     VOLUME_CUBIC_FEET,
     VOLUME_CUBIC_METERS,
 )
-from homeassistant.core import HomeAssistant, State
+from homeassistant.core import Event, HomeAssistant, State
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity import entity_sources
 import homeassistant.util.dt as dt_util
@@ -125,6 +125,11 @@ WARN_NEGATIVE = "sensor_warn_total_increasing_negative"
 # Keep track of entities for which a warning about unsupported unit has been logged
 WARN_UNSUPPORTED_UNIT = "sensor_warn_unsupported_unit"
 WARN_UNSTABLE_UNIT = "sensor_warn_unstable_unit"
+# Running statistics of sensors, accumulated while their states are recorded
+DATA_ACCUMULATOR = "sensor_statistics_accumulator"
+# Number of periods accumulated per sensor while waiting to be compiled
+MAX_PENDING_PERIODS = 12
+STATISTICS_PERIOD = datetime.timedelta(minutes=5)
 # Link to dev statistics where issues around LTS can be fixed
 LINK_DEV_STATISTICS = "https://my.home-assistant.io/redirect/developer_statistics"
 
@@ -195,6 +200,50 @@ def _parse_float(state: str) -> float:
     return fstate
 
 
+def _warn_unstable_unit(
+    hass: HomeAssistant,
+    old_metadatas: dict[str, tuple[int, StatisticMetaData]],
+    entity_id: str,
+    all_units: set[str | None],
+) -> None:
+    """Log a warning once if the unit of a sensor is changing."""
+    if WARN_UNSTABLE_UNIT not in hass.data:
+        hass.data[WARN_UNSTABLE_UNIT] = set()
+    if entity_id not in hass.data[WARN_UNSTABLE_UNIT]:
+        hass.data[WARN_UNSTABLE_UNIT].add(entity_id)
+        extra = ""
+        if old_metadata := old_metadatas.get(entity_id):
+            extra = (
+                " and matches the unit of already compiled statistics "
+                f"({old_metadata[1]['unit_of_measurement']})"
+            )
+        _LOGGER.warning(
+            "The unit of %s is changing, got multiple %s, generation of long term "
+            "statistics will be suppressed unless the unit is stable%s. "
+            "Go to %s to fix this",
+            entity_id,
+            all_units,
+            extra,
+            LINK_DEV_STATISTICS,
+        )
+
+
+def _warn_unsupported_unit(
+    hass: HomeAssistant, entity_id: str, unit: str | None, device_class: str
+) -> None:
+    """Log a warning once if a sensor has a unit which can't be normalized."""
+    if WARN_UNSUPPORTED_UNIT not in hass.data:
+        hass.data[WARN_UNSUPPORTED_UNIT] = set()
+    if entity_id not in hass.data[WARN_UNSUPPORTED_UNIT]:
+        hass.data[WARN_UNSUPPORTED_UNIT].add(entity_id)
+        _LOGGER.warning(
+            "%s has unit %s which is unsupported for device_class %s",
+            entity_id,
+            unit,
+            device_class,
+        )
+
+
 def _normalize_states(
     hass: HomeAssistant,
     session: Session,
@@ -219,25 +268,7 @@ def _normalize_states(
         if fstates:
             all_units = _get_units(fstates)
             if len(all_units) > 1:
-                if WARN_UNSTABLE_UNIT not in hass.data:
-                    hass.data[WARN_UNSTABLE_UNIT] = set()
-                if entity_id not in hass.data[WARN_UNSTABLE_UNIT]:
-                    hass.data[WARN_UNSTABLE_UNIT].add(entity_id)
-                    extra = ""
-                    if old_metadata := old_metadatas.get(entity_id):
-                        extra = (
-                            " and matches the unit of already compiled statistics "
-                            f"({old_metadata[1]['unit_of_measurement']})"
-                        )
-                    _LOGGER.warning(
-                        "The unit of %s is changing, got multiple %s, generation of long term "
-                        "statistics will be suppressed unless the unit is stable%s. "
-                        "Go to %s to fix this",
-                        entity_id,
-                        all_units,
-                        extra,
-                        LINK_DEV_STATISTICS,
-                    )
+                _warn_unstable_unit(hass, old_metadatas, entity_id, all_units)
                 return None, []
             unit = fstates[0][1].attributes.get(ATTR_UNIT_OF_MEASUREMENT)
         return unit, fstates
@@ -252,16 +283,7 @@ def _normalize_states(
         unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
         # Exclude unsupported units from statistics
         if unit not in UNIT_CONVERSIONS[device_class]:
-            if WARN_UNSUPPORTED_UNIT not in hass.data:
-                hass.data[WARN_UNSUPPORTED_UNIT] = set()
-            if entity_id not in hass.data[WARN_UNSUPPORTED_UNIT]:
-                hass.data[WARN_UNSUPPORTED_UNIT].add(entity_id)
-                _LOGGER.warning(
-                    "%s has unit %s which is unsupported for device_class %s",
-                    entity_id,
-                    unit,
-                    device_class,
-                )
+            _warn_unsupported_unit(hass, entity_id, unit, device_class)
             continue
 
         fstates.append((UNIT_CONVERSIONS[device_class][unit](fstate), state))
@@ -385,6 +407,304 @@ def _last_reset_as_utc_isoformat(last_reset_s: Any, entity_id: str) -> str | Non
     return dt_util.as_utc(last_reset).isoformat()
 
 
+def _period_start(time: datetime.datetime) -> datetime.datetime:
+    """Return the start of the 5-minute period a point in time is in."""
+    return time.replace(minute=time.minute - time.minute % 5, second=0, microsecond=0)
+
+
+class _PeriodAccumulator:
+    """Running statistics of a sensor during a 5-minute period.
+
+    The time weighted mean, min and max of measurements are updated as states
+    are added. The states of sensors with a sum are kept, the sum depends on
+    the last compiled statistics.
+    """
+
+    __slots__ = (
+        "start",
+        "seed",
+        "state_class",
+        "device_class",
+        "valid",
+        "units",
+        "unsupported_unit",
+        "fstates",
+        "first_time",
+        "last_time",
+        "last_value",
+        "accumulated",
+        "min",
+        "max",
+    )
+
+    def __init__(
+        self,
+        start: datetime.datetime,
+        state_class: str,
+        device_class: str | None,
+        seed: State | None,
+    ) -> None:
+        """Initialize the period, starting with the last state before it."""
+        self.start = start
+        self.seed = seed
+        self.state_class = state_class
+        self.device_class = device_class
+        self.valid = True
+        self.units: set[str | None] = set()
+        self.unsupported_unit: tuple[str | None] | None = None
+        self.fstates: list[tuple[float, State]] | None = (
+            [] if "sum" in DEFAULT_STATISTICS[state_class] else None
+        )
+        self.first_time: datetime.datetime | None = None
+        self.last_time: datetime.datetime | None = None
+        self.last_value: float | None = None
+        self.accumulated = 0.0
+        self.min = 0.0
+        self.max = 0.0
+        if seed is not None:
+            self.add(seed)
+
+    def add(self, state: State) -> None:
+        """Add a state, the states must be added in order."""
+        try:
+            fstate = _parse_float(state.state)
+        except ValueError:
+            return
+        unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        if (device_class := self.device_class) in UNIT_CONVERSIONS:
+            if unit not in UNIT_CONVERSIONS[device_class]:
+                if self.unsupported_unit is None:
+                    self.unsupported_unit = (unit,)
+                return
+            fstate = UNIT_CONVERSIONS[device_class][unit](fstate)
+        else:
+            self.units.add(unit)
+
+        if self.fstates is not None:
+            self.fstates.append((fstate, state))
+            return
+
+        # The last state before the period counts from the start of the period
+        time = max(state.last_updated, self.start)
+        if self.last_value is None:
+            self.first_time = time
+            self.min = self.max = fstate
+        else:
+            assert self.last_time is not None
+            # Accumulate the value, weighted by duration until next state change
+            self.accumulated += (
+                self.last_value * (time - self.last_time).total_seconds()
+            )
+            self.min = min(self.min, fstate)
+            self.max = max(self.max, fstate)
+        self.last_value = fstate
+        self.last_time = time
+
+    def mean(self, end: datetime.datetime) -> float:
+        """Return the time weighted average of the period."""
+        assert self.last_value is not None
+        assert self.first_time is not None and self.last_time is not None
+        accumulated = (
+            self.accumulated + self.last_value * (end - self.last_time).total_seconds()
+        )
+        return accumulated / (end - self.first_time).total_seconds()
+
+    def normalize(
+        self,
+        hass: HomeAssistant,
+        old_metadatas: dict[str, tuple[int, StatisticMetaData]],
+        entity_id: str,
+    ) -> tuple[str | None, bool]:
+        """Return the unit of the period and if it has valid states."""
+        has_values = (
+            bool(self.fstates)
+            if self.fstates is not None
+            else self.last_value is not None
+        )
+        if (device_class := self.device_class) in UNIT_CONVERSIONS:
+            if self.unsupported_unit is not None:
+                _warn_unsupported_unit(
+                    hass, entity_id, self.unsupported_unit[0], device_class
+                )
+            return DEVICE_CLASS_UNITS[device_class], has_values
+        if len(self.units) > 1:
+            _warn_unstable_unit(hass, old_metadatas, entity_id, self.units)
+            return None, False
+        return next(iter(self.units), None), has_values
+
+
+class _SensorAccumulator:
+    """Periods of a sensor which have not been compiled yet."""
+
+    __slots__ = ("last_state", "periods", "valid")
+
+    def __init__(self, last_state: State | None) -> None:
+        """Initialize the sensor."""
+        self.last_state = last_state
+        self.periods: dict[datetime.datetime, _PeriodAccumulator] = {}
+        self.valid = True
+
+    def period(self, start: datetime.datetime, state: State) -> _PeriodAccumulator:
+        """Return a period which has not been compiled yet, creating it if needed."""
+        # Seed a missing period with the state at its start
+        for period in self.periods.values():
+            if period.start > start:
+                seed = period.seed
+                break
+        else:
+            seed = self.last_state
+        return _PeriodAccumulator(
+            start,
+            state.attributes[ATTR_STATE_CLASS],
+            state.attributes.get(ATTR_DEVICE_CLASS),
+            seed,
+        )
+
+
+class _StatisticsAccumulator:
+    """Accumulate the statistics of sensors while their states are recorded.
+
+    Compiling a period with the running statistics does not need to query
+    the states of the period. Periods which started before the accumulator
+    saw the first state change, such as after a restart, and sensors whose
+    states arrive out of order are compiled from the recorded history.
+    """
+
+    def __init__(self, since: datetime.datetime) -> None:
+        """Initialize the accumulator."""
+        # Periods starting at or after since have seen all state changes
+        self.since = since
+        self.sensors: dict[str, _SensorAccumulator] = {}
+        # The end and the state of the last compiled sum of sensors
+        self.last_sums: dict[str, tuple[datetime.datetime, dict[str, Any]]] = {}
+        # The start and the periods of the last compiled period
+        self.compiled: tuple[
+            datetime.datetime, dict[str, _PeriodAccumulator]
+        ] | None = None
+
+    def add(self, event: Event) -> None:
+        """Add a recorded state change."""
+        entity_id: str = event.data["entity_id"]
+        new_state: State | None = event.data.get("new_state")
+        if (sensor := self.sensors.get(entity_id)) is None:
+            if (
+                new_state is None
+                or new_state.attributes.get(ATTR_STATE_CLASS) not in STATE_CLASSES
+            ):
+                return
+            sensor = self.sensors[entity_id] = _SensorAccumulator(
+                event.data.get("old_state")
+            )
+
+        if new_state is None:
+            # The sensor was removed
+            if sensor.periods:
+                sensor.last_state = None
+            else:
+                del self.sensors[entity_id]
+            return
+
+        if (
+            last_state := sensor.last_state
+        ) is not None and new_state.last_updated < last_state.last_updated:
+            # States must be added in order
+            sensor.valid = False
+        elif new_state.attributes.get(ATTR_STATE_CLASS) not in STATE_CLASSES:
+            # The sensor no longer has statistics, its periods are compiled
+            # from the recorded history
+            sensor.valid = False
+        if not sensor.valid:
+            return
+
+        start = _period_start(new_state.last_updated)
+        if (period := sensor.periods.get(start)) is None:
+            period = sensor.periods[start] = sensor.period(start, new_state)
+            if len(sensor.periods) > MAX_PENDING_PERIODS:
+                # Periods are not compiled, only accumulate recent periods
+                oldest = sensor.periods.pop(next(iter(sensor.periods)))
+                self.since = max(self.since, oldest.start + STATISTICS_PERIOD)
+
+        if period.state_class != new_state.attributes.get(
+            ATTR_STATE_CLASS
+        ) or period.device_class != new_state.attributes.get(ATTR_DEVICE_CLASS):
+            period.valid = False
+        # Statistics of measurements are compiled from significant changes only
+        elif (
+            period.fstates is not None
+            or new_state.last_changed == new_state.last_updated
+        ):
+            period.add(new_state)
+        sensor.last_state = new_state
+
+    def pop_periods(
+        self, start: datetime.datetime, sensor_states: list[State]
+    ) -> dict[str, _PeriodAccumulator]:
+        """Return and forget the accumulated period of the sensors.
+
+        The periods are kept until the next period is compiled, the database
+        job may fail and compile the period again.
+        """
+        if (compiled := self.compiled) is not None and compiled[0] == start:
+            # The period is compiled again, the database job failed
+            return dict(compiled[1])
+
+        periods: dict[str, _PeriodAccumulator] = {}
+        complete = start >= self.since
+        for state in sensor_states:
+            entity_id = state.entity_id
+            if (sensor := self.sensors.get(entity_id)) is None:
+                if complete:
+                    # No state changes, the state was the same during the period
+                    periods[entity_id] = _PeriodAccumulator(
+                        start,
+                        state.attributes[ATTR_STATE_CLASS],
+                        state.attributes.get(ATTR_DEVICE_CLASS),
+                        state,
+                    )
+                continue
+
+            if (period := sensor.periods.pop(start, None)) is None and complete:
+                period = sensor.period(start, state)
+            # Forget periods which were not compiled
+            for old_start in [i for i in sensor.periods if i < start]:
+                del sensor.periods[old_start]
+
+            if (
+                complete
+                and sensor.valid
+                and period is not None
+                and period.valid
+                and period.state_class == state.attributes[ATTR_STATE_CLASS]
+                and period.device_class == state.attributes.get(ATTR_DEVICE_CLASS)
+            ):
+                periods[entity_id] = period
+
+        self.compiled = (start, periods)
+        return dict(periods)
+
+    def last_sum(
+        self, entity_id: str, start: datetime.datetime
+    ) -> dict[str, Any] | None:
+        """Return the last compiled sum of a sensor if it ended at start."""
+        if (last_sum := self.last_sums.get(entity_id)) is None or last_sum[0] != start:
+            return None
+        return last_sum[1]
+
+
+def record_state_change(hass: HomeAssistant, event: Event) -> None:
+    """Accumulate the statistics of a recorded sensor state change.
+
+    Note: This is called from the recorder thread
+    """
+    if not event.data["entity_id"].startswith(f"{DOMAIN}."):
+        return
+    if (accumulator := hass.data.get(DATA_ACCUMULATOR)) is None:
+        accumulator = hass.data[DATA_ACCUMULATOR] = _StatisticsAccumulator(
+            _period_start(event.time_fired) + STATISTICS_PERIOD
+        )
+    accumulator.add(event)
+
+
 def compile_statistics(
     hass: HomeAssistant, start: datetime.datetime, end: datetime.datetime
 ) -> list[StatisticResult]:
@@ -412,9 +732,19 @@ def _compile_statistics(  # noqa: C901
         hass, session, statistic_ids=[i.entity_id for i in sensor_states]
     )
 
+    # Use the statistics accumulated while recording the period, if complete
+    accumulator: _StatisticsAccumulator | None = None
+    periods: dict[str, _PeriodAccumulator] = {}
+    if end - start == STATISTICS_PERIOD and start == _period_start(start):
+        accumulator = hass.data.get(DATA_ACCUMULATOR)
+    if accumulator is not None:
+        periods = accumulator.pop_periods(start, sensor_states)
+
     # Get history between start and end
     entities_full_history = [
-        i.entity_id for i in sensor_states if "sum" in wanted_statistics[i.entity_id]
+        i.entity_id
+        for i in sensor_states
+        if "sum" in wanted_statistics[i.entity_id] and i.entity_id not in periods
     ]
     history_list = {}
     if entities_full_history:
@@ -429,7 +759,7 @@ def _compile_statistics(  # noqa: C901
     entities_significant_history = [
         i.entity_id
         for i in sensor_states
-        if "sum" not in wanted_statistics[i.entity_id]
+        if "sum" not in wanted_statistics[i.entity_id] and i.entity_id not in periods
     ]
     if entities_significant_history:
         _history_list = history.get_significant_states_with_session(  # type: ignore
@@ -443,22 +773,28 @@ def _compile_statistics(  # noqa: C901
     # If there are no recent state changes, the sensor's state may already be pruned
     # from the recorder. Get the state from the state machine instead.
     for _state in sensor_states:
-        if _state.entity_id not in history_list:
+        if _state.entity_id not in history_list and _state.entity_id not in periods:
             history_list[_state.entity_id] = (_state,)
 
-    for _state in sensor_states:  # pylint: disable=too-many-nested-blocks
+    for _state in sensor_states:
         entity_id = _state.entity_id
-        if entity_id not in history_list:
+        period = periods.get(entity_id)
+        if period is None and entity_id not in history_list:
             continue
 
         state_class = _state.attributes[ATTR_STATE_CLASS]
         device_class = _state.attributes.get(ATTR_DEVICE_CLASS)
-        entity_history = history_list[entity_id]
-        unit, fstates = _normalize_states(
-            hass, session, old_metadatas, entity_history, device_class, entity_id
-        )
+        if period is not None:
+            unit, has_values = period.normalize(hass, old_metadatas, entity_id)
+            fstates = period.fstates or []
+        else:
+            entity_history = history_list[entity_id]
+            unit, fstates = _normalize_states(
+                hass, session, old_metadatas, entity_history, device_class, entity_id
+            )
+            has_values = bool(fstates)
 
-        if not fstates:
+        if not has_values:
             continue
 
         # Check metadata
@@ -494,106 +830,151 @@ def _compile_statistics(  # noqa: C901
 
         # Make calculations
         stat: StatisticData = {"start": start}
-        if "max" in wanted_statistics[entity_id]:
-            stat["max"] = max(*itertools.islice(zip(*fstates), 1))  # type: ignore[typeddict-item]
-        if "min" in wanted_statistics[entity_id]:
-            stat["min"] = min(*itertools.islice(zip(*fstates), 1))  # type: ignore[typeddict-item]
-
-        if "mean" in wanted_statistics[entity_id]:
-            stat["mean"] = _time_weighted_average(fstates, start, end)
+        if period is not None and period.fstates is None:
+            # The running statistics of the period
+            if "max" in wanted_statistics[entity_id]:
+                stat["max"] = period.max
+            if "min" in wanted_statistics[entity_id]:
+                stat["min"] = period.min
+            if "mean" in wanted_statistics[entity_id]:
+                stat["mean"] = period.mean(end)
+        else:
+            if "max" in wanted_statistics[entity_id]:
+                stat["max"] = max(*itertools.islice(zip(*fstates), 1))  # type: ignore[typeddict-item]
+            if "min" in wanted_statistics[entity_id]:
+                stat["min"] = min(*itertools.islice(zip(*fstates), 1))  # type: ignore[typeddict-item]
+            if "mean" in wanted_statistics[entity_id]:
+                stat["mean"] = _time_weighted_average(fstates, start, end)
 
         if "sum" in wanted_statistics[entity_id]:
-            last_reset = old_last_reset = None
-            new_state = old_state = None
-            _sum = 0.0
-            last_stats = statistics.get_last_short_term_statistics(
-                hass, 1, entity_id, False
+            last_stat = None
+            if accumulator is not None and old_metadata:
+                last_stat = accumulator.last_sum(entity_id, start)
+            if last_stat is None:
+                last_stats = statistics.get_last_short_term_statistics(
+                    hass, 1, entity_id, False
+                )
+                if entity_id in last_stats:
+                    last_stat = last_stats[entity_id][0]
+
+            if (
+                compiled_sum := _compile_sum(
+                    hass, entity_id, state_class, fstates, last_stat
+                )
+            ) is None:
+                # No valid updates
+                continue
+
+            last_reset, stat["state"], stat["sum"] = compiled_sum
+            if last_reset is not None:
+                stat["last_reset"] = dt_util.parse_datetime(last_reset)
+            if accumulator is not None:
+                accumulator.last_sums[entity_id] = (
+                    end,
+                    {
+                        "last_reset": last_reset,
+                        "state": stat["state"],
+                        "sum": stat["sum"],
+                    },
+                )
+
+        result.append({"meta": meta, "stat": stat})
+
+    return result
+
+
+def _compile_sum(
+    hass: HomeAssistant,
+    entity_id: str,
+    state_class: str,
+    fstates: list[tuple[float, State]],
+    last_stat: dict[str, Any] | None,
+) -> tuple[str | None, float, float] | None:
+    """Add the states of a period to the sum, starting at the last statistic.
+
+    Returns the last_reset, the state and the sum at the end of the period, or
+    None if there are no valid updates.
+    """
+    last_reset = old_last_reset = None
+    new_state = old_state = None
+    _sum = 0.0
+    if last_stat is not None:
+        # We have compiled history for this sensor before, use that as a starting point
+        last_reset = old_last_reset = last_stat["last_reset"]
+        new_state = old_state = last_stat["state"]
+        _sum = last_stat["sum"] or 0.0
+
+    for fstate, state in fstates:
+        reset = False
+        if (
+            state_class != STATE_CLASS_TOTAL_INCREASING
+            and (
+                last_reset := _last_reset_as_utc_isoformat(
+                    state.attributes.get("last_reset"), entity_id
+                )
             )
-            if entity_id in last_stats:
-                # We have compiled history for this sensor before, use that as a starting point
-                last_reset = old_last_reset = last_stats[entity_id][0]["last_reset"]
-                new_state = old_state = last_stats[entity_id][0]["state"]
-                _sum = last_stats[entity_id][0]["sum"] or 0.0
-
-            for fstate, state in fstates:
-                reset = False
-                if (
-                    state_class != STATE_CLASS_TOTAL_INCREASING
-                    and (
-                        last_reset := _last_reset_as_utc_isoformat(
-                            state.attributes.get("last_reset"), entity_id
-                        )
-                    )
-                    != old_last_reset
-                    and last_reset is not None
+            != old_last_reset
+            and last_reset is not None
+        ):
+            if old_state is None:
+                _LOGGER.info(
+                    "Compiling initial sum statistics for %s, zero point set to %s",
+                    entity_id,
+                    fstate,
+                )
+            else:
+                _LOGGER.info(
+                    "Detected new cycle for %s, last_reset set to %s (old last_reset %s)",
+                    entity_id,
+                    last_reset,
+                    old_last_reset,
+                )
+            reset = True
+        elif old_state is None and last_reset is None:
+            reset = True
+            _LOGGER.info(
+                "Compiling initial sum statistics for %s, zero point set to %s",
+                entity_id,
+                fstate,
+            )
+        elif state_class == STATE_CLASS_TOTAL_INCREASING:
+            try:
+                if old_state is None or reset_detected(
+                    hass, entity_id, fstate, new_state, state
                 ):
-                    if old_state is None:
-                        _LOGGER.info(
-                            "Compiling initial sum statistics for %s, zero point set to %s",
-                            entity_id,
-                            fstate,
-                        )
-                    else:
-                        _LOGGER.info(
-                            "Detected new cycle for %s, last_reset set to %s (old last_reset %s)",
-                            entity_id,
-                            last_reset,
-                            old_last_reset,
-                        )
-                    reset = True
-                elif old_state is None and last_reset is None:
                     reset = True
                     _LOGGER.info(
-                        "Compiling initial sum statistics for %s, zero point set to %s",
+                        "Detected new cycle for %s, value dropped from %s to %s, "
+                        "triggered by state with last_updated set to %s",
                         entity_id,
+                        new_state,
+                        state.last_updated.isoformat(),
                         fstate,
                     )
-                elif state_class == STATE_CLASS_TOTAL_INCREASING:
-                    try:
-                        if old_state is None or reset_detected(
-                            hass, entity_id, fstate, new_state, state
-                        ):
-                            reset = True
-                            _LOGGER.info(
-                                "Detected new cycle for %s, value dropped from %s to %s, "
-                                "triggered by state with last_updated set to %s",
-                                entity_id,
-                                new_state,
-                                state.last_updated.isoformat(),
-                                fstate,
-                            )
-                    except HomeAssistantError:
-                        continue
-
-                if reset:
-                    # The sensor has been reset, update the sum
-                    if old_state is not None:
-                        _sum += new_state - old_state
-                    # ..and update the starting point
-                    new_state = fstate
-                    old_last_reset = last_reset
-                    # Force a new cycle for an existing sensor to start at 0
-                    if old_state is not None:
-                        old_state = 0.0
-                    else:
-                        old_state = new_state
-                else:
-                    new_state = fstate
-
-            if new_state is None or old_state is None:
-                # No valid updates
+            except HomeAssistantError:
                 continue
 
-            # Update the sum with the last state
-            _sum += new_state - old_state
-            if last_reset is not None:
-                stat["last_reset"] = dt_util.parse_datetime(last_reset)
-            stat["sum"] = _sum
-            stat["state"] = new_state
+        if reset:
+            # The sensor has been reset, update the sum
+            if old_state is not None:
+                _sum += new_state - old_state
+            # ..and update the starting point
+            new_state = fstate
+            old_last_reset = last_reset
+            # Force a new cycle for an existing sensor to start at 0
+            if old_state is not None:
+                old_state = 0.0
+            else:
+                old_state = new_state
+        else:
+            new_state = fstate
 
-        result.append({"meta": meta, "stat": stat})
+    if new_state is None or old_state is None:
+        return None
 
-    return result
+    # Update the sum with the last state
+    _sum += new_state - old_state
+    return last_reset, new_state, _sum
 
 
 def list_statistic_ids(hass: HomeAssistant, statistic_type: str | None = None) -> dict:
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from collections import deque
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 import contextlib
 from datetime import datetime, timedelta
 import logging
@@ -12,6 +12,7 @@ from typing import Any, Literal, cast
 import voluptuous as vol
 
 from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
+from homeassistant.components.recorder import history
 from homeassistant.components.recorder.models import States
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.components.sensor import (
@@ -473,23 +474,48 @@ class StatisticsSensor(SensorEntity):
     async def _initialize_from_database(self) -> None:
         """Initialize the list of states from the database.
 
-        The query will get the list of states in DESCENDING order so that we
-        can limit the result to self._sample_size. Afterwards reverse the
-        list so that we get it in the right order again.
-
         If MaxAge is provided then query will restrict to entries younger then
         current datetime - MaxAge.
         """
 
         _LOGGER.debug("%s: initializing values from the database", self.entity_id)
 
+        records_older_then = None
+        if self._samples_max_age is not None:
+            records_older_then = dt_util.utcnow() - self._samples_max_age
+
+        # The recorder keeps the recent states in memory
+        states: Sequence[State] | None = history.get_recent_last_states(
+            self.hass,
+            self._source_entity_id.lower(),
+            records_older_then,
+            self._samples_max_buffer_size,
+        )
+        if states is None:
+            states = self._load_states_from_database(records_older_then)
+
+        for state in states:
+            self._add_state_to_queue(state)
+
+        self.async_schedule_update_ha_state(True)
+
+        _LOGGER.debug("%s: initializing from database completed", self.entity_id)
+
+    def _load_states_from_database(
+        self, records_older_then: datetime | None
+    ) -> list[State]:
+        """Load the last states of the source entity from the database.
+
+        The query will get the list of states in DESCENDING order so that we
+        can limit the result to self._sample_size. Afterwards reverse the
+        list so that we get it in the right order again.
+        """
         with session_scope(hass=self.hass) as session:
             query = session.query(States).filter(
                 States.entity_id == self._source_entity_id.lower()
             )
 
-            if self._samples_max_age is not None:
-                records_older_then = dt_util.utcnow() - self._samples_max_age
+            if records_older_then is not None:
                 _LOGGER.debug(
                     "%s: retrieve records not older then %s",
                     self.entity_id,
@@ -504,13 +530,7 @@ class StatisticsSensor(SensorEntity):
             )
             states = execute(query, to_native=True, validate_entity_ids=False)
 
-        if states:
-            for state in reversed(states):
-                self._add_state_to_queue(state)
-
-        self.async_schedule_update_ha_state(True)
-
-        _LOGGER.debug("%s: initializing from database completed", self.entity_id)
+        return list(reversed(states)) if states else []
 
     def _update_attributes(self) -> None:
         """Calculate and update the various attributes."""
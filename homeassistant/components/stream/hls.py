@@ -423,10 +423,18 @@ class HlsSegmentView(StreamView):
                 status=HTTPStatus.NOT_FOUND,
                 headers={"Cache-Control": f"max-age={track.target_duration:.0f}"},
             )
-        return web.Response(
-            body=segment.get_data(),
+        # Write the parts one by one instead of joining them for each viewer.
+        # The segment may still be in progress, only send the parts so far.
+        parts = [part.data for part in segment.parts]
+        response = web.StreamResponse(
             headers={
                 "Content-Type": "video/iso.segment",
                 "Cache-Control": f"max-age={6*track.target_duration:.0f}",
             },
         )
+        response.content_length = sum(len(data) for data in parts)
+        await response.prepare(request)
+        for data in parts:
+            await response.write(data)
+        await response.write_eof()
+        return response
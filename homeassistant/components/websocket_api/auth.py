@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from typing import TYPE_CHECKING, Any, Final
+from typing import TYPE_CHECKING, Any, Final, cast
 
 from aiohttp.web import Request
 import voluptuous as vol
@@ -30,6 +30,7 @@ AUTH_MESSAGE_SCHEMA: Final = vol.Schema(
         vol.Required("type"): TYPE_AUTH,
         vol.Exclusive("api_password", "auth"): str,
         vol.Exclusive("access_token", "auth"): str,
+        vol.Optional("supported_features"): {str: int},
     }
 )
 
@@ -85,7 +86,13 @@ class AuthPhase:
                 msg["access_token"]
             )
             if refresh_token is not None:
-                conn = await self._async_finish_auth(refresh_token.user, refresh_token)
+                # Validated by AUTH_MESSAGE_SCHEMA
+                supported_features = cast(
+                    "dict[str, int] | None", msg.get("supported_features")
+                )
+                conn = await self._async_finish_auth(
+                    refresh_token.user, refresh_token, supported_features
+                )
                 conn.subscriptions[
                     "auth"
                 ] = self._hass.auth.async_register_revoke_token_callback(
@@ -99,12 +106,18 @@ class AuthPhase:
         raise Disconnect
 
     async def _async_finish_auth(
-        self, user: User, refresh_token: RefreshToken
+        self,
+        user: User,
+        refresh_token: RefreshToken,
+        supported_features: dict[str, int] | None = None,
     ) -> ActiveConnection:
         """Create an active connection."""
         self._logger.debug("Auth OK")
         await process_success_login(self._request)
-        self._send_message(auth_ok_message())
-        return ActiveConnection(
+        conn = ActiveConnection(
             self._logger, self._hass, self._send_message, user, refresh_token
         )
+        if supported_features:
+            conn.supported_features = supported_features
+        self._send_message(auth_ok_message())
+        return conn
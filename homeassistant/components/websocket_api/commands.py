@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 import json
 from typing import Any
 
@@ -15,7 +15,7 @@ from homeassistant.const import (
     MATCH_ALL,
     SIGNAL_BOOTSTRAP_INTEGRATONS,
 )
-from homeassistant.core import Context, Event, HomeAssistant, callback
+from homeassistant.core import Context, Event, HomeAssistant, State, callback
 from homeassistant.exceptions import (
     HomeAssistantError,
     ServiceNotFound,
@@ -27,6 +27,9 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.event import (
     TrackTemplate,
     TrackTemplateResult,
+    async_get_template_render_queue,
+    async_get_time_scheduler,
+    async_track_state_change_event,
     async_track_template_result,
 )
 from homeassistant.helpers.json import ExtendedJSONEncoder
@@ -58,9 +61,13 @@ def async_register_commands(
     async_reg(hass, handle_ping)
     async_reg(hass, handle_render_template)
     async_reg(hass, handle_subscribe_bootstrap_integrations)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_subscribe_trigger)
+    async_reg(hass, handle_template_render_stats)
+    async_reg(hass, handle_entity_write_stats)
     async_reg(hass, handle_test_condition)
+    async_reg(hass, handle_time_scheduler_stats)
     async_reg(hass, handle_unsubscribe_events)
 
 
@@ -233,17 +240,110 @@ def handle_get_states(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
     """Handle get states command."""
+    states = _async_get_allowed_states(hass, connection)
+
+    try:
+        states_json = b",".join([state.as_dict_json for state in states])
+    except (ValueError, TypeError):
+        # Let the regular serialization find and log the bad data
+        connection.send_message(messages.result_message(msg["id"], states))
+        return
+
+    connection.send_message(
+        messages.result_message_json(msg["id"], f'[{states_json.decode("utf-8")}]')
+    )
+
+
+@callback
+def _async_get_allowed_states(
+    hass: HomeAssistant, connection: ActiveConnection
+) -> list[State]:
+    """Return the states the user of the connection may read."""
     if connection.user.permissions.access_all_entities("read"):
-        states = hass.states.async_all()
+        return hass.states.async_all()
+    entity_perm = connection.user.permissions.check_entity
+    return [
+        state
+        for state in hass.states.async_all()
+        if entity_perm(state.entity_id, "read")
+    ]
+
+
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+    }
+)
+def handle_subscribe_entities(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle subscribe entities command.
+
+    Sends the compressed states of the entities and after that only the
+    fields that changed, instead of the full old and new state.
+    """
+    entity_ids = set(msg.get("entity_ids", []))
+
+    @callback
+    def forward_entity_changes(event: Event) -> None:
+        """Forward entity state changed events to websocket."""
+        if not connection.user.permissions.check_entity(
+            event.data["entity_id"], POLICY_READ
+        ):
+            return
+
+        connection.send_message(messages.cached_state_diff_message(msg["id"], event))
+
+    @callback
+    def forward_entity_change_batches(events: Sequence[Event]) -> None:
+        """Forward batches of state changed events in a single message."""
+        allowed = tuple(
+            event
+            for event in events
+            if connection.user.permissions.check_entity(
+                event.data["entity_id"], POLICY_READ
+            )
+        )
+        if len(allowed) > 1 and len(
+            {event.data["entity_id"] for event in allowed}
+        ) == len(allowed):
+            connection.send_message(
+                messages.cached_state_diff_batch_message(msg["id"], allowed)
+            )
+            return
+        # The diffs of an entity changing twice can not be merged
+        for event in allowed:
+            connection.send_message(
+                messages.cached_state_diff_message(msg["id"], event)
+            )
+
+    # The states must be read in the same callback the listener is added in,
+    # otherwise changes happening in between would be missed.
+    states = _async_get_allowed_states(hass, connection)
+    if entity_ids:
+        states = [state for state in states if state.entity_id in entity_ids]
+        connection.subscriptions[msg["id"]] = async_track_state_change_event(
+            hass, entity_ids, forward_entity_changes
+        )
     else:
-        entity_perm = connection.user.permissions.check_entity
-        states = [
-            state
-            for state in hass.states.async_all()
-            if entity_perm(state.entity_id, "read")
-        ]
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen_batch(
+            EVENT_STATE_CHANGED, forward_entity_change_batches
+        )
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    connection.send_message(messages.result_message(msg["id"]))
+    connection.send_message(
+        messages.event_message(
+            msg["id"],
+            {
+                messages.ENTITY_EVENT_ADD: {
+                    state.entity_id: messages.compressed_state_dict_add(state)
+                    for state in states
+                }
+            },
+        )
+    )
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -393,6 +493,49 @@ async def handle_render_template(
     hass.loop.call_soon_threadsafe(info.async_refresh)
 
 
+@callback
+@decorators.websocket_command({vol.Required("type"): "template/render_stats"})
+@decorators.require_admin
+def handle_template_render_stats(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle template render stats command."""
+    connection.send_result(
+        msg["id"], async_get_template_render_queue(hass).async_stats()
+    )
+
+
+@callback
+@decorators.websocket_command({vol.Required("type"): "time_scheduler/stats"})
+@decorators.require_admin
+def handle_time_scheduler_stats(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle time scheduler stats command."""
+    connection.send_result(msg["id"], async_get_time_scheduler(hass).async_stats())
+
+
+@callback
+@decorators.websocket_command(
+    {vol.Required("type"): "entity/write_stats", vol.Optional("enable"): bool}
+)
+@decorators.require_admin
+def handle_entity_write_stats(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle entity write stats command.
+
+    Enabling starts collecting the statistics from scratch, disabling stops
+    collecting them and returns the collected ones one last time.
+    """
+    if msg.get("enable"):
+        entity.async_enable_write_stats(hass)
+    stats = entity.async_get_write_stats(hass)
+    if msg.get("enable") is False:
+        entity.async_disable_write_stats(hass)
+    connection.send_result(msg["id"], stats)
+
+
 @callback
 @decorators.websocket_command(
     {vol.Required("type"): "entity/source", vol.Optional("entity_id"): [cv.entity_id]}
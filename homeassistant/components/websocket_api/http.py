@@ -20,6 +20,7 @@ from .auth import AuthPhase, auth_required_message
 from .const import (
     CANCELLATION_ERRORS,
     DATA_CONNECTIONS,
+    FEATURE_COALESCE_MESSAGES,
     MAX_PENDING_MSG,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -67,17 +68,41 @@ class WebSocketHandler:
         self._writer_task: asyncio.Task | None = None
         self._logger = WebSocketAdapter(_WS_LOGGER, {"connid": id(self)})
         self._peak_checker_unsub: Callable[[], None] | None = None
+        self._coalesce_messages = False
 
     async def _writer(self) -> None:
-        """Write outgoing messages."""
+        """Write outgoing messages.
+
+        If the client supports it, all messages waiting in the queue are
+        sent together as a JSON array in a single frame.
+        """
+        to_write = self._to_write
+        wsock = self.wsock
+        logger = self._logger
         # Exceptions if Socket disconnected or cancelled by connection handler
         with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
-            while not self.wsock.closed:
-                if (message := await self._to_write.get()) is None:
+            while not wsock.closed:
+                if (message := await to_write.get()) is None:
                     break
 
-                self._logger.debug("Sending %s", message)
-                await self.wsock.send_str(message)
+                if not self._coalesce_messages or to_write.empty():
+                    logger.debug("Sending %s", message)
+                    await wsock.send_str(message)
+                    continue
+
+                messages = [message]
+                closing = False
+                while not to_write.empty():
+                    if (message := to_write.get_nowait()) is None:
+                        closing = True
+                        break
+                    messages.append(message)
+
+                coalesced_messages = f'[{",".join(messages)}]'
+                logger.debug("Sending %s", coalesced_messages)
+                await wsock.send_str(coalesced_messages)
+                if closing:
+                    break
 
         # Clean up the peaker checker when we shut down the writer
         if self._peak_checker_unsub is not None:
@@ -197,6 +222,9 @@ class WebSocketHandler:
 
             self._logger.debug("Received %s", msg_data)
             connection = await auth.async_handle(msg_data)
+            self._coalesce_messages = bool(
+                connection.supported_features.get(FEATURE_COALESCE_MESSAGES)
+            )
             self.hass.data[DATA_CONNECTIONS] = (
                 self.hass.data.get(DATA_CONNECTIONS, 0) + 1
             )
@@ -7,7 +7,7 @@ from typing import Any, Final
 
 import voluptuous as vol
 
-from homeassistant.core import Event
+from homeassistant.core import Event, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util.json import (
     find_paths_unserializable_data,
@@ -31,12 +31,36 @@ BASE_COMMAND_MESSAGE_SCHEMA: Final = vol.Schema({vol.Required("id"): cv.positive
 IDEN_TEMPLATE: Final = "__IDEN__"
 IDEN_JSON_TEMPLATE: Final = '"__IDEN__"'
 
+# Keys of the compressed states sent by subscribe_entities
+COMPRESSED_STATE_STATE: Final = "s"
+COMPRESSED_STATE_ATTRIBUTES: Final = "a"
+COMPRESSED_STATE_CONTEXT: Final = "c"
+COMPRESSED_STATE_LAST_CHANGED: Final = "lc"
+COMPRESSED_STATE_LAST_UPDATED: Final = "lu"
+
+# Keys of a state diff
+STATE_DIFF_ADDITIONS: Final = "+"
+STATE_DIFF_REMOVALS: Final = "-"
+
+# Keys of the entity events sent by subscribe_entities
+ENTITY_EVENT_ADD: Final = "a"
+ENTITY_EVENT_REMOVE: Final = "r"
+ENTITY_EVENT_CHANGE: Final = "c"
+
 
 def result_message(iden: int, result: Any = None) -> dict[str, Any]:
     """Return a success result message."""
     return {"id": iden, "type": const.TYPE_RESULT, "success": True, "result": result}
 
 
+def result_message_json(iden: int, result_json: str) -> str:
+    """Return a success result message with a result that is already JSON."""
+    return (
+        f'{{"id":{iden},"type":"{const.TYPE_RESULT}","success":true,'
+        f'"result":{result_json}}}'
+    )
+
+
 def error_message(iden: int | None, code: str, message: str) -> dict[str, Any]:
     """Return an error result message."""
     return {
@@ -74,6 +98,115 @@ def _cached_event_message(event: Event) -> str:
     return message_to_json(event_message(IDEN_TEMPLATE, event))
 
 
+def cached_state_diff_message(iden: int, event: Event) -> str:
+    """Return an event message with the difference between the states.
+
+    Serialize to json once per message, like cached_event_message.
+    """
+    return _cached_state_diff_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+
+
+@lru_cache(maxsize=128)
+def _cached_state_diff_message(event: Event) -> str:
+    """Cache and serialize the state diff event to json.
+
+    The IDEN_TEMPLATE is used which will be replaced
+    with the actual iden in cached_state_diff_message
+    """
+    return message_to_json(event_message(IDEN_TEMPLATE, _state_diff_event(event)))
+
+
+def cached_state_diff_batch_message(iden: int, events: tuple[Event, ...]) -> str:
+    """Return a single event message with the state diffs of a batch of events.
+
+    The events must be of different entities. Serialize to json once per
+    batch, like cached_event_message.
+    """
+    return _cached_state_diff_batch_message(events).replace(
+        IDEN_JSON_TEMPLATE, str(iden), 1
+    )
+
+
+@lru_cache(maxsize=128)
+def _cached_state_diff_batch_message(events: tuple[Event, ...]) -> str:
+    """Cache and serialize the merged state diff events to json."""
+    entity_event: dict[str, Any] = {}
+    for event in events:
+        for key, value in _state_diff_event(event).items():
+            if key == ENTITY_EVENT_REMOVE:
+                entity_event.setdefault(key, []).extend(value)
+            else:
+                entity_event.setdefault(key, {}).update(value)
+    return message_to_json(event_message(IDEN_TEMPLATE, entity_event))
+
+
+def _state_diff_event(event: Event) -> dict[str, Any]:
+    """Convert a state_changed event to the entity event of the state diff."""
+    if (new_state := event.data["new_state"]) is None:
+        return {ENTITY_EVENT_REMOVE: [event.data["entity_id"]]}
+    if (old_state := event.data["old_state"]) is None:
+        return {
+            ENTITY_EVENT_ADD: {
+                new_state.entity_id: compressed_state_dict_add(new_state)
+            }
+        }
+    return {
+        ENTITY_EVENT_CHANGE: {new_state.entity_id: _state_diff(old_state, new_state)}
+    }
+
+
+def _state_diff(old_state: State, new_state: State) -> dict[str, dict[str, Any]]:
+    """Return the fields that changed between two states of an entity."""
+    additions: dict[str, Any] = {}
+    diff: dict[str, dict[str, Any]] = {STATE_DIFF_ADDITIONS: additions}
+    if old_state.state != new_state.state:
+        additions[COMPRESSED_STATE_STATE] = new_state.state
+    if old_state.last_changed != new_state.last_changed:
+        additions[COMPRESSED_STATE_LAST_CHANGED] = new_state.last_changed.timestamp()
+    elif old_state.last_updated != new_state.last_updated:
+        additions[COMPRESSED_STATE_LAST_UPDATED] = new_state.last_updated.timestamp()
+    if old_state.context != new_state.context:
+        additions[COMPRESSED_STATE_CONTEXT] = _compressed_context(new_state)
+
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    changed_attributes = {
+        key: value
+        for key, value in new_attributes.items()
+        if key not in old_attributes or old_attributes[key] != value
+    }
+    if changed_attributes:
+        additions[COMPRESSED_STATE_ATTRIBUTES] = changed_attributes
+    if removed := [key for key in old_attributes if key not in new_attributes]:
+        diff[STATE_DIFF_REMOVALS] = {COMPRESSED_STATE_ATTRIBUTES: removed}
+    return diff
+
+
+def _compressed_context(state: State) -> str | dict[str, str | None]:
+    """Return the context of a state, as only its id when that is all it has."""
+    context = state.context
+    if context.parent_id is None and context.user_id is None:
+        return context.id
+    return context.as_dict()
+
+
+def compressed_state_dict_add(state: State) -> dict[str, Any]:
+    """Return a compressed state for an entity that is added.
+
+    The timestamps are sent as seconds since the epoch and last_updated
+    is left out when it equals last_changed.
+    """
+    compressed_state: dict[str, Any] = {
+        COMPRESSED_STATE_STATE: state.state,
+        COMPRESSED_STATE_ATTRIBUTES: dict(state.attributes),
+        COMPRESSED_STATE_CONTEXT: _compressed_context(state),
+        COMPRESSED_STATE_LAST_CHANGED: state.last_changed.timestamp(),
+    }
+    if state.last_changed != state.last_updated:
+        compressed_state[COMPRESSED_STATE_LAST_UPDATED] = state.last_updated.timestamp()
+    return compressed_state
+
+
 def message_to_json(message: dict[str, Any]) -> str:
     """Serialize a websocket message to json."""
     try:
@@ -13,11 +13,15 @@ from collections.abc import (
     Collection,
     Coroutine,
     Iterable,
+    Iterator,
     Mapping,
+    Sequence,
 )
+from contextlib import contextmanager
 import datetime
 import enum
 import functools
+from itertools import chain
 import logging
 import os
 import pathlib
@@ -77,6 +81,7 @@ from .exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from .helpers.json import json_bytes
 from .util import dt as dt_util, location, uuid as uuid_util
 from .util.async_ import (
     fire_coroutine_threadsafe,
@@ -697,7 +702,7 @@ class HomeAssistant:
 class Context:
     """The context that triggered something."""
 
-    user_id: str = attr.ib(default=None)
+    user_id: str | None = attr.ib(default=None)
     parent_id: str | None = attr.ib(default=None)
     id: str = attr.ib(factory=uuid_util.random_uuid_hex)
 
@@ -787,6 +792,17 @@ class EventBus:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: dict[str, list[_FilterableJob]] = {}
+        # Listeners of events with an entity_id, indexed by event type and
+        # then by entity_id or domain
+        self._entity_listeners: dict[str, dict[str, list[_FilterableJob]]] = {}
+        self._entity_listener_counts: dict[str, int] = {}
+        # The event type, job and keys of each listener of entities, by the
+        # callback which removes it
+        self._entity_listener_keys: dict[
+            CALLBACK_TYPE, tuple[str, _FilterableJob, set[str]]
+        ] = {}
+        # Listeners which get the events fired together in one call
+        self._batch_listeners: dict[str, list[_FilterableJob]] = {}
         self._hass = hass
 
     @callback
@@ -795,7 +811,12 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        for key, count in self._entity_listener_counts.items():
+            listeners[key] = listeners.get(key, 0) + count
+        for key, batch_listeners in self._batch_listeners.items():
+            listeners[key] = listeners.get(key, 0) + len(batch_listeners)
+        return listeners
 
     @property
     def listeners(self) -> dict[str, int]:
@@ -832,6 +853,53 @@ class EventBus:
                 event_type, "event_type", MAX_LENGTH_EVENT_EVENT_TYPE
             )
 
+        event = Event(event_type, event_data, origin, time_fired, context)
+
+        if self._batch_listeners:
+            self._async_fire_to_batch_listeners(event_type, [event])
+        self._async_fire_to_listeners(event)
+
+    @callback
+    def async_fire_batch(self, events: Sequence[Event]) -> None:
+        """Fire events of the same type at once.
+
+        Listeners added with async_listen get the events one by one, like
+        they were fired with async_fire. Listeners added with
+        async_listen_batch get them all in a single call.
+
+        This method must be run in the event loop.
+        """
+        if not events:
+            return
+        if self._batch_listeners:
+            self._async_fire_to_batch_listeners(events[0].event_type, events)
+        for event in events:
+            self._async_fire_to_listeners(event)
+
+    @callback
+    def _async_fire_to_batch_listeners(
+        self, event_type: str, events: Sequence[Event]
+    ) -> None:
+        """Fire events to the listeners of batches of events."""
+        listeners = self._batch_listeners.get(event_type, [])
+        match_all_listeners = self._batch_listeners.get(MATCH_ALL)
+        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
+            listeners = match_all_listeners + listeners
+
+        for job, event_filter in listeners:
+            batch = events
+            if event_filter is not None:
+                batch = [
+                    event for event in events if _async_filter(event_filter, event)
+                ]
+                if not batch:
+                    continue
+            self._hass.async_add_hass_job(job, batch)
+
+    @callback
+    def _async_fire_to_listeners(self, event: Event) -> None:
+        """Fire an event to the listeners of single events."""
+        event_type = event.event_type
         listeners = self._listeners.get(event_type, [])
 
         # EVENT_HOMEASSISTANT_CLOSE should go only to this listeners
@@ -839,7 +907,10 @@ class EventBus:
         if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
             listeners = match_all_listeners + listeners
 
-        event = Event(event_type, event_data, origin, time_fired, context)
+        if (
+            entity_listeners := self._entity_listeners.get(event_type)
+        ) is not None and (entity_id := event.data.get("entity_id")) is not None:
+            listeners = listeners + _entity_jobs(entity_listeners, entity_id)
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
@@ -848,13 +919,8 @@ class EventBus:
             return
 
         for job, event_filter in listeners:
-            if event_filter is not None:
-                try:
-                    if not event_filter(event):
-                        continue
-                except Exception:  # pylint: disable=broad-except
-                    _LOGGER.exception("Error in event filter")
-                    continue
+            if event_filter is not None and not _async_filter(event_filter, event):
+                continue
             self._hass.async_add_hass_job(job, event)
 
     def listen(
@@ -913,6 +979,147 @@ class EventBus:
 
         return remove_listener
 
+    @callback
+    def async_listen_batch(
+        self,
+        event_type: str,
+        listener: Callable[[Sequence[Event]], None | Awaitable[None]],
+        event_filter: Callable[[Event], bool] | None = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for batches of events of a specific type.
+
+        The listener is called with all the events fired together with
+        async_fire_batch, and with a single event for events fired with
+        async_fire. The optional event_filter is applied to each event and
+        the listener is not called when no event of a batch passes it.
+
+        To listen to all events specify the constant ``MATCH_ALL``
+        as event_type.
+
+        This method must be run in the event loop.
+        """
+        if event_filter is not None and not is_callback(event_filter):
+            raise HomeAssistantError(f"Event filter {event_filter} is not a callback")
+        filterable_job = _FilterableJob(HassJob(listener), event_filter)
+        self._batch_listeners.setdefault(event_type, []).append(filterable_job)
+
+        def remove_listener() -> None:
+            """Remove the listener."""
+            try:
+                self._batch_listeners[event_type].remove(filterable_job)
+                if not self._batch_listeners[event_type]:
+                    del self._batch_listeners[event_type]
+            except (KeyError, ValueError):
+                _LOGGER.exception(
+                    "Unable to remove unknown job listener %s", filterable_job
+                )
+
+        return remove_listener
+
+    @callback
+    def async_listen_entities(
+        self,
+        event_type: str,
+        listener: Callable[[Event], None | Awaitable[None]],
+        entity_ids: Iterable[str] = (),
+        domains: Iterable[str] = (),
+        event_filter: Callable[[Event], bool] | None = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for events of specific entities or domains.
+
+        The listener runs for events of event_type that have one of the
+        entity_ids or an entity_id in one of the domains in their data.
+        Listeners are looked up by the entity_id of the event, so unlike
+        filtering with an event_filter, firing an event does not cost
+        anything for listeners of other entities.
+
+        This method must be run in the event loop.
+        """
+        if event_filter is not None and not is_callback(event_filter):
+            raise HomeAssistantError(f"Event filter {event_filter} is not a callback")
+        filterable_job = _FilterableJob(HassJob(listener), event_filter)
+        keys: set[str] = set()
+        self._entity_listener_counts[event_type] = (
+            self._entity_listener_counts.get(event_type, 0) + 1
+        )
+
+        def remove_listener() -> None:
+            """Remove the listener."""
+            self._async_remove_entity_listener(remove_listener)
+
+        self._entity_listener_keys[remove_listener] = (
+            event_type,
+            filterable_job,
+            keys,
+        )
+        self.async_add_listener_entities(remove_listener, entity_ids, domains)
+        return remove_listener
+
+    @callback
+    def async_add_listener_entities(
+        self,
+        remove_listener: CALLBACK_TYPE,
+        entity_ids: Iterable[str] = (),
+        domains: Iterable[str] = (),
+    ) -> None:
+        """Add entities or domains to a listener of async_listen_entities.
+
+        The listener is passed as the callback which removes it.
+
+        This method must be run in the event loop.
+        """
+        event_type, filterable_job, keys = self._entity_listener_keys[remove_listener]
+        entity_listeners = self._entity_listeners.setdefault(event_type, {})
+        for key in chain(entity_ids, domains):
+            if (key := key.lower()) not in keys:
+                keys.add(key)
+                entity_listeners.setdefault(key, []).append(filterable_job)
+
+    @callback
+    def async_remove_listener_entities(
+        self,
+        remove_listener: CALLBACK_TYPE,
+        entity_ids: Iterable[str] = (),
+        domains: Iterable[str] = (),
+    ) -> None:
+        """Remove entities or domains from a listener of async_listen_entities.
+
+        The listener is passed as the callback which removes it, it stays
+        registered when it has no entities or domains left.
+
+        This method must be run in the event loop.
+        """
+        event_type, filterable_job, keys = self._entity_listener_keys[remove_listener]
+        entity_listeners = self._entity_listeners.get(event_type, {})
+        for key in chain(entity_ids, domains):
+            if (key := key.lower()) in keys:
+                keys.remove(key)
+                entity_listeners[key].remove(filterable_job)
+                if not entity_listeners[key]:
+                    del entity_listeners[key]
+        if not entity_listeners:
+            self._entity_listeners.pop(event_type, None)
+
+    @callback
+    def _async_remove_entity_listener(self, remove_listener: CALLBACK_TYPE) -> None:
+        """Remove a listener of specific entities or domains.
+
+        This method must be run in the event loop.
+        """
+        try:
+            event_type, _, keys = self._entity_listener_keys[remove_listener]
+        except KeyError:
+            _LOGGER.exception(
+                "Unable to remove unknown job listener %s", remove_listener
+            )
+            return
+
+        self.async_remove_listener_entities(remove_listener, list(keys))
+        del self._entity_listener_keys[remove_listener]
+        self._entity_listener_counts[event_type] -= 1
+        if not self._entity_listener_counts[event_type]:
+            del self._entity_listener_counts[event_type]
+
     def listen_once(
         self, event_type: str, listener: Callable[[Event], None | Awaitable[None]]
     ) -> CALLBACK_TYPE:
@@ -994,6 +1201,44 @@ class EventBus:
             )
 
 
+def _async_filter(event_filter: Callable[[Event], bool], event: Event) -> bool:
+    """Return if an event passes the filter of a listener."""
+    try:
+        return event_filter(event)
+    except Exception:  # pylint: disable=broad-except
+        _LOGGER.exception("Error in event filter")
+        return False
+
+
+def _entity_jobs(
+    entity_listeners: dict[str, list[_FilterableJob]], entity_id: Any
+) -> list[_FilterableJob]:
+    """Return the listeners of an entity and of its domain.
+
+    Events about several entities have a list of entity_ids, they go to
+    the listeners of each of them once.
+    """
+    if not isinstance(entity_id, str):
+        if not isinstance(entity_id, (list, tuple)):
+            return []
+        jobs: list[_FilterableJob] = []
+        for item in entity_id:
+            if not isinstance(item, str):
+                continue
+            for job in _entity_jobs(entity_listeners, item):
+                if job not in jobs:
+                    jobs.append(job)
+        return jobs
+    entity_jobs = entity_listeners.get(entity_id)
+    domain_jobs = entity_listeners.get(entity_id.partition(".")[0])
+    if domain_jobs is None:
+        return entity_jobs or []
+    if entity_jobs is None:
+        return domain_jobs
+    # A listener can be interested in both the entity and its domain
+    return entity_jobs + [job for job in domain_jobs if job not in entity_jobs]
+
+
 _StateT = TypeVar("_StateT", bound="State")
 
 
@@ -1020,6 +1265,7 @@ class State:
         "domain",
         "object_id",
         "_as_dict",
+        "_as_dict_json",
     ]
 
     def __init__(
@@ -1055,6 +1301,7 @@ class State:
         self.context = context or Context()
         self.domain, self.object_id = split_entity_id(self.entity_id)
         self._as_dict: dict[str, Collection[Any]] | None = None
+        self._as_dict_json: bytes | None = None
 
     @property
     def name(self) -> str:
@@ -1087,6 +1334,19 @@ class State:
             }
         return self._as_dict
 
+    @property
+    def as_dict_json(self) -> bytes:
+        """Return the dict representation of the State as compact JSON.
+
+        Async friendly.
+
+        States do not change once created, so the JSON is only encoded
+        once and can be joined into larger responses as is.
+        """
+        if self._as_dict_json is None:
+            self._as_dict_json = json_bytes(self.as_dict())
+        return self._as_dict_json
+
     @classmethod
     def from_dict(cls: type[_StateT], json_dict: dict[str, Any]) -> _StateT | None:
         """Initialize a state from a dict.
@@ -1149,6 +1409,8 @@ class StateMachine:
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
+        # The state changed events of the batch being written
+        self._batch: list[Event] | None = None
 
     def entity_ids(self, domain_filter: str | None = None) -> list[str]:
         """List of entity ids that are being tracked."""
@@ -1260,11 +1522,9 @@ class StateMachine:
         if old_state is None:
             return False
 
-        self._bus.async_fire(
-            EVENT_STATE_CHANGED,
+        self._async_fire_state_changed(
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
-            EventOrigin.local,
-            context=context,
+            context,
         )
         return True
 
@@ -1338,16 +1598,14 @@ class StateMachine:
         new_state = str(new_state)
         attributes = attributes or {}
         if (old_state := self._states.get(entity_id)) is None:
-            same_state = False
-            same_attr = False
             last_changed = None
+        elif old_state.state == new_state and not force_update:
+            # The attributes only need to be compared when the state is the same
+            if old_state.attributes == attributes:
+                return
+            last_changed = old_state.last_changed
         else:
-            same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == MappingProxyType(attributes)
-            last_changed = old_state.last_changed if same_state else None
-
-        if same_state and same_attr:
-            return
+            last_changed = None
 
         if context is None:
             context = Context()
@@ -1364,12 +1622,77 @@ class StateMachine:
             old_state is None,
         )
         self._states[entity_id] = state
+        self._async_fire_state_changed(
+            {"entity_id": entity_id, "old_state": old_state, "new_state": state},
+            context,
+            now,
+        )
+
+    @callback
+    def async_set_many(
+        self,
+        states: Iterable[tuple[str, str, Mapping[str, Any] | None]],
+        force_update: bool = False,
+        context: Context | None = None,
+    ) -> None:
+        """Set the state of several entities at once.
+
+        States is an iterable of (entity_id, state, attributes) tuples, which
+        are set like with async_set. The state changed events are fired as a
+        single batch once all the states are set.
+
+        This method must be run in the event loop.
+        """
+        with self.async_batch():
+            for entity_id, new_state, attributes in states:
+                self.async_set(entity_id, new_state, attributes, force_update, context)
+
+    @contextmanager
+    def async_batch(self) -> Iterator[None]:
+        """Fire the state changes made in the context as a single batch.
+
+        States are set right away, but their state changed events are only
+        fired when the context exits, together with async_fire_batch. Nested
+        contexts join the outermost batch.
+
+        This method must be run in the event loop.
+        """
+        if self._batch is not None:
+            yield
+            return
+        batch: list[Event] = []
+        self._batch = batch
+        try:
+            yield
+        finally:
+            self._batch = None
+            self._bus.async_fire_batch(batch)
+
+    @callback
+    def _async_fire_state_changed(
+        self,
+        event_data: dict[str, Any],
+        context: Context | None,
+        time_fired: datetime.datetime | None = None,
+    ) -> None:
+        """Fire a state changed event, or add it to the batch being written."""
+        if self._batch is not None:
+            self._batch.append(
+                Event(
+                    EVENT_STATE_CHANGED,
+                    event_data,
+                    EventOrigin.local,
+                    time_fired,
+                    context,
+                )
+            )
+            return
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
-            {"entity_id": entity_id, "old_state": old_state, "new_state": state},
+            event_data,
             EventOrigin.local,
             context,
-            time_fired=now,
+            time_fired=time_fired,
         )
 
 
@@ -11,7 +11,7 @@ import logging
 import math
 import sys
 from timeit import default_timer as timer
-from typing import Any, Final, Literal, TypedDict, final
+from typing import Any, Final, Literal, TypedDict, cast, final
 
 import voluptuous as vol
 
@@ -44,11 +44,13 @@ from . import entity_registry as er
 from .device_registry import DeviceEntryType
 from .entity_platform import EntityPlatform
 from .event import async_track_entity_registry_updated_event
+from .json import json_bytes
 from .typing import StateType
 
 _LOGGER = logging.getLogger(__name__)
 SLOW_UPDATE_WARNING = 10
 DATA_ENTITY_SOURCE = "entity_info"
+DATA_ENTITY_WRITE_STATS = "entity_write_stats"
 SOURCE_CONFIG_ENTRY = "config_entry"
 SOURCE_PLATFORM_CONFIG = "platform_config"
 
@@ -163,6 +165,180 @@ def get_unit_of_measurement(hass: HomeAssistant, entity_id: str) -> str | None:
     return entry.unit_of_measurement
 
 
+class _EntityWriteStats:
+    """State write statistics of an entity."""
+
+    __slots__ = (
+        "integration",
+        "config_entry_id",
+        "writes",
+        "noop_writes",
+        "total_time",
+        "max_time",
+        "attributes",
+        "attributes_size",
+        "max_attributes_size",
+    )
+
+    def __init__(self, integration: str | None, config_entry_id: str | None) -> None:
+        """Initialize the write statistics."""
+        self.integration = integration
+        self.config_entry_id = config_entry_id
+        self.writes = 0
+        self.noop_writes = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.attributes = 0
+        self.attributes_size = 0
+        self.max_attributes_size = 0
+
+    def add(self, duration: float, attributes: Mapping[str, Any], noop: bool) -> None:
+        """Add a state write."""
+        self.writes += 1
+        if noop:
+            self.noop_writes += 1
+        self.total_time += duration
+        if duration > self.max_time:
+            self.max_time = duration
+        self.attributes = len(attributes)
+        try:
+            self.attributes_size = len(json_bytes(attributes))
+        except (TypeError, ValueError):
+            # Not serializable, the recorder and the frontend fail on it too
+            return
+        if self.attributes_size > self.max_attributes_size:
+            self.max_attributes_size = self.attributes_size
+
+
+class _EntityStatsDict(TypedDict):
+    """State write statistics of an entity, as reported."""
+
+    entity_id: str
+    integration: str | None
+    writes: int
+    noop_writes: int
+    total_time: float
+    max_time: float
+    attributes: int
+    attributes_size: int
+    max_attributes_size: int
+
+
+class _IntegrationStatsDict(TypedDict):
+    """State write statistics of the entities of an integration, as reported."""
+
+    integration: str | None
+    entities: int
+    writes: int
+    noop_writes: int
+    total_time: float
+    max_time: float
+
+
+class _EntityWriteProfiler:
+    """Aggregate the state writes of entities.
+
+    The profiler only exists in hass.data while profiling is enabled, so
+    writing a state costs a single lookup when it is not.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the profiler."""
+        self.started = dt_util.utcnow()
+        self.entities: dict[str, _EntityWriteStats] = {}
+
+    @callback
+    def async_add(
+        self,
+        entity: Entity,
+        duration: float,
+        attributes: Mapping[str, Any],
+        noop: bool,
+    ) -> None:
+        """Add a state write of an entity."""
+        if (stats := self.entities.get(entity.entity_id)) is None:
+            platform = entity.platform
+            stats = self.entities[entity.entity_id] = _EntityWriteStats(
+                platform.platform_name if platform else None,
+                platform.config_entry.entry_id
+                if platform and platform.config_entry
+                else None,
+            )
+        stats.add(duration, attributes, noop)
+
+    @callback
+    def async_stats(self, config_entry_id: str | None = None) -> dict[str, Any]:
+        """Return the statistics per integration and per entity."""
+        entities: list[_EntityStatsDict] = []
+        integrations: dict[str | None, _IntegrationStatsDict] = {}
+        for entity_id, stats in self.entities.items():
+            if config_entry_id is not None and stats.config_entry_id != config_entry_id:
+                continue
+            entities.append(
+                {
+                    "entity_id": entity_id,
+                    "integration": stats.integration,
+                    "writes": stats.writes,
+                    "noop_writes": stats.noop_writes,
+                    "total_time": stats.total_time,
+                    "max_time": stats.max_time,
+                    "attributes": stats.attributes,
+                    "attributes_size": stats.attributes_size,
+                    "max_attributes_size": stats.max_attributes_size,
+                }
+            )
+            if (integration := integrations.get(stats.integration)) is None:
+                integration = integrations[stats.integration] = {
+                    "integration": stats.integration,
+                    "entities": 0,
+                    "writes": 0,
+                    "noop_writes": 0,
+                    "total_time": 0.0,
+                    "max_time": 0.0,
+                }
+            integration["entities"] += 1
+            integration["writes"] += stats.writes
+            integration["noop_writes"] += stats.noop_writes
+            integration["total_time"] += stats.total_time
+            integration["max_time"] = max(integration["max_time"], stats.max_time)
+
+        entities.sort(key=lambda stats: stats["total_time"], reverse=True)
+        integration_stats = sorted(
+            integrations.values(), key=lambda stats: stats["total_time"], reverse=True
+        )
+        return {
+            "started": self.started.isoformat(),
+            "integrations": integration_stats,
+            "entities": entities,
+        }
+
+
+@callback
+def async_enable_write_stats(hass: HomeAssistant) -> None:
+    """Start collecting state write statistics, dropping the collected ones."""
+    hass.data[DATA_ENTITY_WRITE_STATS] = _EntityWriteProfiler()
+
+
+@callback
+def async_disable_write_stats(hass: HomeAssistant) -> None:
+    """Stop collecting state write statistics."""
+    hass.data.pop(DATA_ENTITY_WRITE_STATS, None)
+
+
+@callback
+def async_get_write_stats(
+    hass: HomeAssistant, config_entry_id: str | None = None
+) -> dict[str, Any] | None:
+    """Return the state write statistics, None if they are not collected.
+
+    With a config_entry_id, only the entities of the config entry are
+    included.
+    """
+    if (profiler := hass.data.get(DATA_ENTITY_WRITE_STATS)) is None:
+        return None
+    return cast(_EntityWriteProfiler, profiler).async_stats(config_entry_id)
+
+
 class DeviceInfo(TypedDict, total=False):
     """Entity device information for device registry."""
 
@@ -628,9 +804,23 @@ class Entity(ABC):
             self._context = None
             self._context_set = None
 
+        if (profiler := self.hass.data.get(DATA_ENTITY_WRITE_STATS)) is None:
+            self.hass.states.async_set(
+                self.entity_id, state, attr, self.force_update, self._context
+            )
+            return
+
+        old_state = self.hass.states.get(self.entity_id)
         self.hass.states.async_set(
             self.entity_id, state, attr, self.force_update, self._context
         )
+        # The state machine keeps the old state when nothing changed
+        profiler.async_add(
+            self,
+            timer() - start,
+            attr,
+            self.hass.states.get(self.entity_id) is old_state,
+        )
 
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
         """Schedule an update ha state change task.
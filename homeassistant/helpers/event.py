@@ -1,7 +1,6 @@
 """Helpers for listening to events."""
 from __future__ import annotations
 
-import asyncio
 from collections.abc import Awaitable, Callable, Iterable, Sequence
 import copy
 from dataclasses import dataclass
@@ -9,7 +8,7 @@ from datetime import datetime, timedelta
 import functools as ft
 import logging
 import time
-from typing import Any, Union, cast
+from typing import Any, TypedDict, Union, cast
 
 import attr
 from typing_extensions import Concatenate, ParamSpec
@@ -40,6 +39,8 @@ from homeassistant.util.async_ import run_callback_threadsafe
 
 from .entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from .ratelimit import KeyedRateLimit
+from .scheduler import TimeScheduler
+from .singleton import singleton
 from .sun import get_astral_event_next
 from .template import RenderInfo, Template, result_as_boolean
 from .typing import TemplateVarsType
@@ -56,6 +57,9 @@ TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+DATA_TIME_SCHEDULER = "time_scheduler"
+DATA_TEMPLATE_RENDER_QUEUE = "template_render_queue"
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -242,11 +246,10 @@ def async_track_state_change_event(
     Unlike async_track_state_change, async_track_state_change_event
     passes the full event to the callback.
 
-    In order to avoid having to iterate a long list
-    of EVENT_STATE_CHANGED and fire and create a job
-    for each one, we keep a dict of entity ids that
-    care about the state change events so we can
-    do a fast dict lookup to route events.
+    The actions are indexed by entity_id and a single dispatcher listens
+    for the state changes of the tracked entities. The event bus looks it up
+    by entity_id, so a state change does not cost anything for the trackers
+    of other entities.
     """
     if not (entity_ids := _async_string_to_lower_list(entity_ids)):
         return _remove_empty_listener
@@ -255,16 +258,13 @@ def async_track_state_change_event(
 
     if TRACK_STATE_CHANGE_LISTENER not in hass.data:
 
-        @callback
-        def _async_state_change_filter(event: Event) -> bool:
-            """Filter state changes by entity_id."""
-            return event.data.get("entity_id") in entity_callbacks
-
         @callback
         def _async_state_change_dispatcher(event: Event) -> None:
             """Dispatch state changes by entity_id."""
             entity_id = event.data.get("entity_id")
 
+            # Look up the actions when the event is dispatched, actions can
+            # start or stop tracking an entity after it changed
             if entity_id not in entity_callbacks:
                 return
 
@@ -276,16 +276,20 @@ def async_track_state_change_event(
                         "Error while processing state change for %s", entity_id
                     )
 
-        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED,
-            _async_state_change_dispatcher,
-            event_filter=_async_state_change_filter,
+        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen_entities(
+            EVENT_STATE_CHANGED, _async_state_change_dispatcher
         )
 
     job = HassJob(action)
 
+    new_entity_ids = [
+        entity_id for entity_id in entity_ids if entity_id not in entity_callbacks
+    ]
     for entity_id in entity_ids:
         entity_callbacks.setdefault(entity_id, []).append(job)
+    hass.bus.async_add_listener_entities(
+        hass.data[TRACK_STATE_CHANGE_LISTENER], new_entity_ids
+    )
 
     @callback
     def remove_listener() -> None:
@@ -297,6 +301,15 @@ def async_track_state_change_event(
             entity_ids,
             job,
         )
+        if TRACK_STATE_CHANGE_LISTENER in hass.data:
+            hass.bus.async_remove_listener_entities(
+                hass.data[TRACK_STATE_CHANGE_LISTENER],
+                [
+                    entity_id
+                    for entity_id in entity_ids
+                    if entity_id not in entity_callbacks
+                ],
+            )
 
     return remove_listener
 
@@ -765,6 +778,122 @@ def async_track_template(
 track_template = threaded_listener_factory(async_track_template)
 
 
+class _TemplateRenderStats:
+    """Render statistics of a tracked template."""
+
+    __slots__ = ("renders", "total_time", "max_time", "last_time")
+
+    def __init__(self) -> None:
+        """Initialize the render statistics."""
+        self.renders = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time = 0.0
+
+    def add(self, duration: float) -> None:
+        """Add the duration of a render."""
+        self.renders += 1
+        self.total_time += duration
+        self.last_time = duration
+        if duration > self.max_time:
+            self.max_time = duration
+
+
+class _TemplateStatsDict(TypedDict):
+    """Render statistics of a tracked template, as reported."""
+
+    template: str
+    renders: int
+    total_time: float
+    max_time: float
+    last_time: float
+    listeners: dict[str, Any]
+
+
+class _TemplateRenderQueue:
+    """Coalesce the state changes that re-render tracked templates.
+
+    The state changes tracked templates depend on are routed to the
+    trackers through the listeners indexed by entity_id and domain. The
+    first state change a tracker gets in a loop iteration refreshes it right
+    away, the ones that follow are queued until the queue is flushed and
+    then refresh the tracker once. A burst of state changes renders a
+    template twice instead of once per state change.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the render queue."""
+        self.hass = hass
+        self.trackers: set[_TrackTemplateResultInfo] = set()
+        self._refreshed: set[_TrackTemplateResultInfo] = set()
+        self._pending: dict[_TrackTemplateResultInfo, list[Event]] = {}
+        self._state_changes = 0
+        self._coalesced = 0
+
+    @callback
+    def async_state_changed(
+        self, tracker: _TrackTemplateResultInfo, event: Event
+    ) -> None:
+        """Refresh a tracker or queue the state change until the flush."""
+        self._state_changes += 1
+        if tracker in self._refreshed:
+            self._coalesced += 1
+            self._pending.setdefault(tracker, []).append(event)
+            return
+        if not self._refreshed:
+            self.hass.async_create_task(self._async_flush())
+        self._refreshed.add(tracker)
+        tracker.async_refresh_events([event])
+
+    @callback
+    def async_discard(self, tracker: _TrackTemplateResultInfo) -> None:
+        """Forget a tracker which was removed."""
+        self.trackers.discard(tracker)
+        self._pending.pop(tracker, None)
+
+    async def _async_flush(self) -> None:
+        """Refresh the trackers with the queued state changes."""
+        pending = self._pending
+        self._pending = {}
+        self._refreshed = set()
+        for tracker, events in pending.items():
+            try:
+                tracker.async_refresh_events(events)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Error while refreshing templates %s", tracker.track_templates
+                )
+
+    @callback
+    def async_stats(self) -> dict[str, Any]:
+        """Return the statistics of the queue and the tracked templates."""
+        templates: list[_TemplateStatsDict] = [
+            {
+                "template": template.template,
+                "renders": stats.renders,
+                "total_time": stats.total_time,
+                "max_time": stats.max_time,
+                "last_time": stats.last_time,
+                "listeners": tracker.listeners,
+            }
+            for tracker in self.trackers
+            for template, stats in tracker.render_stats.items()
+        ]
+        templates.sort(key=lambda stats: stats["total_time"], reverse=True)
+        return {
+            "state_changes": self._state_changes,
+            "coalesced_state_changes": self._coalesced,
+            "templates": templates,
+        }
+
+
+@callback
+@singleton(DATA_TEMPLATE_RENDER_QUEUE)
+def async_get_template_render_queue(hass: HomeAssistant) -> _TemplateRenderQueue:
+    """Return the queue coalescing template re-renders."""
+    return _TemplateRenderQueue(hass)
+
+
 class _TrackTemplateResultInfo:
     """Handle removal / refresh of tracker."""
 
@@ -790,6 +919,27 @@ class _TrackTemplateResultInfo:
         self._info: dict[Template, RenderInfo] = {}
         self._track_state_changes: _TrackStateChangeFiltered | None = None
         self._time_listeners: dict[Template, Callable[[], None]] = {}
+        self._render_queue = async_get_template_render_queue(hass)
+        self.render_stats: dict[Template, _TemplateRenderStats] = {}
+
+    @property
+    def track_templates(self) -> Sequence[TrackTemplate]:
+        """Return the tracked templates."""
+        return self._track_templates
+
+    def _render_to_info(
+        self,
+        template: Template,
+        variables: TemplateVarsType,
+        strict: bool = False,
+    ) -> RenderInfo:
+        """Render a template to info and record how long it took."""
+        start = time.perf_counter()
+        info = template.async_render_to_info(variables, strict=strict)
+        if (stats := self.render_stats.get(template)) is None:
+            stats = self.render_stats[template] = _TemplateRenderStats()
+        stats.add(time.perf_counter() - start)
+        return info
 
     def async_setup(self, raise_on_template_error: bool, strict: bool = False) -> None:
         """Activation of template tracking."""
@@ -800,8 +950,8 @@ class _TrackTemplateResultInfo:
         if super_template is not None:
             template = super_template.template
             variables = super_template.variables
-            self._info[template] = info = template.async_render_to_info(
-                variables, strict=strict
+            self._info[template] = info = self._render_to_info(
+                template, variables, strict=strict
             )
 
             # If the super template did not render to True, don't update other templates
@@ -821,8 +971,8 @@ class _TrackTemplateResultInfo:
                 continue
             template = track_template_.template
             variables = track_template_.variables
-            self._info[template] = info = template.async_render_to_info(
-                variables, strict=strict
+            self._info[template] = info = self._render_to_info(
+                template, variables, strict=strict
             )
 
             if info.exception:
@@ -835,8 +985,11 @@ class _TrackTemplateResultInfo:
                 )
 
         self._track_state_changes = async_track_state_change_filtered(
-            self.hass, _render_infos_to_track_states(self._info.values()), self._refresh
+            self.hass,
+            _render_infos_to_track_states(self._info.values()),
+            self._async_state_changed,
         )
+        self._render_queue.trackers.add(self)
         self._update_time_listeners()
         _LOGGER.debug(
             "Template group %s listens for %s, first render blocker by super template: %s",
@@ -889,6 +1042,7 @@ class _TrackTemplateResultInfo:
         """Cancel the listener."""
         assert self._track_state_changes
         self._track_state_changes.async_remove()
+        self._render_queue.async_discard(self)
         self._rate_limit.async_remove()
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
@@ -898,6 +1052,46 @@ class _TrackTemplateResultInfo:
         """Force recalculate the template."""
         self._refresh(None)
 
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Handle a state change the templates depend on."""
+        self._render_queue.async_state_changed(self, event)
+
+    @callback
+    def async_refresh_events(self, events: list[Event]) -> None:
+        """Refresh the templates with state changes queued together.
+
+        Each template is considered once, for the last of the state
+        changes that triggers a re-render of it.
+        """
+        if len(events) == 1:
+            self._refresh(events[0])
+            return
+
+        # The templates render with the current states whichever event is
+        # used, but an event that is not rate limited wins over later ones
+        last_event: dict[Template, tuple[bool, int]] = {}
+        for idx, event in enumerate(events):
+            for track_template_ in self._track_templates:
+                template = track_template_.template
+                if (info := self._info.get(template)) is None:
+                    continue
+                if not _event_triggers_rerender(event, info):
+                    continue
+                key = (_rate_limit_for_event(event, info, track_template_) is None, idx)
+                if key > last_event.get(template, (False, -1)):
+                    last_event[template] = key
+
+        # Templates triggered by the same event refresh together, in the
+        # order of the events so results other templates use are updated first
+        refreshes: dict[int, list[TrackTemplate]] = {}
+        for track_template_ in self._track_templates:
+            if (last := last_event.get(track_template_.template)) is not None:
+                refreshes.setdefault(last[1], []).append(track_template_)
+
+        for idx in sorted(refreshes):
+            self._refresh(events[idx], refreshes[idx])
+
     def _render_template_if_ready(
         self,
         track_template_: TrackTemplate,
@@ -942,8 +1136,8 @@ class _TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
-        self._info[template] = info = template.async_render_to_info(
-            track_template_.variables
+        self._info[template] = info = self._render_to_info(
+            template, track_template_.variables
         )
 
         try:
@@ -1256,39 +1450,8 @@ def async_track_point_in_utc_time(
 
     # Since this is called once, we accept a HassJob so we can avoid
     # having to figure out how to call the action every time its called.
-    cancel_callback: asyncio.TimerHandle | None = None
-
-    @callback
-    def run_action(job: HassJob[Awaitable[None] | None]) -> None:
-        """Call the action."""
-        nonlocal cancel_callback
-
-        now = time_tracker_utcnow()
-
-        # Depending on the available clock support (including timer hardware
-        # and the OS kernel) it can happen that we fire a little bit too early
-        # as measured by utcnow(). That is bad when callbacks have assumptions
-        # about the current time. Thus, we rearm the timer for the remaining
-        # time.
-        if (delta := (utc_point_in_time - now).total_seconds()) > 0:
-            _LOGGER.debug("Called %f seconds too early, rearming", delta)
-
-            cancel_callback = hass.loop.call_later(delta, run_action, job)
-            return
-
-        hass.async_run_hass_job(job, utc_point_in_time)
-
     job = action if isinstance(action, HassJob) else HassJob(action)
-    delta = utc_point_in_time.timestamp() - time.time()
-    cancel_callback = hass.loop.call_later(delta, run_action, job)
-
-    @callback
-    def unsub_point_in_time_listener() -> None:
-        """Cancel the call_later."""
-        assert cancel_callback is not None
-        cancel_callback.cancel()
-
-    return unsub_point_in_time_listener
+    return async_get_time_scheduler(hass).async_schedule(job, utc_point_in_time)
 
 
 track_point_in_utc_time = threaded_listener_factory(async_track_point_in_utc_time)
@@ -1443,6 +1606,23 @@ track_sunset = threaded_listener_factory(async_track_sunset)
 time_tracker_utcnow = dt_util.utcnow
 
 
+def _time_tracker_utcnow() -> datetime:
+    """Return the current time, looking up time_tracker_utcnow on each call."""
+    return time_tracker_utcnow()
+
+
+@callback
+def async_get_time_scheduler(hass: HomeAssistant) -> TimeScheduler:
+    """Return the scheduler running the time listeners."""
+    return cast(TimeScheduler, _async_create_time_scheduler(hass))
+
+
+@singleton(DATA_TIME_SCHEDULER)
+def _async_create_time_scheduler(hass: HomeAssistant) -> TimeScheduler:
+    """Create the scheduler running the time listeners."""
+    return TimeScheduler(hass, _time_tracker_utcnow)
+
+
 @callback
 @bind_hass
 def async_track_utc_time_change(
@@ -1470,41 +1650,11 @@ def async_track_utc_time_change(
     matching_minutes = dt_util.parse_time_expression(minute, 0, 59)
     matching_hours = dt_util.parse_time_expression(hour, 0, 23)
 
-    def calculate_next(now: datetime) -> datetime:
-        """Calculate and set the next time the trigger should fire."""
-        localized_now = dt_util.as_local(now) if local else now
-        return dt_util.find_next_time_expression_time(
-            localized_now, matching_seconds, matching_minutes, matching_hours
-        )
-
-    time_listener: CALLBACK_TYPE | None = None
-
-    @callback
-    def pattern_time_change_listener(_: datetime) -> None:
-        """Listen for matching time_changed events."""
-        nonlocal time_listener
-
-        now = time_tracker_utcnow()
-        hass.async_run_hass_job(job, dt_util.as_local(now) if local else now)
-
-        time_listener = async_track_point_in_utc_time(
-            hass,
-            pattern_time_change_listener,
-            calculate_next(now + timedelta(seconds=1)),
-        )
-
-    time_listener = async_track_point_in_utc_time(
-        hass, pattern_time_change_listener, calculate_next(dt_util.utcnow())
+    # Listeners of the same pattern share a single scheduled job
+    return async_get_time_scheduler(hass).async_track_pattern(
+        job, matching_seconds, matching_minutes, matching_hours, local
     )
 
-    @callback
-    def unsub_pattern_time_change_listener() -> None:
-        """Cancel the time listener."""
-        assert time_listener is not None
-        time_listener()
-
-    return unsub_pattern_time_change_listener
-
 
 track_utc_time_change = threaded_listener_factory(async_track_utc_time_change)
 
@@ -1,8 +1,20 @@
 """Helpers to help with encoding Home Assistant objects in JSON."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
 import datetime
+from functools import partial
 import json
+import math
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    JSON_ENCODER = "json"
+else:
+    JSON_ENCODER = "orjson"
+
 
 class JSONEncoder(json.JSONEncoder):
     """JSONEncoder that supports Home Assistant objects."""
@@ -40,3 +52,189 @@ class ExtendedJSONEncoder(JSONEncoder):
             return super().default(o)
         except TypeError:
             return {"__type": str(type(o)), "repr": repr(o)}
+
+
+def json_encoder_default(obj: Any) -> Any:
+    """Convert Home Assistant objects for the native JSON encoder.
+
+    The native encoder already handles datetime objects.
+    """
+    if isinstance(obj, set):
+        return list(obj)
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    if isinstance(obj, float):
+        return float(obj)
+    if isinstance(obj, tuple):
+        return list(obj)
+    raise TypeError
+
+
+_python_json_dumps: Callable[[Any], str] = partial(
+    json.dumps, cls=JSONEncoder, allow_nan=False, separators=(",", ":")
+)
+_python_json_dumps_allow_nan: Callable[[Any], str] = partial(
+    json.dumps, cls=JSONEncoder, separators=(",", ":")
+)
+
+
+def _python_json_bytes(obj: Any) -> bytes:
+    """Serialize an object to compact JSON bytes with the standard library."""
+    return _python_json_dumps(obj).encode("utf-8")
+
+
+def _python_json_bytes_allow_nan(obj: Any) -> bytes:
+    """Serialize an object to compact JSON bytes, writing NaN and infinity."""
+    return _python_json_dumps_allow_nan(obj).encode("utf-8")
+
+
+# Types that never hold NaN or infinity
+_FINITE_TYPES = {str, int, bool, type(None)}
+
+
+def _is_finite(obj: Any) -> bool:
+    """Return if the floats of an object are neither NaN nor infinity.
+
+    Only the containers the native encoder serializes are checked, what it
+    hands to default is checked separately.
+    """
+    if isinstance(obj, float):
+        return math.isfinite(obj)
+    if isinstance(obj, dict):
+        values: Iterable[Any] = obj.values()
+    elif isinstance(obj, (list, tuple)):
+        values = obj
+    else:
+        return True
+    for value in values:
+        # Check the common types inline, recursing is slow
+        if (cls := value.__class__) in _FINITE_TYPES:
+            continue
+        if cls is float:
+            if not math.isfinite(value):
+                return False
+        elif isinstance(value, (dict, list, tuple)) and not _is_finite(value):
+            return False
+    return True
+
+
+def _is_converted_finite(obj: Any, converted: Any) -> bool:
+    """Return if an object converted by default holds no NaN or infinity."""
+    if hasattr(obj, "as_dict_json"):
+        # States cache their JSON, which refuses NaN and infinity, so each
+        # state is only checked once however often it is serialized
+        try:
+            obj.as_dict_json  # pylint: disable=pointless-statement
+        except ValueError:
+            return False
+        return True
+    return _is_finite(converted)
+
+
+def _try_native_dumps(obj: Any, option: int) -> bytes | None:
+    """Serialize an object to JSON bytes with the native encoder.
+
+    Return None when the standard library has to serialize the object:
+    for integers beyond 64 bits and other types only it handles, and for
+    NaN and infinity, which the native encoder writes as null.
+    """
+    converted: list[tuple[Any, Any]] = []
+
+    def default(obj: Any) -> Any:
+        """Convert an object and keep it to check its floats."""
+        value = json_encoder_default(obj)
+        converted.append((obj, value))
+        return value
+
+    try:
+        data: bytes = orjson.dumps(obj, option=option, default=default)
+    except TypeError:
+        return None
+    # Only a null can be a non-finite float, the floats are checked without
+    # converting the objects again
+    if b"null" in data and not (
+        _is_finite(obj)
+        and all(_is_converted_finite(*conversion) for conversion in converted)
+    ):
+        return None
+    return data
+
+
+def _try_native_json_bytes(obj: Any) -> bytes | None:
+    """Serialize an object to compact JSON bytes with the native encoder."""
+    return _try_native_dumps(obj, orjson.OPT_NON_STR_KEYS)
+
+
+def _native_json_bytes(obj: Any) -> bytes:
+    """Serialize an object to compact JSON bytes with the native encoder."""
+    if (data := _try_native_json_bytes(obj)) is None:
+        return _python_json_bytes(obj)
+    return data
+
+
+def _native_json_dumps(obj: Any) -> str:
+    """Serialize an object to compact JSON with the native encoder."""
+    return _native_json_bytes(obj).decode("utf-8")
+
+
+def _native_json_bytes_allow_nan(obj: Any) -> bytes:
+    """Serialize an object to compact JSON bytes, writing NaN and infinity."""
+    if (data := _try_native_json_bytes(obj)) is None:
+        return _python_json_bytes_allow_nan(obj)
+    return data
+
+
+def _native_json_dumps_allow_nan(obj: Any) -> str:
+    """Serialize an object to compact JSON, writing NaN and infinity."""
+    return _native_json_bytes_allow_nan(obj).decode("utf-8")
+
+
+def _python_json_dumps_indent(
+    obj: Any, indent: int, encoder: type[json.JSONEncoder] | None
+) -> str:
+    """Serialize an object to indented JSON with the standard library."""
+    return json.dumps(obj, indent=indent, cls=encoder or JSONEncoder)
+
+
+def _native_json_dumps_indent(
+    obj: Any, indent: int, encoder: type[json.JSONEncoder] | None
+) -> str:
+    """Serialize an object to indented JSON with the native encoder.
+
+    The native encoder only supports an indent of 2 and no custom encoder,
+    everything else is handed to the standard library.
+    """
+    if indent != 2 or encoder is not None:
+        return _python_json_dumps_indent(obj, indent, encoder)
+    data = _try_native_dumps(obj, orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    if data is None:
+        return _python_json_dumps_indent(obj, indent, encoder)
+    return data.decode("utf-8")
+
+
+# json_bytes and json_dumps raise ValueError for NaN and infinity, the
+# allow_nan variants and json_dumps_indent write them like the standard
+# library does.
+if JSON_ENCODER == "orjson":
+    json_bytes: Callable[[Any], bytes] = _native_json_bytes
+    json_dumps: Callable[[Any], str] = _native_json_dumps
+    json_bytes_allow_nan: Callable[[Any], bytes] = _native_json_bytes_allow_nan
+    json_dumps_allow_nan: Callable[[Any], str] = _native_json_dumps_allow_nan
+    _json_dumps_indent = _native_json_dumps_indent
+else:  # pragma: no cover
+    json_bytes = _python_json_bytes
+    json_dumps = _python_json_dumps
+    json_bytes_allow_nan = _python_json_bytes_allow_nan
+    json_dumps_allow_nan = _python_json_dumps_allow_nan
+    _json_dumps_indent = _python_json_dumps_indent
+
+
+def json_dumps_indent(
+    obj: Any, *, indent: int = 4, encoder: type[json.JSONEncoder] | None = None
+) -> str:
+    """Serialize an object to indented JSON.
+
+    The native encoder is only used for an indent of 2 without a custom
+    encoder, it does not support anything else.
+    """
+    return _json_dumps_indent(obj, indent, encoder)
@@ -0,0 +1,252 @@
+"""Run time based listeners from a single timer on the event loop."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import heapq
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rebuild the heap once it holds this many more timestamps than are in use
+HEAP_COMPACT_THRESHOLD = 1000
+
+
+class _ScheduledJob:
+    """A job that runs once at a point in time."""
+
+    __slots__ = ("job", "utc_point_in_time", "done")
+
+    def __init__(self, job: HassJob, utc_point_in_time: datetime) -> None:
+        """Initialize the scheduled job."""
+        self.job = job
+        self.utc_point_in_time = utc_point_in_time
+        self.done = False
+
+
+class _TimePattern:
+    """Listeners of the same time pattern, sharing one scheduled job."""
+
+    __slots__ = ("scheduler", "key", "jobs", "cancel")
+
+    def __init__(self, scheduler: TimeScheduler, key: tuple[Any, ...]) -> None:
+        """Initialize the time pattern."""
+        self.scheduler = scheduler
+        self.key = key
+        self.jobs: list[HassJob] = []
+        self.cancel: CALLBACK_TYPE | None = None
+
+    def next_time(self, now: datetime) -> datetime:
+        """Return the next time the pattern matches, starting at now."""
+        matching_seconds, matching_minutes, matching_hours, local = self.key
+        localized_now = dt_util.as_local(now) if local else now
+        return dt_util.find_next_time_expression_time(
+            localized_now, matching_seconds, matching_minutes, matching_hours
+        )
+
+    @callback
+    def async_schedule(self, now: datetime) -> None:
+        """Schedule the next time the pattern matches."""
+        self.cancel = self.scheduler.async_schedule(
+            HassJob(self.async_fire), self.next_time(now)
+        )
+
+    @callback
+    def async_fire(self, _: datetime) -> None:
+        """Run the listeners of the pattern and schedule the next match."""
+        scheduler = self.scheduler
+        now = scheduler.utcnow()
+        local_now = dt_util.as_local(now) if self.key[3] else now
+        for job in list(self.jobs):
+            scheduler.async_run_job(job, local_now)
+        if self.jobs:
+            self.async_schedule(now + timedelta(seconds=1))
+
+
+class TimeScheduler:
+    """Run time based listeners from a single timer on the event loop.
+
+    Jobs are kept in a heap of the points in time they run at, and jobs
+    for the same point in time share an entry. Only the earliest point in
+    time has a timer on the event loop; when it fires, every job that is
+    due runs in the same pass. Listeners of the same time pattern share a
+    single scheduled job.
+    """
+
+    def __init__(self, hass: HomeAssistant, utcnow: Callable[[], datetime]) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.utcnow = utcnow
+        self._heap: list[float] = []
+        self._jobs: dict[float, list[_ScheduledJob]] = {}
+        self._patterns: dict[tuple[Any, ...], _TimePattern] = {}
+        self._armed: set[float] = set()
+        self._next_fire: float | None = None
+        self.scheduled_jobs = 0
+        self.fired_jobs = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+
+    @callback
+    def async_stats(self) -> dict[str, Any]:
+        """Return counters of the scheduled jobs and how late they ran."""
+        return {
+            "scheduled_jobs": self.scheduled_jobs,
+            "points_in_time": len(self._jobs),
+            "time_patterns": len(self._patterns),
+            "time_pattern_listeners": sum(
+                len(pattern.jobs) for pattern in self._patterns.values()
+            ),
+            "fired_jobs": self.fired_jobs,
+            "last_latency": self.last_latency,
+            "max_latency": self.max_latency,
+        }
+
+    @callback
+    def async_schedule(
+        self, job: HassJob, utc_point_in_time: datetime
+    ) -> CALLBACK_TYPE:
+        """Run a job once at a point in time.
+
+        The job is called with the point in time.
+        """
+        timestamp = utc_point_in_time.timestamp()
+        scheduled = _ScheduledJob(job, utc_point_in_time)
+        if (jobs := self._jobs.get(timestamp)) is not None:
+            jobs.append(scheduled)
+        else:
+            self._jobs[timestamp] = [scheduled]
+            heapq.heappush(self._heap, timestamp)
+            if self._next_fire is None or timestamp < self._next_fire:
+                self._async_arm(timestamp, time.time())
+        self.scheduled_jobs += 1
+
+        @callback
+        def cancel() -> None:
+            """Cancel the scheduled job."""
+            if scheduled.done:
+                return
+            scheduled.done = True
+            self.scheduled_jobs -= 1
+            if (jobs := self._jobs.get(timestamp)) is None:
+                # The job is due and skipped by the pass that runs it
+                return
+            jobs.remove(scheduled)
+            if not jobs:
+                # The timestamp stays in the heap until it is due or compacted
+                del self._jobs[timestamp]
+                if len(self._heap) - len(self._jobs) > HEAP_COMPACT_THRESHOLD:
+                    self._heap = list(self._jobs)
+                    heapq.heapify(self._heap)
+
+        return cancel
+
+    @callback
+    def async_track_pattern(
+        self,
+        job: HassJob,
+        matching_seconds: list[int],
+        matching_minutes: list[int],
+        matching_hours: list[int],
+        local: bool,
+    ) -> CALLBACK_TYPE:
+        """Run a job every time the time matches a pattern.
+
+        The job is called with the current time, in the local time zone if
+        local is set.
+        """
+        key = (
+            tuple(matching_seconds),
+            tuple(matching_minutes),
+            tuple(matching_hours),
+            local,
+        )
+        if (existing := self._patterns.get(key)) is None:
+            pattern = self._patterns[key] = _TimePattern(self, key)
+            pattern.async_schedule(dt_util.utcnow())
+        else:
+            pattern = existing
+        pattern.jobs.append(job)
+        removed = False
+
+        @callback
+        def remove() -> None:
+            """Stop running the job."""
+            nonlocal removed
+            if removed:
+                return
+            removed = True
+            pattern.jobs.remove(job)
+            if pattern.jobs:
+                return
+            del self._patterns[key]
+            assert pattern.cancel is not None
+            pattern.cancel()
+
+        return remove
+
+    @callback
+    def async_run_job(self, job: HassJob, *args: Any) -> None:
+        """Run a job, logging exceptions so other due jobs still run."""
+        try:
+            self.hass.async_run_hass_job(job, *args)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error running scheduled job %s", job)
+
+    @callback
+    def _async_arm(self, timestamp: float, now_timestamp: float) -> None:
+        """Arm an event loop timer for a point in time.
+
+        A timer that was armed for a later point in time is left running,
+        it will find nothing or only some jobs that are due.
+        """
+        self._armed.add(timestamp)
+        self._next_fire = timestamp
+        self.hass.loop.call_later(
+            timestamp - now_timestamp, self._async_fire, timestamp
+        )
+
+    @callback
+    def _async_fire(self, timestamp: float) -> None:
+        """Run all jobs that are due."""
+        self._armed.discard(timestamp)
+        if timestamp == self._next_fire:
+            self._next_fire = None
+
+        # Depending on the available clock support (including timer hardware
+        # and the OS kernel) it can happen that we fire a little bit too early
+        # as measured by utcnow(). Jobs that are not due yet stay in the heap.
+        now_timestamp = self.utcnow().timestamp()
+        heap = self._heap
+        due: list[list[_ScheduledJob]] = []
+        while heap and heap[0] <= now_timestamp:
+            if (jobs := self._jobs.pop(heapq.heappop(heap), None)) is not None:
+                due.append(jobs)
+
+        if due:
+            self.last_latency = now_timestamp - due[0][0].utc_point_in_time.timestamp()
+            self.max_latency = max(self.max_latency, self.last_latency)
+
+        for jobs in due:
+            for scheduled in jobs:
+                if scheduled.done:
+                    # Cancelled by a job that ran earlier in this pass
+                    continue
+                scheduled.done = True
+                self.scheduled_jobs -= 1
+                self.fired_jobs += 1
+                self.async_run_job(scheduled.job, scheduled.utc_point_in_time)
+
+        # Jobs that ran may have scheduled or cancelled other jobs
+        if not (heap := self._heap):
+            return
+        if (next_timestamp := heap[0]) in self._armed:
+            if self._next_fire is None:
+                self._next_fire = next_timestamp
+        elif self._next_fire is None or next_timestamp < self._next_fire:
+            self._async_arm(next_timestamp, now_timestamp)
@@ -13,18 +13,22 @@ from functools import partial, wraps
 import json
 import logging
 import math
+import operator
 from operator import attrgetter
 import random
 import re
 import statistics
 from struct import error as StructError, pack, unpack_from
 import sys
+import time
+from types import CodeType
 from typing import Any, cast
 from urllib.parse import urlencode as urllib_urlencode
 import weakref
 
 import jinja2
-from jinja2 import pass_context, pass_environment
+from jinja2 import nodes, pass_context, pass_environment
+from jinja2.bccache import Bucket
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from jinja2.utils import Namespace
 import voluptuous as vol
@@ -34,10 +38,13 @@ from homeassistant.const import (
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_STARTED,
+    EVENT_HOMEASSISTANT_STOP,
     LENGTH_METERS,
     STATE_UNKNOWN,
 )
 from homeassistant.core import (
+    Event,
     HomeAssistant,
     State,
     callback,
@@ -56,6 +63,7 @@ from homeassistant.util.async_ import run_callback_threadsafe
 from homeassistant.util.thread import ThreadWithException
 
 from . import area_registry, device_registry, entity_registry, location as loc_helper
+from .storage import Store
 from .typing import TemplateVarsType
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -68,6 +76,11 @@ _RENDER_INFO = "template.render_info"
 _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
 _ENVIRONMENT_STRICT = "template.environment_strict"
+_BYTECODE_CACHE = "template.bytecode_cache"
+
+BYTECODE_CACHE_STORAGE_KEY = "core.template_bytecode"
+BYTECODE_CACHE_STORAGE_VERSION = 1
+BYTECODE_CACHE_SAVE_DELAY = 60
 
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
@@ -312,6 +325,8 @@ class Template:
         "is_static",
         "_compiled_code",
         "_compiled",
+        "_fast_render",
+        "_fast_render_names",
         "_exc_info",
         "_limited",
         "_strict",
@@ -325,6 +340,8 @@ class Template:
         self.template: str = template.strip()
         self._compiled_code = None
         self._compiled: jinja2.Template | None = None
+        self._fast_render: Callable[[], Any] | None = None
+        self._fast_render_names: frozenset[str] = frozenset()
         self.hass = hass
         self.is_static = not is_template_string(template)
         self._exc_info = None
@@ -403,12 +420,29 @@ class Template:
         if variables is not None:
             kwargs.update(variables)
 
-        try:
-            render_result = _render_with_context(self.template, compiled, **kwargs)
-        except Exception as err:
-            raise TemplateError(err) from err
+        if (fast_render := self._fast_render) is not None and (
+            not kwargs or self._fast_render_names.isdisjoint(kwargs)
+        ):
+            try:
+                with set_template(self.template, "rendering"):
+                    result = fast_render()
+            except Exception as err:
+                raise TemplateError(err) from err
+            if (
+                (result is True or result is False)
+                and parse_result
+                and not self.hass.config.legacy_templates
+            ):
+                # Parsing the rendered boolean returns it
+                return result
+            render_result = str(result).strip()
+        else:
+            try:
+                render_result = _render_with_context(self.template, compiled, **kwargs)
+            except Exception as err:
+                raise TemplateError(err) from err
 
-        render_result = render_result.strip()
+            render_result = render_result.strip()
 
         if self.hass.config.legacy_templates or not parse_result:
             return render_result
@@ -599,11 +633,16 @@ class Template:
         self._strict = strict
         env = self._env
 
-        self._compiled = jinja2.Template.from_code(
-            env, self._compiled_code, env.globals, None
-        )
+        if (compiled := env.compiled_template_cache.get(self.template)) is None:
+            compiled = env.compiled_template_cache[
+                self.template
+            ] = jinja2.Template.from_code(env, self._compiled_code, env.globals, None)
+        self._compiled = compiled
+
+        if not limited and (fast_render := _compile_fast_render(self)) is not None:
+            self._fast_render, self._fast_render_names = fast_render
 
-        return self._compiled
+        return compiled
 
     def __eq__(self, other):
         """Compare template with another."""
@@ -1814,6 +1853,159 @@ def _render_with_context(
         return template.render(**kwargs)
 
 
+class _UnsupportedNode(Exception):
+    """The node can not be evaluated without Jinja."""
+
+
+_FAST_RENDER_COMPARE = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gteq": operator.ge,
+    "lt": operator.lt,
+    "lteq": operator.le,
+}
+_FAST_RENDER_FILTERS = ("float", "int", "round")
+
+
+def _compile_fast_render(
+    tpl: Template,
+) -> tuple[Callable[[], Any], frozenset[str]] | None:
+    """Compile a template of a common shape to a Python function.
+
+    Templates which are a single expression of constants, calls of states,
+    is_state, state_attr and is_state_attr with constant arguments, the
+    float, int and round filters, comparisons and boolean operators are
+    evaluated without rendering them with Jinja. The functions and filters
+    are the ones the template environment uses, so they collect the render
+    info the same way.
+
+    Returns the function and the names it uses, the function can not be
+    used when variables shadow those names.
+    """
+    env = tpl._env  # pylint: disable=protected-access
+    # Templates with the same source share the expression, if they have one
+    compiled = tpl._compiled  # pylint: disable=protected-access
+    assert compiled is not None
+    if compiled in env.fast_render_exprs:
+        expr = env.fast_render_exprs[compiled]
+    else:
+        expr = env.fast_render_exprs[compiled] = _fast_render_expr(env, tpl.template)
+    if expr is None:
+        return None
+
+    hass = tpl.hass
+    functions: dict[str, Callable[..., Any]] = {
+        "states": AllStates(hass),
+        "is_state": partial(is_state, hass),
+        "is_state_attr": partial(is_state_attr, hass),
+        "state_attr": partial(state_attr, hass),
+    }
+    names: set[str] = set()
+
+    def _const(node: nodes.Node) -> Any:
+        if not isinstance(node, nodes.Const):
+            raise _UnsupportedNode
+        return node.value
+
+    def _compile(node: nodes.Node) -> Callable[[], Any]:
+        if isinstance(node, nodes.Const):
+            value = node.value
+            return lambda: value
+
+        if isinstance(node, nodes.Call):
+            if (
+                not isinstance(node.node, nodes.Name)
+                or node.node.name not in functions
+                or node.kwargs
+                or node.dyn_args
+                or node.dyn_kwargs
+            ):
+                raise _UnsupportedNode
+            names.add(node.node.name)
+            return partial(
+                functions[node.node.name], *(_const(arg) for arg in node.args)
+            )
+
+        if isinstance(node, nodes.Filter):
+            if (
+                node.name not in _FAST_RENDER_FILTERS
+                or node.node is None
+                or node.dyn_args
+                or node.dyn_kwargs
+            ):
+                raise _UnsupportedNode
+            filter_func = env.filters[node.name]
+            value_func = _compile(node.node)
+            args = [_const(arg) for arg in node.args]
+            kwargs = {keyword.key: _const(keyword.value) for keyword in node.kwargs}
+            return lambda: filter_func(value_func(), *args, **kwargs)
+
+        if isinstance(node, nodes.Compare):
+            if len(node.ops) != 1 or node.ops[0].op not in _FAST_RENDER_COMPARE:
+                raise _UnsupportedNode
+            compare = _FAST_RENDER_COMPARE[node.ops[0].op]
+            left = _compile(node.expr)
+            right = _compile(node.ops[0].expr)
+            return lambda: compare(left(), right())
+
+        if isinstance(node, nodes.Not):
+            operand = _compile(node.node)
+            return lambda: not operand()
+
+        if isinstance(node, nodes.And):
+            left = _compile(node.left)
+            right = _compile(node.right)
+            return lambda: left() and right()
+
+        if isinstance(node, nodes.Or):
+            left = _compile(node.left)
+            right = _compile(node.right)
+            return lambda: left() or right()
+
+        raise _UnsupportedNode
+
+    try:
+        fast_render = _compile(expr)
+    except _UnsupportedNode:
+        env.fast_render_exprs[compiled] = None
+        return None
+    return fast_render, frozenset(names)
+
+
+def _fast_render_expr(env: TemplateEnvironment, source: str) -> nodes.Expr | None:
+    """Return the expression of a template which is a single expression.
+
+    The tree parsed while compiling the template is used if it is still
+    around, the template is only parsed again when its code came from a
+    cache.
+    """
+    if (
+        not source.startswith("{{")
+        or not source.endswith("}}")
+        or source.count("{{") != 1
+        or "{%" in source
+        or "{#" in source
+    ):
+        return None
+
+    if env.last_parsed is not None and env.last_parsed[0] == source:
+        tree = env.last_parsed[1]
+    else:
+        try:
+            tree = env.parse(source)
+        except jinja2.TemplateSyntaxError:
+            return None
+    body = tree.body
+    if (
+        len(body) != 1
+        or not isinstance(body[0], nodes.Output)
+        or len(body[0].nodes) != 1
+    ):
+        return None
+    return body[0].nodes[0]
+
+
 class LoggingUndefined(jinja2.Undefined):
     """Log on undefined variables."""
 
@@ -1864,9 +2056,30 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             undefined = LoggingUndefined
         else:
             undefined = jinja2.StrictUndefined
-        super().__init__(undefined=undefined)
+        super().__init__(
+            undefined=undefined,
+            bytecode_cache=hass.data.get(_BYTECODE_CACHE) if hass else None,
+        )
         self.hass = hass
-        self.template_cache = weakref.WeakValueDictionary()
+        if limited:
+            self.flavor = "limited"
+        elif strict:
+            self.flavor = "strict"
+        else:
+            self.flavor = "default"
+        # Templates with the same source share their code and jinja2 template
+        self.template_cache: weakref.WeakValueDictionary[
+            str, CodeType
+        ] = weakref.WeakValueDictionary()
+        self.compiled_template_cache: weakref.WeakValueDictionary[
+            str, jinja2.Template
+        ] = weakref.WeakValueDictionary()
+        # The expression of the templates that can be rendered without Jinja
+        self.fast_render_exprs: weakref.WeakKeyDictionary[
+            jinja2.Template, nodes.Expr | None
+        ] = weakref.WeakKeyDictionary()
+        # The source and tree of the template parsed last
+        self.last_parsed: tuple[str, nodes.Template] | None = None
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -2059,9 +2272,121 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             return super().compile(source, name, filename, raw, defer_init)
 
         if (cached := self.template_cache.get(source)) is None:
-            cached = self.template_cache[source] = super().compile(source)
+            cached = self.template_cache[source] = self._compile_source(source)
 
         return cached
 
+    def _parse(self, source, name, filename):
+        """Parse the source, keeping the tree to check for a fast render."""
+        tree = super()._parse(source, name, filename)
+        self.last_parsed = (source, tree)
+        return tree
+
+    def _compile_source(self, source: str) -> CodeType:
+        """Compile the source, using the bytecode cache if there is one."""
+        if not isinstance(bytecode_cache := self.bytecode_cache, TemplateBytecodeCache):
+            return super().compile(source)
+
+        bucket = bytecode_cache.get_bucket(self, self.flavor, None, source)
+        if bucket.code is None:
+            start = time.perf_counter()
+            bucket.code = super().compile(source)
+            bytecode_cache.dump_compiled(bucket, time.perf_counter() - start)
+        return bucket.code
+
 
 _NO_HASS_ENV = TemplateEnvironment(None)  # type: ignore[no-untyped-call]
+
+
+class TemplateBytecodeCache(jinja2.BytecodeCache):
+    """Keep the bytecode of compiled templates across restarts.
+
+    Templates are compiled from their source rather than loaded by name, so
+    the bytecode is keyed by the flavor of the environment and a hash of the
+    source. Jinja rejects bytecode written by another Jinja or Python
+    version, those templates are compiled again.
+    """
+
+    def __init__(self, stored: dict[str, dict[str, Any]] | None = None) -> None:
+        """Initialize the cache with the bytecode stored by an earlier run."""
+        self._stored = stored or {}
+        self._used: dict[str, dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.time_saved = 0.0
+
+    @property
+    def changed(self) -> bool:
+        """Return if the bytecode to store differs from the stored bytecode."""
+        return self.misses > 0 or len(self._used) != len(self._stored)
+
+    def get_bucket(
+        self,
+        environment: jinja2.Environment,
+        name: str,
+        filename: str | None,
+        source: str,
+    ) -> Bucket:
+        """Return the bucket for a template source."""
+        checksum = self.get_source_checksum(source)
+        bucket = Bucket(environment, f"{name}-{checksum}", checksum)
+        self.load_bytecode(bucket)
+        return bucket
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        """Load the stored bytecode into a bucket."""
+        if (entry := self._stored.get(bucket.key)) is None:
+            return
+        start = time.perf_counter()
+        bucket.bytecode_from_string(base64.b64decode(entry["bytecode"]))
+        if bucket.code is None:
+            return
+        self.hits += 1
+        self.time_saved += entry["compile_time"] - (time.perf_counter() - start)
+        self._used[bucket.key] = entry
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        """Store the bytecode of a bucket."""
+        self.dump_compiled(bucket, 0)
+
+    def dump_compiled(self, bucket: Bucket, compile_time: float) -> None:
+        """Store the bytecode of a bucket and how long compiling it took."""
+        self.misses += 1
+        self._used[bucket.key] = {
+            "compile_time": compile_time,
+            "bytecode": base64.b64encode(bucket.bytecode_to_string()).decode(),
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the bytecode of the templates used in this run to store."""
+        return {"templates": dict(self._used)}
+
+
+async def async_load_bytecode_cache(hass: HomeAssistant) -> None:
+    """Compile templates with the bytecode stored by earlier runs.
+
+    The bytecode of the templates compiled in this run is stored once Home
+    Assistant has started, and again when it stops.
+    """
+    store = Store(hass, BYTECODE_CACHE_STORAGE_VERSION, BYTECODE_CACHE_STORAGE_KEY)
+    stored = None
+    if (data := await store.async_load()) is not None:
+        stored = cast("dict[str, Any]", data)["templates"]
+    bytecode_cache = TemplateBytecodeCache(stored)
+    hass.data[_BYTECODE_CACHE] = bytecode_cache
+
+    @callback
+    def _async_save(event: Event) -> None:
+        if event.event_type == EVENT_HOMEASSISTANT_STARTED:
+            _LOGGER.info(
+                "Loaded %s of %s compiled templates from the bytecode cache, "
+                "saving %.2fs of compiling",
+                bytecode_cache.hits,
+                bytecode_cache.hits + bytecode_cache.misses,
+                bytecode_cache.time_saved,
+            )
+        if bytecode_cache.changed:
+            store.async_delay_save(bytecode_cache.as_dict, BYTECODE_CACHE_SAVE_DELAY)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _async_save)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_save)
@@ -164,7 +164,7 @@ class DataUpdateCoordinator(Generic[T]):
         """Refresh data and log errors."""
         await self._async_refresh(log_failures=True)
 
-    async def _async_refresh(  # noqa: C901
+    async def _async_refresh(
         self,
         log_failures: bool = True,
         raise_on_auth_failed: bool = False,
@@ -261,8 +261,18 @@ class DataUpdateCoordinator(Generic[T]):
             if not auth_failed and self._listeners and not self.hass.is_stopping:
                 self._schedule_refresh()
 
-        for update_callback in self._listeners:
-            update_callback()
+        self.async_update_listeners()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners.
+
+        The state changes of the entities written by the listeners are fired
+        as a single batch.
+        """
+        with self.hass.states.async_batch():
+            for update_callback in self._listeners:
+                update_callback()
 
     @callback
     def async_set_updated_data(self, data: T) -> None:
@@ -283,8 +293,7 @@ class DataUpdateCoordinator(Generic[T]):
         if self._listeners:
             self._schedule_refresh()
 
-        for update_callback in self._listeners:
-            update_callback()
+        self.async_update_listeners()
 
     @callback
     def _async_stop_refresh(self, _: Event) -> None:
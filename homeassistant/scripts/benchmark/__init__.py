@@ -6,9 +6,11 @@ import asyncio
 import collections
 from collections.abc import Callable
 from contextlib import suppress
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import partial
 import json
 import logging
+import threading
 from timeit import default_timer as timer
 from typing import TypeVar
 
@@ -119,6 +121,88 @@ async def fire_events_with_filter(hass):
     return timer() - start
 
 
+@benchmark
+async def state_changed_filtered_listeners(hass):
+    """Fire 100k state changed events with 5000 filtered listeners."""
+    return await _state_changed_entity_listeners(hass, keyed=False)
+
+
+@benchmark
+async def state_changed_entity_listeners(hass):
+    """Fire 100k state changed events with 5000 entity listeners."""
+    return await _state_changed_entity_listeners(hass, keyed=True)
+
+
+async def _state_changed_entity_listeners(hass, keyed):
+    count = 0
+    listener_count = 5000
+    events_to_fire = 10 ** 5
+    entity_ids = [f"sensor.benchmark_{idx}" for idx in range(listener_count)]
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    for entity_id in entity_ids:
+        if keyed:
+            hass.bus.async_listen_entities(
+                EVENT_STATE_CHANGED, listener, entity_ids=[entity_id]
+            )
+        else:
+            hass.bus.async_listen(
+                EVENT_STATE_CHANGED,
+                listener,
+                event_filter=core.callback(
+                    lambda event, entity_id=entity_id: event.data["entity_id"]
+                    == entity_id
+                ),
+            )
+
+    start = timer()
+
+    for idx in range(events_to_fire):
+        hass.bus.async_fire(
+            EVENT_STATE_CHANGED, {"entity_id": entity_ids[idx % listener_count]}
+        )
+
+    await hass.async_block_till_done()
+
+    assert count == events_to_fire
+
+    return timer() - start
+
+
+@benchmark
+async def track_point_in_time_listeners(hass):
+    """Run 20k listeners scheduled at 200 points in time."""
+    count = 0
+    listener_count = 20000
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(_):
+        """Handle scheduled time."""
+        nonlocal count
+        count += 1
+
+        if count == listener_count:
+            event.set()
+
+    start = timer()
+    now = dt_util.utcnow()
+
+    for idx in range(listener_count):
+        hass.helpers.event.async_track_point_in_utc_time(
+            listener, now + timedelta(milliseconds=idx % 200)
+        )
+
+    await event.wait()
+
+    return timer() - start
+
+
 @benchmark
 async def time_changed_helper(hass):
     """Run a million events through time changed helper."""
@@ -253,6 +337,78 @@ async def state_changed_event_filter_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def set_states(hass):
+    """Set the states of 1000 entities 100 times, one by one."""
+    return await _set_states(hass, batched=False)
+
+
+@benchmark
+async def set_states_batched(hass):
+    """Set the states of 1000 entities 100 times, as batches of 1000."""
+    return await _set_states(hass, batched=True)
+
+
+async def _set_states(hass, batched):
+    """Set states with a listener that locks a queue like the recorder."""
+    lock = threading.Lock()
+    queue = collections.deque()
+
+    @core.callback
+    def listener(events):
+        """Put the events in the queue."""
+        with lock:
+            queue.extend(events)
+
+    hass.bus.async_listen_batch(EVENT_STATE_CHANGED, listener)
+    entity_ids = [f"sensor.benchmark_{idx}" for idx in range(1000)]
+
+    start = timer()
+
+    for value in range(100):
+        if batched:
+            hass.states.async_set_many(
+                (entity_id, value, None) for entity_id in entity_ids
+            )
+        else:
+            for entity_id in entity_ids:
+                hass.states.async_set(entity_id, value)
+
+    await hass.async_block_till_done()
+
+    assert len(queue) == 100 * 1000
+
+    return timer() - start
+
+
+@benchmark
+async def mqtt_topic_matching(hass):
+    """Match 100k MQTT messages against 10k subscriptions."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.mqtt.topic_trie import TopicTrie
+
+    trie = TopicTrie()
+    for idx in range(8000):
+        trie.add(f"zigbee2mqtt/device_{idx}", idx)
+    for idx in range(1000):
+        trie.add(f"tasmota/+/tele_{idx}/STATE", idx)
+    for idx in range(1000):
+        trie.add(f"homeassistant/sensor/node_{idx}/#", idx)
+    topics = [
+        f"zigbee2mqtt/device_{idx % 8000}"
+        if idx % 4
+        else f"tasmota/discovery/tele_{idx % 1000}/STATE"
+        for idx in range(100000)
+    ]
+
+    start = timer()
+
+    for topic in topics:
+        assert trie.match(topic)
+
+    return timer() - start
+
+
 @benchmark
 async def logbook_filtering_state(hass):
     """Filter state changes."""
@@ -381,16 +537,263 @@ async def valid_entity_id(hass):
 @benchmark
 async def json_serialize_states(hass):
     """Serialize million states with websocket default encoder."""
+    return _json_serialize_states(JSON_DUMP)
+
+
+@benchmark
+async def json_serialize_states_python(hass):
+    """Serialize million states with the standard library encoder."""
+    return _json_serialize_states(
+        partial(json.dumps, cls=JSONEncoder, allow_nan=False, separators=(",", ":"))
+    )
+
+
+def _json_serialize_states(dump):
     states = [
         core.State("light.kitchen", "on", {"friendly_name": "Kitchen Lights"})
         for _ in range(10 ** 6)
     ]
 
     start = timer()
-    JSON_DUMP(states)
+    dump(states)
     return timer() - start
 
 
+@benchmark
+async def template_render(hass):
+    """Render a corpus of real world templates 100k times."""
+    return _template_render(hass, fast_render=True)
+
+
+@benchmark
+async def template_render_jinja(hass):
+    """Render a corpus of real world templates 100k times with Jinja only."""
+    return _template_render(hass, fast_render=False)
+
+
+def _template_render(hass, fast_render):
+    # pylint: disable=import-outside-toplevel,protected-access
+    from homeassistant.helpers.template import Template
+
+    hass.states.async_set("sensor.outside_temperature", "21.3", {"unit": "°C"})
+    hass.states.async_set("sensor.humidity", "54.26")
+    hass.states.async_set("sensor.power_consumption", "2730")
+    hass.states.async_set("binary_sensor.front_door", "off")
+    hass.states.async_set("person.paulus", "home")
+    hass.states.async_set("sun.sun", "below_horizon")
+    hass.states.async_set("climate.living_room", "heat", {"current_temperature": 18})
+    hass.states.async_set("alarm_control_panel.home", "armed_away")
+    hass.states.async_set("light.kitchen", "on", {"effect": "colorloop"})
+
+    templates = [
+        Template(template_string, hass)
+        for template_string in (
+            "{{ states('sensor.outside_temperature') | float > 20 }}",
+            "{{ is_state('binary_sensor.front_door', 'on') }}",
+            "{{ is_state('person.paulus', 'home') and is_state('sun.sun', 'below_horizon') }}",
+            "{{ state_attr('climate.living_room', 'current_temperature') | float(0) < 19 }}",
+            "{{ states('sensor.power_consumption') | int(0) >= 2500 }}",
+            "{{ not is_state('alarm_control_panel.home', 'disarmed') }}",
+            "{{ is_state_attr('light.kitchen', 'effect', 'colorloop') }}",
+            "{{ states('sensor.humidity') | round(1) }}",
+            "{{ states('sensor.outside_temperature') | float + 2 }}",
+            "{{ states.sensor.outside_temperature.state }}",
+            "It is {{ states('sensor.outside_temperature') }} outside",
+            "{{ states('sensor.humidity') | float > 60 or is_state('person.paulus', 'not_home') }}",
+        )
+    ]
+    for template in templates:
+        template.async_render_to_info()
+        if not fast_render:
+            template._fast_render = None
+
+    start = timer()
+
+    for idx in range(10 ** 5):
+        templates[idx % len(templates)].async_render_to_info()
+
+    return timer() - start
+
+
+@benchmark
+async def hls_segment_view(hass):
+    """Serve a stream segment to 1k viewers with HlsSegmentView."""
+    return await _hls_segment_view(hass, joined=False)
+
+
+@benchmark
+async def hls_segment_view_joined(hass):
+    """Serve a stream segment to 1k viewers, joining its parts for each."""
+    return await _hls_segment_view(hass, joined=True)
+
+
+async def _hls_segment_view(hass, joined):
+    # pylint: disable=import-outside-toplevel
+    import os
+    import time
+    import tracemalloc
+
+    from aiohttp import web
+    from aiohttp.test_utils import TestClient, TestServer
+
+    from homeassistant.components.stream import Stream
+    from homeassistant.components.stream.const import (
+        ATTR_SETTINGS,
+        DOMAIN,
+        HLS_PROVIDER,
+    )
+    from homeassistant.components.stream.core import Part, Segment, StreamSettings
+    from homeassistant.components.stream.hls import HlsSegmentView
+
+    hass.data[DOMAIN] = {
+        ATTR_SETTINGS: StreamSettings(
+            ll_hls=True,
+            min_segment_duration=2,
+            part_target_duration=0.1,
+            hls_advance_part_limit=3,
+            hls_part_timeout=0.2,
+        )
+    }
+    stream = Stream(hass, "benchmark", {})
+    track = stream.add_provider(HLS_PROVIDER)
+
+    # A 2 second low latency HLS segment of a 4 Mbit/s camera
+    segment = Segment(
+        sequence=0,
+        init=b"\0" * 1000,
+        stream_id=0,
+        start_time=dt_util.utcnow(),
+        stream_outputs=[],
+    )
+    for _ in range(20):
+        segment.async_add_part(
+            Part(duration=0.1, has_keyframe=False, data=os.urandom(50000)), 0
+        )
+    track.put(segment)
+    await hass.async_block_till_done()
+
+    view = HlsSegmentView()
+
+    async def handle(request):
+        if not joined:
+            return await view.handle(request, stream, "0", "")
+        # How the view served a segment before it wrote the parts one by one
+        return web.Response(
+            body=segment.get_data(),
+            headers={
+                "Content-Type": "video/iso.segment",
+                "Cache-Control": f"max-age={6*track.target_duration:.0f}",
+            },
+        )
+
+    app = web.Application()
+    app.router.add_get("/segment/0.m4s", handle)
+    logging.getLogger("aiohttp.access").setLevel(logging.WARNING)
+    client = TestClient(TestServer(app))
+    await client.start_server()
+
+    # Several viewers of a camera request the segment at the same time
+    concurrent_viewers = 10
+    viewers = 10 ** 3
+
+    async def serve_viewers():
+        responses = await asyncio.gather(
+            *(client.get("/segment/0.m4s") for _ in range(concurrent_viewers))
+        )
+        for response in responses:
+            assert len(await response.read()) == segment.data_size
+
+    # Warm up the client and server
+    await serve_viewers()
+
+    start = timer()
+    cpu_start = time.process_time()
+
+    for _ in range(viewers // concurrent_viewers):
+        await serve_viewers()
+
+    cpu_time = time.process_time() - cpu_start
+    runtime = timer() - start
+
+    tracemalloc.start()
+    await serve_viewers()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    await client.close()
+    track.cleanup()
+
+    print(f"CPU time per viewer: {cpu_time / viewers * 1000:.3f}ms")
+    print(f"Peak memory per viewer: {peak // concurrent_viewers} bytes")
+    return runtime
+
+
+@benchmark
+async def recorder_write_orm(hass):
+    """Write 100k state changes with the default recorder write path."""
+    return await _recorder_write(hass, bulk_insert=False)
+
+
+@benchmark
+async def recorder_write_bulk(hass):
+    """Write 100k state changes with the bulk insert recorder write path."""
+    return await _recorder_write(hass, bulk_insert=True)
+
+
+async def _recorder_write(hass, bulk_insert):
+    # pylint: disable=import-outside-toplevel,protected-access
+    from homeassistant.components import recorder
+
+    entity_count = 200
+    events_to_write = 10 ** 5
+    # Roughly a commit interval worth of events at a few hundred per second
+    commit_every = 500
+
+    instance = recorder.Recorder(
+        hass,
+        auto_purge=False,
+        keep_days=1,
+        commit_interval=1,
+        uri="sqlite://",
+        db_max_retries=1,
+        db_retry_wait=0,
+        entity_filter=lambda entity_id: True,
+        exclude_t=[],
+        bulk_insert=bulk_insert,
+    )
+    instance._setup_connection()
+    instance._setup_run()
+
+    events = []
+    for idx in range(events_to_write):
+        entity_id = f"sensor.power_{idx % entity_count}"
+        new_state = core.State(
+            entity_id,
+            str(idx),
+            {"unit_of_measurement": "W", "friendly_name": entity_id},
+        )
+        events.append(
+            core.Event(
+                EVENT_STATE_CHANGED,
+                {"entity_id": entity_id, "old_state": None, "new_state": new_state},
+            )
+        )
+
+    start = timer()
+
+    for idx, event in enumerate(events, 1):
+        instance._process_one_event(event)
+        if idx % commit_every == 0:
+            instance._commit_event_session_or_retry()
+    instance._commit_event_session_or_retry()
+
+    runtime = timer() - start
+
+    instance._close_event_session()
+    instance._close_connection()
+    return runtime
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -413,6 +816,7 @@ def _create_state_changed_event_from_old_new(
             "entity_id"
             "domain"
             "attributes"
+            "shared_attrs"
             "state_id",
             "old_state_id",
         ],
@@ -420,7 +824,8 @@ def _create_state_changed_event_from_old_new(
 
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
-    row.attributes = attributes_json
+    row.attributes = None
+    row.shared_attrs = attributes_json
     row.time_fired = event_time_fired
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
@@ -5,12 +5,13 @@ from unittest.mock import AsyncMock, Mock
 import pytest
 
 from homeassistant.components.websocket_api.const import TYPE_RESULT
+from homeassistant.helpers import entity
 from homeassistant.helpers.device_registry import async_get
 from homeassistant.setup import async_setup_component
 
 from . import get_diagnostics_for_config_entry, get_diagnostics_for_device
 
-from tests.common import MockConfigEntry, mock_platform
+from tests.common import MockConfigEntry, MockEntity, MockEntityPlatform, mock_platform
 
 
 @pytest.fixture(autouse=True)
@@ -92,6 +93,29 @@ async def test_download_diagnostics(hass, hass_client):
     ) == {"device": "info"}
 
 
+async def test_download_diagnostics_with_write_stats(hass, hass_client):
+    """Test the entity write stats are part of the config entry diagnostics."""
+    config_entry = MockConfigEntry(domain="fake_integration")
+    config_entry.add_to_hass(hass)
+    other_entry = MockConfigEntry(domain="other_integration")
+    entity.async_enable_write_stats(hass)
+
+    for entry, name in ((config_entry, "Test"), (other_entry, "Other")):
+        platform = MockEntityPlatform(hass)
+        platform.config_entry = entry
+        await platform.async_add_entities([MockEntity(name=name, state="on")])
+
+    diagnostics = await get_diagnostics_for_config_entry(
+        hass, hass_client, config_entry
+    )
+    assert diagnostics["config_entry"] == "info"
+    write_stats = diagnostics["entity_write_stats"]
+    assert [stats["entity_id"] for stats in write_stats["entities"]] == [
+        "test_domain.test"
+    ]
+    assert write_stats["integrations"][0]["writes"] == 1
+
+
 async def test_failure_scenarios(hass, hass_client):
     """Test failure scenarios."""
     client = await hass_client()
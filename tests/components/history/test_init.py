@@ -5,6 +5,7 @@ from http import HTTPStatus
 import json
 from unittest.mock import patch, sentinel
 
+from aiohttp import ClientPayloadError
 import pytest
 from pytest import approx
 
@@ -614,6 +615,137 @@ async def test_fetch_period_api_with_minimal_response(hass, hass_client):
     assert response.status == HTTPStatus.OK
 
 
+async def test_fetch_period_api_with_stream(hass, hass_client):
+    """Test the fetch period view streams the same states per entity."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    hass.states.async_set("light.hall", "on")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "on", {"brightness": 10})
+    hass.states.async_set("light.kitchen", "off", {"brightness": 10})
+    hass.states.async_set("light.kitchen", "on", {"brightness": 20})
+    hass.states.async_set("light.kitchen", "on", {"brightness": 30})
+    hass.states.async_set("light.kitchen", "off", {"brightness": 30})
+    hass.states.async_set("climate.living", "heat", {"temperature": 20})
+    hass.states.async_set("climate.living", "heat", {"temperature": 21})
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+    params = {"filter_entity_id": "light.kitchen,light.hall,climate.living"}
+
+    for query in ("", "minimal_response", "significant_changes_only=0"):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}?{query}", params=params
+        )
+        assert response.status == HTTPStatus.OK
+        expected = await response.json()
+
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}?stream&{query}", params=params
+        )
+        assert response.status == HTTPStatus.OK
+        assert response.headers["Content-Type"].startswith("application/json")
+        result = await response.json()
+        # The streamed entities are sorted by entity_id
+        assert len(result) == len(expected) == 3
+        assert sorted(result, key=lambda states: states[0]["entity_id"]) == sorted(
+            expected, key=lambda states: states[0]["entity_id"]
+        )
+
+    kitchen = next(
+        states for states in result if states[0]["entity_id"] == "light.kitchen"
+    )
+    assert [state["state"] for state in kitchen] == ["on", "off", "on", "on", "off"]
+
+
+async def test_fetch_period_api_with_stream_error(hass, hass_client, caplog):
+    """Test the fetch period view aborts the stream after an error."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+    state = ha.State("light.kitchen", "on")
+
+    def _stream_states(*args):
+        yield [state]
+        raise ValueError("boom")
+
+    with patch(
+        "homeassistant.components.history.history.stream_significant_states_with_session",
+        _stream_states,
+    ):
+        response = await client.get(
+            f"/api/history/period/{dt_util.utcnow().isoformat()}?stream"
+        )
+        assert response.status == HTTPStatus.OK
+        with pytest.raises(ClientPayloadError):
+            await response.read()
+    assert "Error streaming history, aborting the response" in caplog.text
+
+    def _fail(*args):
+        raise ValueError("boom")
+        yield  # pylint: disable=unreachable
+
+    with patch(
+        "homeassistant.components.history.history.stream_significant_states_with_session",
+        _fail,
+    ):
+        response = await client.get(
+            f"/api/history/period/{dt_util.utcnow().isoformat()}?stream"
+        )
+        assert response.status == HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+async def test_fetch_period_api_with_max_points(hass, hass_client):
+    """Test the fetch period view downsamples the states with max_points."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    start = dt_util.utcnow()
+    for value in range(100):
+        hass.states.async_set("sensor.power", value % 10)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+    params = {"filter_entity_id": "sensor.power"}
+
+    for query in ("max_points=20", "stream&max_points=20"):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}?{query}", params=params
+        )
+        assert response.status == HTTPStatus.OK
+        result = await response.json()
+        assert 10 < len(result[0]) <= 20
+
+    for max_points in ("2", "many"):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}",
+            params={**params, "max_points": max_points},
+        )
+        assert response.status == HTTPStatus.BAD_REQUEST
+
+
+async def test_fetch_period_api_with_stream_no_states(hass, hass_client):
+    """Test the fetch period view streams an empty list."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{dt_util.utcnow().isoformat()}?stream",
+        params={"filter_entity_id": "non.existing"},
+    )
+    assert response.status == HTTPStatus.OK
+    assert await response.json() == []
+
+
 async def test_fetch_period_api_with_no_timestamp(hass, hass_client):
     """Test the fetch period view for history with no timestamp."""
     await hass.async_add_executor_job(init_recorder_component, hass)
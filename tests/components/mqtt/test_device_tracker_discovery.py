@@ -92,7 +92,7 @@ async def test_non_duplicate_device_tracker_discovery(hass, mqtt_mock, caplog):
     assert state is not None
     assert state.name == "Beer"
     assert state_duplicate is None
-    assert "Component has already been discovered: device_tracker bla" in caplog.text
+    assert "Ignoring unchanged discovery payload for device_tracker bla" in caplog.text
 
 
 async def test_device_tracker_removal(hass, mqtt_mock, caplog):
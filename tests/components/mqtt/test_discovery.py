@@ -139,6 +139,57 @@ async def test_correct_config_discovery(hass, mqtt_mock, caplog):
     assert ("binary_sensor", "bla") in hass.data[ALREADY_DISCOVERED]
 
 
+async def test_unchanged_config_discovery_ignored(hass, mqtt_mock):
+    """Test an unchanged discovery payload is not processed again."""
+    payload = '{ "name": "Beer", "state_topic": "test-topic" }'
+    async_fire_mqtt_message(hass, "homeassistant/binary_sensor/bla/config", payload)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.beer") is not None
+
+    with patch(
+        "homeassistant.components.mqtt.discovery.async_dispatcher_send"
+    ) as mock_dispatcher_send:
+        async_fire_mqtt_message(hass, "homeassistant/binary_sensor/bla/config", payload)
+        await hass.async_block_till_done()
+        assert not mock_dispatcher_send.called
+
+        async_fire_mqtt_message(
+            hass,
+            "homeassistant/binary_sensor/bla/config",
+            '{ "name": "Milk", "state_topic": "test-topic" }',
+        )
+        await hass.async_block_till_done()
+        assert mock_dispatcher_send.called
+
+
+async def test_discovered_entities_added_together(hass, mqtt_mock):
+    """Test entities discovered together are added to the platform at once."""
+    # Set up the platform
+    async_fire_mqtt_message(
+        hass,
+        "homeassistant/sensor/first/config",
+        '{ "name": "First", "state_topic": "test-topic" }',
+    )
+    await hass.async_block_till_done()
+
+    with patch(
+        "homeassistant.helpers.entity_platform.EntityPlatform.async_add_entities",
+        wraps=hass.data["entity_platform"]["mqtt"][-1].async_add_entities,
+    ) as mock_add_entities:
+        for idx in range(3):
+            async_fire_mqtt_message(
+                hass,
+                f"homeassistant/sensor/bla{idx}/config",
+                f'{{ "name": "Beer {idx}", "state_topic": "test-topic" }}',
+            )
+        await hass.async_block_till_done()
+
+    assert mock_add_entities.call_count == 1
+    assert len(mock_add_entities.call_args[0][0]) == 3
+    for idx in range(3):
+        assert hass.states.get(f"sensor.beer_{idx}") is not None
+
+
 async def test_discover_fan(hass, mqtt_mock, caplog):
     """Test discovering an MQTT fan."""
     async_fire_mqtt_message(
@@ -386,7 +437,7 @@ async def test_non_duplicate_discovery(hass, mqtt_mock, caplog):
     assert state is not None
     assert state.name == "Beer"
     assert state_duplicate is None
-    assert "Component has already been discovered: binary_sensor bla" in caplog.text
+    assert "Ignoring unchanged discovery payload for binary_sensor bla" in caplog.text
 
 
 async def test_removal(hass, mqtt_mock, caplog):
@@ -945,7 +996,7 @@ async def test_mqtt_integration_discovery_subscribe_unsubscribe(
         await async_start(hass, "homeassistant", entry)
         await hass.async_block_till_done()
 
-    mqtt_client_mock.subscribe.assert_any_call("comp/discovery/#", 0)
+    assert ("comp/discovery/#", 0) in mqtt_client_mock.subscribe.call_args[0][0]
     assert not mqtt_client_mock.unsubscribe.called
 
     class TestFlow(config_entries.ConfigFlow):
@@ -956,12 +1007,12 @@ async def test_mqtt_integration_discovery_subscribe_unsubscribe(
             return self.async_abort(reason="already_configured")
 
     with patch.dict(config_entries.HANDLERS, {"comp": TestFlow}):
-        mqtt_client_mock.subscribe.assert_any_call("comp/discovery/#", 0)
+        assert ("comp/discovery/#", 0) in mqtt_client_mock.subscribe.call_args[0][0]
         assert not mqtt_client_mock.unsubscribe.called
 
         async_fire_mqtt_message(hass, "comp/discovery/bla/config", "")
         await hass.async_block_till_done()
-        mqtt_client_mock.unsubscribe.assert_called_once_with("comp/discovery/#")
+        mqtt_client_mock.unsubscribe.assert_called_once_with(["comp/discovery/#"])
         mqtt_client_mock.unsubscribe.reset_mock()
 
         async_fire_mqtt_message(hass, "comp/discovery/bla/config", "")
@@ -983,7 +1034,7 @@ async def test_mqtt_discovery_unsubscribe_once(hass, mqtt_client_mock, mqtt_mock
         await async_start(hass, "homeassistant", entry)
         await hass.async_block_till_done()
 
-    mqtt_client_mock.subscribe.assert_any_call("comp/discovery/#", 0)
+    assert ("comp/discovery/#", 0) in mqtt_client_mock.subscribe.call_args[0][0]
     assert not mqtt_client_mock.unsubscribe.called
 
     class TestFlow(config_entries.ConfigFlow):
@@ -998,4 +1049,4 @@ async def test_mqtt_discovery_unsubscribe_once(hass, mqtt_client_mock, mqtt_mock
         async_fire_mqtt_message(hass, "comp/discovery/bla/config", "")
         await hass.async_block_till_done()
         await hass.async_block_till_done()
-        mqtt_client_mock.unsubscribe.assert_called_once_with("comp/discovery/#")
+        mqtt_client_mock.unsubscribe.assert_called_once_with(["comp/discovery/#"])
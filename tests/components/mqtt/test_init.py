@@ -625,6 +625,109 @@ async def test_all_subscriptions_run_when_decode_fails(
     assert len(calls) == 1
 
 
+async def test_payload_decoded_once_per_encoding(hass, mqtt_mock, calls, record_calls):
+    """Test the payload is decoded once for all subscriptions with an encoding."""
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+    await mqtt.async_subscribe(hass, "test/#", record_calls)
+    await mqtt.async_subscribe(hass, "test-topic", record_calls, encoding=None)
+
+    payload = MagicMock()
+    payload.decode.return_value = "decoded"
+    mqtt_mock._mqtt_handle_message(mqtt.ReceiveMessage("test-topic", payload, 0, False))
+    await hass.async_block_till_done()
+
+    payload.decode.assert_called_once_with("utf-8")
+    assert [call[0].payload for call in calls] == ["decoded", payload]
+
+
+async def test_messages_handled_in_batches(hass, mqtt_mock, calls, record_calls):
+    """Test messages received by paho are handled in batches."""
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+
+    def receive_messages(payloads):
+        for payload in payloads:
+            mqtt_mock._mqtt_on_message(
+                None, None, mqtt.ReceiveMessage("test-topic", payload, 0, False)
+            )
+
+    with patch.object(
+        hass.loop, "call_soon_threadsafe", wraps=hass.loop.call_soon_threadsafe
+    ) as call_soon_threadsafe:
+        receive_messages([b"1", b"2", b"3"])
+        await hass.async_block_till_done()
+
+    # The loop was woken up once for the messages
+    handle_messages = hass.data["mqtt"]()._async_handle_messages
+    assert call_soon_threadsafe.mock_calls.count(call(handle_messages)) == 1
+    assert [call[0].payload for call in calls] == ["1", "2", "3"]
+
+    receive_messages([b"4"])
+    await hass.async_block_till_done()
+    assert len(calls) == 4
+
+    stats = debug_info.message_statistics(hass).as_dict()
+    assert stats["messages"] == 4
+    assert stats["batches"] == 2
+    assert stats["max_batch_size"] == 3
+    assert stats["average_batch_size"] == 2
+    assert stats["max_latency"] >= stats["average_latency"] > 0
+
+
+async def test_failing_callback_does_not_stop_batch(
+    hass, mqtt_mock, calls, record_calls, caplog
+):
+    """Test a callback raising does not keep the rest of a batch from being handled."""
+
+    @callback
+    def failing(msg):
+        raise ValueError("boom")
+
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+    await mqtt.async_subscribe(hass, "failing-topic", failing)
+
+    for topic, payload in (
+        ("test-topic", b"1"),
+        ("failing-topic", b"2"),
+        ("test-topic", b"3"),
+    ):
+        mqtt_mock._mqtt_on_message(
+            None, None, mqtt.ReceiveMessage(topic, payload, 0, False)
+        )
+    await hass.async_block_till_done()
+
+    assert [call[0].payload for call in calls] == ["1", "3"]
+    assert "Error handling MQTT message on failing-topic" in caplog.text
+
+    mqtt_mock._mqtt_on_message(
+        None, None, mqtt.ReceiveMessage("test-topic", b"4", 0, False)
+    )
+    await hass.async_block_till_done()
+    assert len(calls) == 3
+
+
+async def test_message_statistics_ws(
+    hass, hass_ws_client, mqtt_mock, hass_read_only_access_token
+):
+    """Test getting the statistics of the received messages."""
+    mqtt_mock._mqtt_on_message(
+        None, None, mqtt.ReceiveMessage("test-topic", b"payload", 0, False)
+    )
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 5, "type": "mqtt/message_statistics"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["messages"] == 1
+    assert response["result"]["batches"] == 1
+
+    client = await hass_ws_client(hass, hass_read_only_access_token)
+    await client.send_json({"id": 5, "type": "mqtt/message_statistics"})
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "unauthorized"
+
+
 async def test_subscribe_topic(hass, mqtt_mock, calls, record_calls):
     """Test the subscription of a topic."""
     unsub = await mqtt.async_subscribe(hass, "test-topic", record_calls)
@@ -969,6 +1072,95 @@ async def test_not_calling_unsubscribe_with_active_subscribers(
     "mqtt_config",
     [{mqtt.CONF_BROKER: "mock-broker", mqtt.CONF_DISCOVERY: False}],
 )
+async def test_subscriptions_are_batched(hass, mqtt_client_mock, mqtt_mock):
+    """Test subscriptions and unsubscriptions are sent to the broker together."""
+    # Fake that the client is connected
+    mqtt_mock().connected = True
+
+    unsub_removed = await mqtt.async_subscribe(hass, "test/removed", None)
+    # The subscription is acknowledged when the subscribe call returns
+    mqtt_client_mock.subscribe.assert_called_once_with([("test/removed", 0)])
+
+    mqtt_client_mock.reset_mock()
+    unsub_state, *_ = await asyncio.gather(
+        mqtt.async_subscribe(hass, "test/state", None),
+        mqtt.async_subscribe(hass, "test/state", None, qos=1),
+        mqtt.async_subscribe(hass, "test/other", None, qos=2),
+    )
+    unsub_removed()
+    await hass.async_block_till_done()
+
+    assert mqtt_client_mock.subscribe.mock_calls == [
+        call([("test/other", 2), ("test/state", 1)])
+    ]
+    mqtt_client_mock.unsubscribe.assert_called_once_with(["test/removed"])
+
+    mqtt_client_mock.reset_mock()
+    unsub_state()
+    await mqtt.async_subscribe(hass, "test/removed", None)
+    await hass.async_block_till_done()
+
+    # Other subscriptions on test/state remain
+    mqtt_client_mock.subscribe.assert_called_once_with([("test/removed", 0)])
+    assert not mqtt_client_mock.unsubscribe.called
+
+    mqtt_client_mock.reset_mock()
+    with patch("homeassistant.components.mqtt.MAX_SUBSCRIBES_PER_CALL", 1):
+        for topic in ("test/a", "test/b"):
+            unsub = await mqtt.async_subscribe(hass, topic, None)
+            unsub()
+        await asyncio.gather(
+            mqtt.async_subscribe(hass, "test/c", None),
+            mqtt.async_subscribe(hass, "test/d", None),
+        )
+        await hass.async_block_till_done()
+
+    assert mqtt_client_mock.subscribe.mock_calls == [
+        call([("test/a", 0)]),
+        call([("test/b", 0)]),
+        call([("test/c", 0)]),
+        call([("test/d", 0)]),
+    ]
+    assert mqtt_client_mock.unsubscribe.mock_calls == [
+        call(["test/a"]),
+        call(["test/b"]),
+    ]
+
+
+async def test_failed_subscriptions_are_sent_again(
+    hass, mqtt_client_mock, mqtt_mock, caplog
+):
+    """Test (un)subscriptions that failed to be sent are queued again."""
+    # Fake that the client is connected
+    mqtt_mock().connected = True
+
+    unsub = await mqtt.async_subscribe(hass, "test/removed", None)
+    await hass.async_block_till_done()
+    mqtt_client_mock.reset_mock()
+
+    subscribe = mqtt_client_mock.subscribe.side_effect
+    mqtt_client_mock.subscribe.side_effect = None
+    mqtt_client_mock.subscribe.return_value = (4, None)
+    unsub()
+    with pytest.raises(HomeAssistantError):
+        await mqtt.async_subscribe(hass, "test/state", None)
+    await hass.async_block_till_done()
+
+    mqtt_client_mock.subscribe.assert_called_once_with([("test/state", 0)])
+    assert not mqtt_client_mock.unsubscribe.called
+    assert "Failed to send MQTT (un)subscriptions" in caplog.text
+
+    mqtt_client_mock.reset_mock()
+    mqtt_client_mock.subscribe.side_effect = subscribe
+    await mqtt.async_subscribe(hass, "test/other", None)
+    await hass.async_block_till_done()
+
+    mqtt_client_mock.subscribe.assert_called_once_with(
+        [("test/other", 0), ("test/state", 0)]
+    )
+    mqtt_client_mock.unsubscribe.assert_called_once_with(["test/removed"])
+
+
 async def test_restore_subscriptions_on_reconnect(hass, mqtt_client_mock, mqtt_mock):
     """Test subscriptions are restored on reconnect."""
     # Fake that the client is connected
@@ -996,16 +1188,15 @@ async def test_restore_all_active_subscriptions_on_reconnect(
     # Fake that the client is connected
     mqtt_mock().connected = True
 
-    unsub = await mqtt.async_subscribe(hass, "test/state", None, qos=2)
-    await mqtt.async_subscribe(hass, "test/state", None)
-    await mqtt.async_subscribe(hass, "test/state", None, qos=1)
+    unsub, *_ = await asyncio.gather(
+        mqtt.async_subscribe(hass, "test/state", None, qos=2),
+        mqtt.async_subscribe(hass, "test/state", None),
+        mqtt.async_subscribe(hass, "test/state", None, qos=1),
+    )
     await hass.async_block_till_done()
 
-    expected = [
-        call("test/state", 2),
-        call("test/state", 0),
-        call("test/state", 1),
-    ]
+    # The subscriptions are sent together with the highest qos
+    expected = [call([("test/state", 2)])]
     assert mqtt_client_mock.subscribe.mock_calls == expected
 
     unsub()
@@ -1017,7 +1208,7 @@ async def test_restore_all_active_subscriptions_on_reconnect(
         mqtt_mock._mqtt_on_connect(None, None, None, 0)
         await hass.async_block_till_done()
 
-    expected.append(call("test/state", 1))
+    expected.append(call([("test/state", 1)]))
     assert mqtt_client_mock.subscribe.mock_calls == expected
 
 
@@ -1273,16 +1464,14 @@ async def test_mqtt_subscribes_topics_on_connect(hass, mqtt_client_mock, mqtt_mo
     await mqtt.async_subscribe(hass, "still/pending", None)
     await mqtt.async_subscribe(hass, "still/pending", None, 1)
 
-    hass.add_job = MagicMock()
     mqtt_mock._mqtt_on_connect(None, None, 0, 0)
 
     await hass.async_block_till_done()
 
     assert mqtt_client_mock.disconnect.call_count == 0
 
-    expected = {"topic/test": 0, "home/sensor": 2, "still/pending": 1}
-    calls = {call[1][1]: call[1][2] for call in hass.add_job.mock_calls}
-    assert calls == expected
+    expected = [("home/sensor", 2), ("still/pending", 1), ("topic/test", 0)]
+    mqtt_client_mock.subscribe.assert_called_once_with(expected)
 
 
 async def test_setup_fails_without_config(hass):
@@ -0,0 +1,90 @@
+"""The tests for the MQTT topic trie."""
+from paho.mqtt.matcher import MQTTMatcher
+import pytest
+
+from homeassistant.components.mqtt.topic_trie import TopicTrie
+
+TOPIC_FILTERS = [
+    "a",
+    "a/b",
+    "a/b/c",
+    "a/+",
+    "a/+/c",
+    "a/#",
+    "+",
+    "+/b",
+    "+/+/+",
+    "#",
+    "/a",
+    "a/",
+    "+/",
+    "$SYS/#",
+    "$SYS/+/load",
+]
+
+TOPICS = [
+    "a",
+    "b",
+    "a/b",
+    "a/c",
+    "a/b/c",
+    "a/b/d",
+    "a/b/c/d",
+    "a/",
+    "/a",
+    "/",
+    "b/b",
+    "$SYS/broker/load",
+    "$SYS",
+    "$other/b",
+]
+
+
+@pytest.mark.parametrize("topic", TOPICS)
+def test_match_like_paho(topic):
+    """Test a topic matches the same topic filters as with paho."""
+    trie = TopicTrie()
+    for topic_filter in TOPIC_FILTERS:
+        trie.add(topic_filter, topic_filter)
+
+    expected = []
+    for topic_filter in TOPIC_FILTERS:
+        matcher = MQTTMatcher()
+        matcher[topic_filter] = topic_filter
+        if next(matcher.iter_match(topic), None) is not None:
+            expected.append(topic_filter)
+
+    # Matches are returned in the order they were added
+    assert trie.match(topic) == expected
+
+
+def test_add_remove():
+    """Test items of the same topic filter are kept until all are removed."""
+    trie = TopicTrie()
+    first = object()
+    second = object()
+    trie.add("a/+/c", first)
+    trie.add("a/b", second)
+    trie.add("a/+/c", second)
+
+    assert trie.match("a/b/c") == [first, second]
+    assert trie.get("a/+/c") == [first, second]
+    assert trie.get("a/+") == []
+    assert trie.has_topic_filter("a/+/c")
+    assert not trie.has_topic_filter("a/+")
+
+    trie.remove("a/+/c", first)
+    assert trie.match("a/b/c") == [second]
+    with pytest.raises(KeyError):
+        trie.remove("a/+/c", first)
+    with pytest.raises(KeyError):
+        trie.remove("a/+/d", first)
+
+    trie.remove("a/+/c", second)
+    assert not trie.has_topic_filter("a/+/c")
+    assert trie.match("a/b/c") == []
+    # Unused levels are dropped
+    assert list(trie._root.children["a"].children) == ["b"]
+
+    trie.remove("a/b", second)
+    assert trie._root.children == {}
@@ -0,0 +1,218 @@
+"""Test the recorder queue."""
+from dataclasses import dataclass
+import queue
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder.backlog import RecorderQueue
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, State
+from homeassistant.helpers.json import json_bytes_allow_nan
+import homeassistant.util.dt as dt_util
+
+
+@dataclass
+class MockEventTask:
+    """Stand in for the recorder EventTask."""
+
+    event: Event
+
+
+def _state_changed_event(entity_id, state):
+    """Return a state_changed event."""
+    return Event(
+        EVENT_STATE_CHANGED,
+        {
+            "entity_id": entity_id,
+            "old_state": None,
+            "new_state": State(entity_id, state, {"attr": state}),
+        },
+    )
+
+
+def _create_queue(spill_path, max_memory=10, coalesce_threshold=10, batch=2):
+    """Return a recorder queue."""
+    return RecorderQueue(
+        MockEventTask, str(spill_path), max_memory, coalesce_threshold, batch
+    )
+
+
+def _drain(recorder_queue):
+    """Return all tasks in the queue."""
+    tasks = []
+    while True:
+        try:
+            tasks.append(recorder_queue.get_nowait())
+        except queue.Empty:
+            return tasks
+
+
+def test_tasks_are_returned_in_order(tmp_path):
+    """Test tasks and events come out in the order they were put."""
+    recorder_queue = _create_queue(tmp_path / "spill")
+    recorder_queue.put("task")
+    recorder_queue.put_event(Event("test_event"))
+    assert recorder_queue.qsize() == 2
+    assert recorder_queue.get() == "task"
+    assert recorder_queue.get().event.event_type == "test_event"
+    assert recorder_queue.empty()
+    with pytest.raises(queue.Empty):
+        recorder_queue.get_nowait()
+
+
+def test_state_changes_are_coalesced_under_pressure(tmp_path):
+    """Test pending state changes of an entity are collapsed to the latest."""
+    recorder_queue = _create_queue(tmp_path / "spill", coalesce_threshold=2)
+    recorder_queue.put_event(_state_changed_event("sensor.one", "1"))
+    recorder_queue.put_event(_state_changed_event("sensor.one", "2"))
+    recorder_queue.put_event(_state_changed_event("sensor.two", "1"))
+    recorder_queue.put_event(_state_changed_event("sensor.one", "3"))
+    recorder_queue.put_event(_state_changed_event("sensor.two", "2"))
+    recorder_queue.put_event(_state_changed_event("sensor.three", "1"))
+
+    assert recorder_queue.coalesced == 2
+    assert [
+        (task.event.data["entity_id"], task.event.data["new_state"].state)
+        for task in _drain(recorder_queue)
+    ] == [
+        ("sensor.one", "1"),
+        ("sensor.one", "3"),
+        ("sensor.two", "2"),
+        ("sensor.three", "1"),
+    ]
+
+    # Once a state change was handed out it is no longer replaced
+    recorder_queue.put_event(_state_changed_event("sensor.one", "4"))
+    recorder_queue.put_event(_state_changed_event("sensor.one", "5"))
+    assert len(_drain(recorder_queue)) == 2
+
+
+def test_events_are_spilled_to_disk(tmp_path):
+    """Test events are spilled and read back in order once memory is full."""
+    spill_path = tmp_path / "spill"
+    recorder_queue = _create_queue(spill_path, max_memory=2, batch=2)
+    context = Context(user_id="user", parent_id="parent")
+    time_fired = dt_util.utcnow()
+
+    recorder_queue.put_event(Event("test_event", {"index": 0}))
+    recorder_queue.put("task")
+    for index in range(1, 6):
+        recorder_queue.put_event(
+            Event(
+                "test_event", {"index": index}, time_fired=time_fired, context=context
+            )
+        )
+    recorder_queue.put_event(_state_changed_event("sensor.one", "on"))
+    recorder_queue.put("last_task")
+
+    assert recorder_queue.qsize() == 9
+    assert recorder_queue.spill_size == 6
+    assert recorder_queue.spilled == 6
+
+    tasks = _drain(recorder_queue)
+    assert tasks[1] == "task"
+    assert tasks[-1] == "last_task"
+    events = [task.event for task in (tasks[0], *tasks[2:-1])]
+    assert [event.data.get("index") for event in events] == [0, 1, 2, 3, 4, 5, None]
+    assert events[1].time_fired == time_fired
+    assert events[1].context == context
+    assert events[-1].data["entity_id"] == "sensor.one"
+    assert events[-1].data["new_state"].state == "on"
+    assert events[-1].data["new_state"].attributes == {"attr": "on"}
+
+    assert recorder_queue.empty()
+    assert not spill_path.exists()
+
+
+def test_spill_file_is_loaded_on_start(tmp_path):
+    """Test events spilled by a previous run are recorded first."""
+    spill_path = tmp_path / "spill"
+    recorder_queue = _create_queue(spill_path, max_memory=1)
+    recorder_queue.put_event(Event("test_event", {"index": 0}))
+    recorder_queue.put_event(Event("test_event", {"index": 1}))
+    recorder_queue.put_event(Event("test_event", {"index": 2}))
+    assert recorder_queue.clear() == 1
+    assert spill_path.exists()
+
+    recorder_queue = _create_queue(spill_path, max_memory=1)
+    recorder_queue.put_event(Event("test_event", {"index": 3}))
+    recorder_queue.load_spill_file()
+    assert recorder_queue.qsize() == 3
+    assert [task.event.data["index"] for task in _drain(recorder_queue)] == [1, 2, 3]
+    assert not spill_path.exists()
+
+
+def test_partially_read_spill_file_is_loaded_on_start(tmp_path):
+    """Test events read back from the spill file are not recorded again."""
+    spill_path = tmp_path / "spill"
+    recorder_queue = _create_queue(spill_path, max_memory=1, batch=2)
+    for index in range(6):
+        recorder_queue.put_event(Event("test_event", {"index": index}))
+    assert recorder_queue.get().event.data["index"] == 0
+    # Reads back events 1 and 2
+    assert recorder_queue.get().event.data["index"] == 1
+    # Event 2 was read back and is dropped with the tasks held in memory
+    assert recorder_queue.clear() == 1
+
+    recorder_queue = _create_queue(spill_path, max_memory=1, batch=2)
+    recorder_queue.load_spill_file()
+    assert recorder_queue.qsize() == 3
+    assert [task.event.data["index"] for task in _drain(recorder_queue)] == [3, 4, 5]
+    assert not spill_path.exists()
+    assert not (tmp_path / "spill.tmp").exists()
+
+
+def test_spill_write_failure_drops_events(tmp_path):
+    """Test events are dropped when the spill file cannot be written."""
+    recorder_queue = _create_queue(tmp_path / "missing" / "spill", max_memory=1)
+    recorder_queue.put_event(Event("test_event"))
+    recorder_queue.put_event(Event("test_event"))
+    recorder_queue.put_event(Event("test_event"))
+    assert len(_drain(recorder_queue)) == 1
+    assert recorder_queue.dropped == 2
+    assert recorder_queue.empty()
+
+    # Spilling is retried once the failed events were discarded
+    recorder_queue.put_event(Event("test_event"))
+    recorder_queue.put_event(Event("test_event"))
+    assert len(_drain(recorder_queue)) == 1
+    assert recorder_queue.dropped == 3
+
+
+def test_unserializable_spilled_event_is_dropped(tmp_path):
+    """Test an event which cannot be spilled does not shift the spill file."""
+    recorder_queue = _create_queue(tmp_path / "spill", max_memory=1)
+    recorder_queue.put_event(Event("test_event", {"index": 0}))
+    recorder_queue.put_event(Event("test_event", {"index": object()}))
+    recorder_queue.put_event(Event("test_event", {"index": 2}))
+    assert [task.event.data["index"] for task in _drain(recorder_queue)] == [0, 2]
+    assert recorder_queue.dropped == 1
+
+
+def test_spill_file_is_written_outside_the_lock(tmp_path):
+    """Test putting events does not wait for the spill file to be written."""
+    recorder_queue = _create_queue(tmp_path / "spill", max_memory=1)
+    written = threading.Event()
+    release = threading.Event()
+
+    def _slow_json_bytes(data):
+        written.set()
+        release.wait()
+        return json_bytes_allow_nan(data)
+
+    with patch(
+        "homeassistant.components.recorder.backlog.json_bytes_allow_nan",
+        side_effect=_slow_json_bytes,
+    ):
+        recorder_queue.put_event(Event("test_event", {"index": 0}))
+        recorder_queue.put_event(Event("test_event", {"index": 1}))
+        assert written.wait(5)
+        # The spill thread is busy, more events are still accepted
+        recorder_queue.put_event(Event("test_event", {"index": 2}))
+        assert recorder_queue.qsize() == 3
+        release.set()
+        tasks = _drain(recorder_queue)
+
+    assert [task.event.data["index"] for task in tasks] == [0, 1, 2]
@@ -5,8 +5,10 @@ from datetime import timedelta
 import json
 from unittest.mock import patch, sentinel
 
+from homeassistant.components import recorder
 from homeassistant.components.recorder import history
 from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
@@ -75,6 +77,47 @@ def test_get_states(hass_recorder):
     assert history.get_state(hass, time_before_recorder_ran, "demo.id") is None
 
 
+def test_get_states_from_last_state_ids(hass_recorder):
+    """Test states that did not change since a point in time are read by id."""
+    hass = hass_recorder()
+    instance = hass.data[recorder.DATA_INSTANCE]
+
+    start = dt_util.utcnow()
+    point = start + timedelta(seconds=1)
+    end = point + timedelta(seconds=1)
+
+    with patch("homeassistant.core.dt_util.utcnow", return_value=start):
+        hass.states.set("test.unchanged", "on")
+        hass.states.set("test.changed", "on")
+        hass.states.set("test.other", "on")
+        wait_recording_done(hass)
+    with patch("homeassistant.core.dt_util.utcnow", return_value=end):
+        hass.states.set("test.changed", "off")
+        wait_recording_done(hass)
+
+    assert instance.last_state_ids["test.changed"][1] == end
+    entity_ids = ["test.unchanged", "test.changed", "test.other"]
+
+    with patch(
+        "homeassistant.components.recorder.run_information_with_session"
+    ) as run_information:
+        states = history.get_states(hass, end + timedelta(seconds=1), entity_ids)
+    assert not run_information.called
+    assert {state.entity_id: state.state for state in states} == {
+        "test.unchanged": "on",
+        "test.changed": "off",
+        "test.other": "on",
+    }
+
+    # The state of test.changed at the point in time is read from the database
+    states = history.get_states(hass, point, entity_ids)
+    assert {state.entity_id: state.state for state in states} == {
+        "test.unchanged": "on",
+        "test.changed": "on",
+        "test.other": "on",
+    }
+
+
 def test_state_changes_during_period(hass_recorder):
     """Test state change during period."""
     hass = hass_recorder()
@@ -184,6 +227,22 @@ def test_get_significant_states(hass_recorder):
     assert states == hist
 
 
+def test_stream_significant_states(hass_recorder):
+    """Test streaming yields the significant states one entity at a time."""
+    hass = hass_recorder()
+    zero, four, states = record_states(hass)
+    with session_scope(hass=hass) as session:
+        streamed = {
+            ent_states[0].entity_id: ent_states
+            for ent_states in history.stream_significant_states_with_session(
+                hass, session, zero, four
+            )
+        }
+    assert streamed == {
+        entity_id: ent_states for entity_id, ent_states in states.items() if ent_states
+    }
+
+
 def test_get_significant_states_minimal_response(hass_recorder):
     """Test that only significant states are returned.
 
@@ -369,6 +428,65 @@ def test_get_significant_states_only(hass_recorder):
     assert states == hist[entity_id]
 
 
+def test_downsample_states():
+    """Test numeric states are downsampled and other states are kept."""
+    start = dt_util.utcnow()
+    values = ["1"] * 50 + ["100"] + ["1"] * 49 + ["unavailable"] + ["2"] * 49
+    db_states = [
+        ha.State("sensor.power", value, last_updated=start + timedelta(seconds=idx))
+        for idx, value in enumerate(values)
+    ]
+
+    assert history._downsample_states(db_states, 200) == db_states
+
+    downsampled = history._downsample_states(db_states, 10)
+    assert len(downsampled) <= 11
+    # The first and last state of each numeric run, the spike and
+    # the unavailable state are kept
+    assert downsampled[0] is db_states[0]
+    assert db_states[50] in downsampled
+    assert db_states[99] in downsampled
+    assert db_states[100] in downsampled
+    assert db_states[101] in downsampled
+    assert downsampled[-1] is db_states[-1]
+    assert downsampled == sorted(downsampled, key=lambda state: state.last_updated)
+
+    unavailable = [ha.State("sensor.power", "unavailable")] * 20
+    assert history._downsample_states(unavailable, 10) == unavailable
+
+
+def test_get_significant_states_max_points(hass_recorder):
+    """Test the states of an entity can be downsampled."""
+    hass = hass_recorder()
+    entity_id = "sensor.power"
+    start = dt_util.utcnow()
+    for value in range(100):
+        hass.states.set(entity_id, value % 10)
+    wait_recording_done(hass)
+
+    hist = history.get_significant_states(hass, start, entity_ids=[entity_id])
+    assert len(hist[entity_id]) == 100
+
+    for minimal_response in (False, True):
+        hist = history.get_significant_states(
+            hass,
+            start,
+            entity_ids=[entity_id],
+            minimal_response=minimal_response,
+            max_points=20,
+        )
+        assert 10 < len(hist[entity_id]) <= 20
+        assert hist[entity_id][-1] == hass.states.get(entity_id)
+
+    with session_scope(hass=hass) as session:
+        streamed = list(
+            history.stream_significant_states_with_session(
+                hass, session, start, entity_ids=[entity_id], max_points=20
+            )
+        )
+    assert 10 < len(streamed[0]) <= 20
+
+
 def record_states(hass):
     """Record some test states.
 
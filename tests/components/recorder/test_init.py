@@ -12,6 +12,7 @@ from sqlalchemy.exc import DatabaseError, OperationalError, SQLAlchemyError
 from homeassistant.components import recorder
 from homeassistant.components.recorder import (
     CONF_AUTO_PURGE,
+    CONF_BULK_INSERT,
     CONF_DB_URL,
     CONFIG_SCHEMA,
     DOMAIN,
@@ -30,6 +31,7 @@ from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import (
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
     StatisticsRuns,
     process_timestamp,
@@ -175,6 +177,75 @@ async def test_saving_many_states(
         assert db_states[0].event_id > 0
 
 
+async def test_saving_states_shares_attributes(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test identical attributes are only stored once."""
+    instance = await async_setup_recorder_instance(hass)
+
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+    attributes2 = {"test_attr": 10, "test_attr_10": "mean"}
+
+    hass.states.async_set("test.recorder", "on", attributes)
+    hass.states.async_set("test.recorder", "off", attributes)
+    hass.states.async_set("test.recorder2", "on", attributes)
+    await async_wait_recording_done(hass, instance)
+    # The attributes id is now cached, the next commit reuses it
+    hass.states.async_set("test.recorder", "on", attributes)
+    hass.states.async_set("test.recorder2", "off", attributes2)
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert len(db_states) == 5
+        db_state_attributes = list(session.query(StateAttributes))
+        assert len(db_state_attributes) == 2
+        assert {db_state.attributes for db_state in db_states} == {None}
+        assert len({db_state.attributes_id for db_state in db_states[:4]}) == 1
+        assert db_states[0].to_native().attributes == attributes
+        assert db_states[4].to_native().attributes == attributes2
+
+    assert len(instance._state_attributes_ids) == 2
+    assert not instance._pending_state_attributes
+
+
+async def test_saving_states_bulk_insert(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test saving states and events with the bulk insert write path."""
+    instance = await async_setup_recorder_instance(hass, {CONF_BULK_INSERT: True})
+    assert instance._bulk_writer is not None
+
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+
+    hass.states.async_set("test.recorder", "on", attributes)
+    hass.bus.async_fire("custom_event", {"some_data": 15})
+    hass.states.async_set("test.recorder", "off", attributes)
+    await async_wait_recording_done(hass, instance)
+    hass.states.async_set("test.recorder", "on", {"test_attr": 6})
+    hass.states.async_remove("test.recorder")
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert [db_state.state for db_state in db_states] == ["on", "off", "on", ""]
+        assert db_states[0].old_state_id is None
+        for idx in range(1, 4):
+            assert db_states[idx].old_state_id == db_states[idx - 1].state_id
+            assert db_states[idx].event_id > db_states[idx - 1].event_id
+        assert db_states[0].attributes_id == db_states[1].attributes_id
+        assert db_states[1].to_native().attributes == attributes
+        assert db_states[2].to_native().attributes == {"test_attr": 6}
+        assert session.query(StateAttributes).count() == 3
+
+        db_events = list(session.query(Events).filter_by(event_type="custom_event"))
+        assert len(db_events) == 1
+        assert db_events[0].to_native().data == {"some_data": 15}
+
+    assert not instance._bulk_writer.has_pending_rows
+    assert "test.recorder" not in instance._bulk_writer.old_state_ids
+
+
 async def test_saving_state_with_intermixed_time_changes(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -195,14 +195,17 @@ async def test_events_during_migration_are_queued(hass):
     assert len(db_states) == 2
 
 
-async def test_events_during_migration_queue_exhausted(hass):
-    """Test that events during migration takes so long the queue is exhausted."""
+async def test_events_during_migration_queue_exhausted(hass, tmp_path):
+    """Test events are spilled to disk when migration exhausts the queue."""
 
     assert recorder.util.async_migration_in_progress(hass) is False
+    spill_file = tmp_path / "spill"
 
     with patch(
         "homeassistant.components.recorder.create_engine", new=create_engine_test
-    ), patch.object(recorder, "MAX_QUEUE_BACKLOG", 1):
+    ), patch.object(recorder, "MAX_QUEUE_BACKLOG", 1), patch.object(
+        recorder, "QUEUE_SPILL_FILE", str(spill_file)
+    ):
         await async_setup_component(
             hass, "recorder", {"recorder": {"db_url": "sqlite://"}}
         )
@@ -217,12 +220,14 @@ async def test_events_during_migration_queue_exhausted(hass):
         await async_wait_recording_done_without_instance(hass)
 
     assert recorder.util.async_migration_in_progress(hass) is False
+    assert hass.data[DATA_INSTANCE].queue.spilled > 0
+    assert not spill_file.exists()
     db_states = await hass.async_add_executor_job(_get_native_states, hass, "my.entity")
-    assert len(db_states) == 1
+    assert len(db_states) == 2
     hass.states.async_set("my.entity", "on", {})
     await async_wait_recording_done_without_instance(hass)
     db_states = await hass.async_add_executor_job(_get_native_states, hass, "my.entity")
-    assert len(db_states) == 2
+    assert len(db_states) == 3
 
 
 @pytest.mark.parametrize("start_version", [0, 16, 18, 22])
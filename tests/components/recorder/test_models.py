@@ -9,6 +9,7 @@ from homeassistant.components.recorder.models import (
     Base,
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -40,6 +41,34 @@ def test_from_event_to_db_state():
     assert state == States.from_event(event).to_native()
 
 
+def test_from_event_to_db_state_attributes():
+    """Test converting event to db state attributes."""
+    attrs = {"this_attr": True}
+    state = ha.State("sensor.temperature", "18", attrs)
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+        context=state.context,
+    )
+    db_attrs = StateAttributes.from_event(event)
+    assert db_attrs.shared_attrs == '{"this_attr":true}'
+    assert db_attrs.hash == StateAttributes.hash_shared_attrs(db_attrs.shared_attrs)
+    assert db_attrs.to_native() == attrs
+
+
+def test_nan_is_recorded():
+    """Test NaN in event data and state attributes is recorded."""
+    event = ha.Event("test_event", {"value": float("nan")})
+    assert Events.event_data_from_event(event) == '{"value":NaN}'
+
+    state = ha.State("sensor.temperature", "18", {"value": float("inf")})
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+    )
+    assert StateAttributes.shared_attrs_from_event(event) == '{"value":Infinity}'
+
+
 def test_from_event_to_delete_state():
     """Test converting deleting state event to db state."""
     event = ha.Event(
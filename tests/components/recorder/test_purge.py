@@ -13,11 +13,12 @@ from homeassistant.components.recorder.const import MAX_ROWS_TO_PURGE
 from homeassistant.components.recorder.models import (
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
     StatisticsRuns,
     StatisticsShortTerm,
 )
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.purge import PurgeProgress, purge_old_data
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.core import HomeAssistant
@@ -51,6 +52,7 @@ async def test_purge_old_states(
         events = session.query(Events).filter(Events.event_type == "state_changed")
         assert events.count() == 6
         assert "test.recorder2" in instance._old_states
+        assert "test.recorder2" in instance.last_state_ids
 
         purge_before = dt_util.utcnow() - timedelta(days=4)
 
@@ -75,6 +77,7 @@ async def test_purge_old_states(
         assert not finished
         assert states.count() == 0
         assert "test.recorder2" not in instance._old_states
+        assert "test.recorder2" not in instance.last_state_ids
 
     # Add some more states
     await _add_test_states(hass, instance)
@@ -91,6 +94,43 @@ async def test_purge_old_states(
         assert "test.recorder2" in instance._old_states
 
 
+async def test_purge_old_states_purges_unused_attributes(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test shared attributes are deleted once no state refers to them."""
+    instance = await async_setup_recorder_instance(hass)
+
+    utcnow = dt_util.utcnow()
+    five_days_ago = utcnow - timedelta(days=5)
+
+    for timestamp, state, attributes in (
+        (five_days_ago, "on", {"old_attr": 1}),
+        (five_days_ago, "off", {"shared_attr": 1}),
+        (utcnow, "on", {"shared_attr": 1}),
+    ):
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow", return_value=timestamp
+        ):
+            hass.states.async_set("test.recorder", state, attributes)
+            await hass.async_block_till_done()
+            await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States)
+        state_attributes = session.query(StateAttributes)
+        assert states.count() == 3
+        assert state_attributes.count() == 2
+        assert len(instance._state_attributes_ids) == 2
+
+        purge_before = dt_util.utcnow() - timedelta(days=4)
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert not finished
+        assert states.count() == 1
+        assert state_attributes.count() == 1
+        assert state_attributes.one().shared_attrs == '{"shared_attr":1}'
+        assert list(instance._state_attributes_ids) == ['{"shared_attr":1}']
+
+
 async def test_purge_old_states_encouters_database_corruption(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -487,6 +527,127 @@ async def test_purge_cutoff_date(
         assert events.filter(Events.event_type == "KEEP").count() == 1
 
 
+async def _add_old_events(hass: HomeAssistant, timestamp: datetime, rows: int) -> None:
+    """Add events which fired at timestamp."""
+    with recorder.session_scope(hass=hass) as session:
+        for _ in range(rows):
+            session.add(
+                Events(
+                    event_type="EVENT_TEST_PURGE",
+                    event_data="{}",
+                    origin="LOCAL",
+                    created=timestamp,
+                    time_fired=timestamp,
+                )
+            )
+
+
+async def test_purge_progress(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test purging in chunks continues after the last purged event id."""
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_purge_done(hass, instance)
+
+    five_days_ago = dt_util.utcnow() - timedelta(days=5)
+    rows = MAX_ROWS_TO_PURGE + 10
+    await _add_old_events(hass, five_days_ago, rows)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    progress = PurgeProgress(purge_before)
+    assert progress.events_left is None
+    assert progress.eta is None
+
+    assert not purge_old_data(instance, purge_before, False, progress=progress)
+    assert progress.events_purged == MAX_ROWS_TO_PURGE
+    assert progress.events_left == 10
+    assert progress.eta is not None
+
+    # Events added after the purge started are left for the next purge
+    await _add_old_events(hass, five_days_ago, 1)
+
+    assert not purge_old_data(instance, purge_before, False, progress=progress)
+    assert progress.events_purged == rows
+    assert progress.events_left == 0
+    assert purge_old_data(instance, purge_before, False, progress=progress)
+    assert progress.finished is not None
+
+    data = progress.as_dict()
+    assert data["events_purged"] == rows
+    assert data["events_left"] == 0
+    assert data["eta"] == 0
+
+    with session_scope(hass=hass) as session:
+        events = session.query(Events).filter(Events.event_type == "EVENT_TEST_PURGE")
+        assert events.count() == 1
+
+
+async def test_purge_task_time_budget(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test a purge task that runs out of time continues after the next commit."""
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_purge_done(hass, instance)
+
+    five_days_ago = dt_util.utcnow() - timedelta(days=5)
+    rows = MAX_ROWS_TO_PURGE + 10
+    await _add_old_events(hass, five_days_ago, rows)
+
+    instance.purge_time_budget = 0
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    instance.queue.put(PurgeTask(purge_before, repack=False, apply_filter=False))
+    await async_recorder_block_till_done(hass, instance)
+
+    # Only one chunk is purged until the next commit
+    assert instance.purge_progress.events_purged == MAX_ROWS_TO_PURGE
+    assert instance.purge_progress.finished is None
+
+    await async_wait_purge_done(hass, instance)
+    assert instance.purge_progress.events_purged == rows
+    assert instance.purge_progress.finished is not None
+
+    with session_scope(hass=hass) as session:
+        events = session.query(Events).filter(Events.event_type == "EVENT_TEST_PURGE")
+        assert events.count() == 0
+
+
+async def test_purge_task_merged_into_pending_purge(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test a new purge task continues a purge that ran out of time."""
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_purge_done(hass, instance)
+
+    five_days_ago = dt_util.utcnow() - timedelta(days=5)
+    three_days_ago = dt_util.utcnow() - timedelta(days=3)
+    rows = MAX_ROWS_TO_PURGE + 10
+    await _add_old_events(hass, five_days_ago, rows)
+    await _add_old_events(hass, three_days_ago, 5)
+
+    instance.purge_time_budget = 0
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    instance.queue.put(PurgeTask(purge_before, repack=False, apply_filter=False))
+    instance.queue.put(
+        PurgeTask(
+            dt_util.utcnow() - timedelta(days=2), repack=False, apply_filter=False
+        )
+    )
+    await async_recorder_block_till_done(hass, instance)
+
+    # The second purge took over the progress of the first one and also
+    # purges the events before its own purge_before
+    assert instance.purge_progress.events_purged == rows + 5
+    assert instance.purge_progress.finished is None
+
+    await async_wait_purge_done(hass, instance)
+    assert instance.purge_progress.events_purged == rows + 5
+    assert instance.purge_progress.finished is not None
+
+    with session_scope(hass=hass) as session:
+        events = session.query(Events).filter(Events.event_type == "EVENT_TEST_PURGE")
+        assert events.count() == 0
+
+
 async def test_purge_filtered_states(
     hass: HomeAssistant,
     async_setup_recorder_instance: SetupRecorderInstanceT,
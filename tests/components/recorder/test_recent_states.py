@@ -0,0 +1,166 @@
+"""The tests for the recent states kept in memory by the recorder."""
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.components.recorder import history
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.recent_states import RecentStates
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, State
+import homeassistant.util.dt as dt_util
+
+from tests.components.recorder.common import wait_recording_done
+
+
+def _state_changed(entity_id, state, time):
+    """Return a state changed event."""
+    new_state = None
+    if state is not None:
+        new_state = State(entity_id, state, last_changed=time, last_updated=time)
+    return Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": entity_id, "new_state": new_state},
+        time_fired=time,
+    )
+
+
+def test_recent_states_coverage():
+    """Test the recent states only answer queries they know all states for."""
+    start = dt_util.utcnow()
+    before_start = start - timedelta(hours=1)
+    recent_states = RecentStates(3600, 1024)
+
+    assert recent_states.get_rows("sensor.test", start) is None
+
+    with patch(
+        "homeassistant.components.recorder.recent_states.dt_util.utcnow",
+        return_value=start,
+    ):
+        recent_states.start(
+            [State("sensor.seeded", "1", last_updated=before_start - timedelta(1))]
+        )
+
+    # Entities without state changes did not change since the start
+    assert recent_states.get_rows("sensor.test", start) == []
+    assert recent_states.get_rows("sensor.test", before_start) is None
+    assert recent_states.get_state("sensor.test", start) is None
+
+    # The state of seeded entities is known since it was last updated
+    assert recent_states.get_rows("sensor.seeded", before_start) == []
+    assert recent_states.get_state("sensor.seeded", start).state == "1"
+
+    for idx in range(10):
+        recent_states.add_event(
+            _state_changed("sensor.test", str(idx), start + timedelta(seconds=idx))
+        )
+    rows = recent_states.get_rows(
+        "sensor.test", start, start + timedelta(seconds=5, microseconds=1)
+    )
+    assert [row.state for row in rows] == ["1", "2", "3", "4", "5"]
+    assert recent_states.get_state("sensor.test", start) is None
+    state = recent_states.get_state("sensor.test", start + timedelta(seconds=5))
+    assert state.state == "4"
+    assert state.last_updated == start + timedelta(seconds=4)
+
+    # States updated at the same time or when the clock went back are all kept
+    for state, seconds in (("a", 12), ("b", 12), ("c", 11)):
+        recent_states.add_event(
+            _state_changed("sensor.test", state, start + timedelta(seconds=seconds))
+        )
+    rows = recent_states.get_rows("sensor.test", start + timedelta(seconds=9))
+    assert [row.state for row in rows] == ["c", "a", "b"]
+
+    # Removed entities are read from the database again
+    recent_states.add_event(
+        _state_changed("sensor.test", None, start + timedelta(seconds=20))
+    )
+    assert recent_states.get_rows("sensor.test", start) is None
+    assert recent_states.get_state("sensor.test", start) is None
+
+
+def test_recent_states_trimmed():
+    """Test old and excess state changes are dropped."""
+    start = dt_util.utcnow()
+    recent_states = RecentStates(60, 20)
+    recent_states.start([])
+
+    for idx in range(100):
+        recent_states.add_event(
+            _state_changed("sensor.test", str(idx), start + timedelta(seconds=idx))
+        )
+
+    # The oldest state kept holds the state when the kept states start
+    assert recent_states.get_rows("sensor.test", start) is None
+    rows = recent_states.get_rows("sensor.test", start + timedelta(seconds=80))
+    assert [row.state for row in rows] == [str(idx) for idx in range(81, 100)]
+    assert recent_states.get_state(
+        "sensor.test", start + timedelta(seconds=80, microseconds=1)
+    ).state == ("80")
+
+    # Enough states are kept to know the last 20 states
+    states = recent_states.get_last_states("sensor.test", None, 20)
+    assert [state.state for state in states] == [str(idx) for idx in range(80, 100)]
+    assert recent_states.get_last_states("sensor.test", None, 21) is None
+    states = recent_states.get_last_states(
+        "sensor.test", start + timedelta(seconds=95), 1000
+    )
+    assert [state.state for state in states] == ["95", "96", "97", "98", "99"]
+
+    for idx in range(200, 300):
+        recent_states.add_event(
+            _state_changed("sensor.test", str(idx), start + timedelta(seconds=idx))
+        )
+    rows = recent_states.get_rows("sensor.test", start + timedelta(seconds=280))
+    assert len(rows) == 19
+    assert len(recent_states._entities["sensor.test"].states) < 50
+
+
+def test_history_read_from_recent_states(hass_recorder):
+    """Test recent history is read from memory."""
+    hass = hass_recorder()
+    hass.states.set("sensor.test", "0", {"unit_of_measurement": "W"})
+    wait_recording_done(hass)
+    start = dt_util.utcnow()
+    hass.states.set("sensor.test", "1", {"unit_of_measurement": "W"})
+    hass.states.set("sensor.test", "1", {"unit_of_measurement": "kW"})
+    hass.states.set("sensor.test", "2", {"unit_of_measurement": "kW"})
+    wait_recording_done(hass)
+    end = dt_util.utcnow()
+
+    hist = history.get_significant_states(hass, start, entity_ids=["sensor.test"])
+    state_changes = history.state_changes_during_period(
+        hass, start, entity_id="sensor.test"
+    )
+
+    with patch(
+        "homeassistant.components.recorder.history.execute",
+        side_effect=AssertionError,
+    ):
+        recent_hist = history.get_significant_states(
+            hass, start, entity_ids=["sensor.test"]
+        )
+        assert [state.as_dict() for state in recent_hist["sensor.test"]] == [
+            state.as_dict() for state in hist["sensor.test"]
+        ]
+        assert (
+            history.state_changes_during_period(hass, start, entity_id="sensor.test")
+            == state_changes
+        )
+        assert history.get_state(hass, end, "sensor.test") == hass.states.get(
+            "sensor.test"
+        )
+        hist = history.get_significant_states(
+            hass,
+            start,
+            entity_ids=["sensor.test"],
+            significant_changes_only=False,
+        )
+
+    assert [state.state for state in hist["sensor.test"]] == ["0", "1", "1", "2"]
+    assert hist["sensor.test"][2].attributes == {"unit_of_measurement": "kW"}
+    assert (
+        hass.data[DATA_INSTANCE].recent_states.get_rows(
+            "sensor.test", start - timedelta(days=1)
+        )
+        is None
+    )
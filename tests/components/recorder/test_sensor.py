@@ -0,0 +1,60 @@
+"""The tests for the recorder queue sensors."""
+from datetime import timedelta
+
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.common import async_fire_time_changed, async_init_recorder_component
+
+
+async def test_queue_sensors_disabled_by_default(hass):
+    """Test the queue sensors are registered but disabled."""
+    await async_init_recorder_component(hass)
+    assert await async_setup_component(hass, "sensor", {})
+    await hass.async_block_till_done()
+
+    registry = er.async_get(hass)
+    for entity_id in ("sensor.recorder_queue_depth", "sensor.recorder_queue_latency"):
+        entry = registry.async_get(entity_id)
+        assert entry.disabled_by == er.RegistryEntryDisabler.INTEGRATION
+        assert hass.states.get(entity_id) is None
+
+
+async def test_queue_sensors_need_sensor_integration(hass):
+    """Test the queue sensors are only added when sensors are set up."""
+    await async_init_recorder_component(hass)
+    await hass.async_block_till_done()
+
+    assert "sensor" not in hass.config.components
+    assert er.async_get(hass).async_get("sensor.recorder_queue_depth") is None
+
+
+async def test_queue_sensors(hass):
+    """Test the queue sensors report the recorder queue."""
+    registry = er.async_get(hass)
+    for unique_id in ("recorder_queue_depth", "recorder_queue_latency"):
+        registry.async_get_or_create(
+            "sensor", "recorder", unique_id, suggested_object_id=unique_id
+        )
+
+    await async_init_recorder_component(hass)
+    assert await async_setup_component(hass, "sensor", {})
+    await hass.async_block_till_done()
+    instance = hass.data[DATA_INSTANCE]
+    await async_wait_recording_done(hass, instance)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=1))
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.recorder_queue_depth")
+    assert state.state.isdigit()
+    assert state.attributes["max_backlog"] == 30000
+    assert state.attributes["dropped"] == 0
+
+    state = hass.states.get("sensor.recorder_queue_latency")
+    assert state.attributes["unit_of_measurement"] == "ms"
+    assert int(state.state) >= 0
@@ -4,11 +4,12 @@ from datetime import timedelta
 import importlib
 import json
 import sys
-from unittest.mock import patch, sentinel
+from unittest.mock import MagicMock, patch, sentinel
 
 import pytest
 from pytest import approx
 from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
 from homeassistant.components import recorder
@@ -224,6 +225,54 @@ def test_compile_periodic_statistics_exception(
     }
 
 
+def test_compile_statistics_retries_database_errors(hass_recorder, caplog):
+    """Test compiling statistics is retried after a retryable database error."""
+    hass = hass_recorder()
+    recorder = hass.data[DATA_INSTANCE]
+    setup_component(hass, "sensor", {})
+    wait_recording_done(hass)
+
+    mysql_exception = OperationalError("statement", {}, [])
+    mysql_exception.orig = MagicMock(args=(1205, "retryable"))
+    permanent_exception = OperationalError("statement", {}, [])
+    permanent_exception.orig = MagicMock(args=(1146, "permanent"))
+    now = dt_util.utcnow()
+
+    with patch(
+        "homeassistant.components.sensor.recorder.compile_statistics",
+        side_effect=[mysql_exception, permanent_exception, []],
+    ), patch("homeassistant.components.recorder.util.time.sleep"), patch.object(
+        recorder.engine.dialect, "name", "mysql"
+    ):
+        # Retryable error, the job is rescheduled
+        assert statistics.compile_statistics(recorder, now) is False
+        assert "statistics not completed, retrying" in caplog.text
+
+        # Permanent error, the job is not rescheduled
+        assert statistics.compile_statistics(recorder, now) is True
+        assert "Error executing statistics" in caplog.text
+
+        assert statistics.compile_statistics(recorder, now) is True
+
+
+def test_record_state_change_exception(hass_recorder, caplog):
+    """Test a platform failing to accumulate statistics does not lose the state."""
+    hass = hass_recorder()
+    setup_component(hass, "sensor", {})
+    wait_recording_done(hass)
+
+    with patch(
+        "homeassistant.components.sensor.recorder.record_state_change",
+        side_effect=KeyError("state_class"),
+    ):
+        hass.states.set("sensor.test1", "10")
+        wait_recording_done(hass)
+
+    assert "Error accumulating the statistics of sensor.test1" in caplog.text
+    states = history.get_last_state_changes(hass, 1, "sensor.test1")
+    assert [state.state for state in states["sensor.test1"]] == ["10"]
+
+
 def test_rename_entity(hass_recorder):
     """Test statistics is migrated when entity_id is changed."""
     hass = hass_recorder()
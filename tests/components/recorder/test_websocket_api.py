@@ -264,12 +264,35 @@ async def test_recorder_info(hass, hass_ws_client):
     assert response["result"] == {
         "backlog": 0,
         "max_backlog": 30000,
+        "spilled_backlog": 0,
         "migration_in_progress": False,
         "recording": True,
         "thread_running": True,
+        "purge": None,
     }
 
 
+async def test_recorder_info_purge_progress(hass, hass_ws_client):
+    """Test getting the progress of the last purge."""
+    client = await hass_ws_client()
+    await async_init_recorder_component(hass)
+    await async_wait_recording_done_without_instance(hass)
+
+    await hass.services.async_call(
+        recorder.DOMAIN, recorder.SERVICE_PURGE, {"keep_days": 0}
+    )
+    await hass.async_block_till_done()
+    await async_wait_recording_done_without_instance(hass)
+
+    await client.send_json({"id": 1, "type": "recorder/info"})
+    response = await client.receive_json()
+    assert response["success"]
+    purge = response["result"]["purge"]
+    assert purge["finished"] is not None
+    assert purge["events_left"] == 0
+    assert purge["eta"] == 0
+
+
 async def test_recorder_info_no_recorder(hass, hass_ws_client):
     """Test getting recorder status when recorder is not present."""
     client = await hass_ws_client()
@@ -303,7 +326,7 @@ async def test_recorder_info_bad_recorder_config(hass, hass_ws_client):
     assert response["result"]["thread_running"] is False
 
 
-async def test_recorder_info_migration_queue_exhausted(hass, hass_ws_client):
+async def test_recorder_info_migration_queue_exhausted(hass, hass_ws_client, tmp_path):
     """Test getting recorder status when recorder queue is exhausted."""
     assert recorder.util.async_migration_in_progress(hass) is False
 
@@ -323,6 +346,8 @@ async def test_recorder_info_migration_queue_exhausted(hass, hass_ws_client):
         "homeassistant.components.recorder.create_engine", new=create_engine_test
     ), patch.object(
         recorder, "MAX_QUEUE_BACKLOG", 1
+    ), patch.object(
+        recorder, "QUEUE_SPILL_FILE", str(tmp_path / "spill")
     ), patch(
         "homeassistant.components.recorder.migration.migrate_schema",
         wraps=stalled_migration,
@@ -343,8 +368,9 @@ async def test_recorder_info_migration_queue_exhausted(hass, hass_ws_client):
         await client.send_json({"id": 1, "type": "recorder/info"})
         response = await client.receive_json()
         assert response["success"]
+        assert response["result"]["spilled_backlog"] > 0
         assert response["result"]["migration_in_progress"] is True
-        assert response["result"]["recording"] is False
+        assert response["result"]["recording"] is True
         assert response["result"]["thread_running"] is True
 
     # Let migration finish
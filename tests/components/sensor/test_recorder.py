@@ -3,13 +3,14 @@
 from datetime import timedelta
 import math
 from statistics import mean
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 from pytest import approx
+from sqlalchemy.exc import OperationalError
 
 from homeassistant import loader
-from homeassistant.components.recorder import history
+from homeassistant.components.recorder import history, statistics
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import (
     StatisticsMeta,
@@ -21,6 +22,10 @@ from homeassistant.components.recorder.statistics import (
     statistics_during_period,
 )
 from homeassistant.components.recorder.util import session_scope
+from homeassistant.components.sensor.recorder import (
+    DATA_ACCUMULATOR,
+    compile_statistics,
+)
 from homeassistant.const import STATE_UNAVAILABLE
 from homeassistant.setup import setup_component
 import homeassistant.util.dt as dt_util
@@ -3262,3 +3267,178 @@ def record_states_partially_unavailable(hass, zero, entity_id, attributes):
         )
 
     return four, states
+
+
+@pytest.mark.parametrize(
+    "attributes",
+    [
+        POWER_SENSOR_ATTRIBUTES,
+        TEMPERATURE_SENSOR_ATTRIBUTES,
+        NONE_SENSOR_ATTRIBUTES,
+        ENERGY_SENSOR_ATTRIBUTES,
+        {**ENERGY_SENSOR_ATTRIBUTES, "state_class": "total_increasing"},
+    ],
+)
+def test_compile_statistics_accumulated(hass_recorder, attributes):
+    """Test statistics accumulated while recording match the recorded history."""
+    period0 = dt_util.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(
+        hours=1
+    )
+    period0_end = period0 + timedelta(minutes=5)
+    hass = hass_recorder()
+    setup_component(hass, "sensor", {})
+
+    def set_state(time, state, **extra):
+        """Set the state at a point in time."""
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow", return_value=time
+        ):
+            hass.states.set("sensor.test1", state, attributes={**attributes, **extra})
+        wait_recording_done(hass)
+
+    # The accumulator starts with the period after its first state change
+    set_state(period0 - timedelta(minutes=4), "10")
+    set_state(period0 + timedelta(seconds=30), "12")
+    set_state(period0 + timedelta(minutes=1), "12", extra="attribute")
+    set_state(period0 + timedelta(minutes=2), STATE_UNAVAILABLE)
+    set_state(period0 + timedelta(minutes=3), "11")
+    set_state(period0 + timedelta(minutes=4), "15")
+    # Recorded before the period is compiled
+    set_state(period0_end + timedelta(seconds=30), "20")
+
+    accumulator = hass.data[DATA_ACCUMULATOR]
+    assert accumulator.since == period0
+    with patch.object(
+        history, "get_significant_states_with_session"
+    ) as get_significant_states:
+        accumulated = compile_statistics(hass, period0, period0_end)
+    get_significant_states.assert_not_called()
+
+    del hass.data[DATA_ACCUMULATOR]
+    assert compile_statistics(hass, period0, period0_end) == accumulated
+    assert accumulated[0]["meta"]["statistic_id"] == "sensor.test1"
+
+
+def test_compile_statistics_accumulated_sum(hass_recorder):
+    """Test the sum of accumulated statistics continues from the last period."""
+    period0 = dt_util.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(
+        hours=1
+    )
+    period1 = period0 + timedelta(minutes=5)
+    hass = hass_recorder()
+    recorder = hass.data[DATA_INSTANCE]
+    setup_component(hass, "sensor", {})
+    attributes = {**ENERGY_SENSOR_ATTRIBUTES, "state_class": "total_increasing"}
+
+    def set_state(time, state):
+        """Set the state at a point in time."""
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow", return_value=time
+        ):
+            hass.states.set("sensor.test1", state, attributes=attributes)
+        wait_recording_done(hass)
+
+    set_state(period0 - timedelta(minutes=4), "10")
+    set_state(period0 + timedelta(minutes=1), "12")
+    set_state(period0 + timedelta(minutes=2), "15")
+    set_state(period1 + timedelta(minutes=1), "5")
+    set_state(period1 + timedelta(minutes=2), "8")
+
+    recorder.do_adhoc_statistics(start=period0)
+    wait_recording_done(hass)
+    with patch(
+        "homeassistant.components.sensor.recorder.statistics.get_last_short_term_statistics"
+    ) as get_last_short_term_statistics:
+        recorder.do_adhoc_statistics(start=period1)
+        wait_recording_done(hass)
+    get_last_short_term_statistics.assert_not_called()
+
+    stats = statistics_during_period(hass, period0, period="5minute")
+    assert [(stat["state"], stat["sum"]) for stat in stats["sensor.test1"]] == [
+        (approx(15.0), approx(5.0)),
+        (approx(8.0), approx(13.0)),
+    ]
+
+
+def test_compile_statistics_accumulated_retried(hass_recorder):
+    """Test accumulated statistics are kept when compiling them is retried."""
+    period0 = dt_util.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(
+        hours=1
+    )
+    hass = hass_recorder()
+    recorder = hass.data[DATA_INSTANCE]
+    setup_component(hass, "sensor", {})
+
+    def set_state(time, state):
+        """Set the state at a point in time."""
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow", return_value=time
+        ):
+            hass.states.set("sensor.test1", state, attributes=POWER_SENSOR_ATTRIBUTES)
+        wait_recording_done(hass)
+
+    set_state(period0 - timedelta(minutes=4), "10")
+    set_state(period0 + timedelta(minutes=1), "30")
+    set_state(period0 + timedelta(minutes=4), "20")
+
+    mysql_exception = OperationalError("statement", {}, [])
+    mysql_exception.orig = MagicMock(args=(1205, "retryable"))
+    with patch(
+        "homeassistant.components.recorder.statistics._insert_statistics",
+        side_effect=mysql_exception,
+    ), patch("homeassistant.components.recorder.util.time.sleep"), patch.object(
+        recorder.engine.dialect, "name", "mysql"
+    ):
+        assert statistics.compile_statistics(recorder, period0) is False
+
+    with patch.object(
+        history, "get_significant_states_with_session"
+    ) as get_significant_states:
+        assert statistics.compile_statistics(recorder, period0) is True
+    get_significant_states.assert_not_called()
+
+    stats = statistics_during_period(hass, period0, period="5minute")
+    assert stats["sensor.test1"][0]["mean"] == approx(24000.0)
+    assert stats["sensor.test1"][0]["min"] == approx(10000.0)
+    assert stats["sensor.test1"][0]["max"] == approx(30000.0)
+
+
+def test_compile_statistics_accumulated_state_class_removed(hass_recorder):
+    """Test a sensor which drops its state class is still recorded."""
+    period0 = dt_util.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(
+        hours=1
+    )
+    period1 = period0 + timedelta(minutes=5)
+    hass = hass_recorder()
+    recorder = hass.data[DATA_INSTANCE]
+    setup_component(hass, "sensor", {})
+    attributes = {
+        key: value
+        for key, value in POWER_SENSOR_ATTRIBUTES.items()
+        if key != "state_class"
+    }
+
+    def set_state(time, state, attributes):
+        """Set the state at a point in time."""
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow", return_value=time
+        ):
+            hass.states.set("sensor.test1", state, attributes=attributes)
+        wait_recording_done(hass)
+
+    set_state(period0 - timedelta(minutes=4), "10", POWER_SENSOR_ATTRIBUTES)
+    set_state(period0 + timedelta(minutes=1), "30", POWER_SENSOR_ATTRIBUTES)
+    # The first state of the next period has no state class
+    set_state(period1 + timedelta(minutes=1), "20", attributes)
+    set_state(period1 + timedelta(minutes=2), "25", attributes)
+
+    hist = history.get_significant_states(
+        hass, period0 - timedelta(minutes=5), period1 + timedelta(minutes=5)
+    )
+    assert [state.state for state in hist["sensor.test1"]] == ["10", "30", "20", "25"]
+    assert not hass.data[DATA_ACCUMULATOR].sensors["sensor.test1"].valid
+
+    # The sensor no longer has statistics
+    recorder.do_adhoc_statistics(start=period0)
+    wait_recording_done(hass)
+    assert statistics_during_period(hass, period0, period="5minute") == {}
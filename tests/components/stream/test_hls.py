@@ -426,6 +426,34 @@ async def test_hls_playlist_view_discontinuity(hass, hls_stream, stream_worker_s
     stream.stop()
 
 
+async def test_hls_segment_view(hass, hls_stream, stream_worker_sync):
+    """Test a segment is served with the data of all its parts so far."""
+    await async_setup_component(hass, "stream", {"stream": {}})
+
+    stream = create_stream(hass, STREAM_SOURCE, {})
+    stream_worker_sync.pause()
+    hls = stream.add_provider(HLS_PROVIDER)
+
+    hls_client = await hls_stream(stream)
+
+    segment = Segment(sequence=0)
+    hls.put(segment)
+    for data in (b"first", b"second"):
+        segment.async_add_part(
+            Part(duration=SEGMENT_DURATION / 2, has_keyframe=True, data=data), 0
+        )
+    await hass.async_block_till_done()
+
+    segment_response = await hls_client.get("/segment/0.m4s")
+    assert segment_response.status == HTTPStatus.OK
+    assert segment_response.headers["Content-Type"] == "video/iso.segment"
+    assert segment_response.content_length == len(b"firstsecond")
+    assert await segment_response.read() == b"firstsecond"
+
+    stream_worker_sync.resume()
+    stream.stop()
+
+
 async def test_hls_max_segments_discontinuity(hass, hls_stream, stream_worker_sync):
     """Test a discontinuity with more segments than the segment deque can hold."""
     await async_setup_component(hass, "stream", {"stream": {}})
@@ -18,8 +18,10 @@ from homeassistant.core import Context, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import DATA_SETUP_TIME, async_setup_component
+import homeassistant.util.dt as dt_util
 
 from tests.common import MockEntity, MockEntityPlatform, async_mock_service
 
@@ -659,6 +661,144 @@ async def test_subscribe_unsubscribe_events_state_changed(
     assert msg["event"]["data"]["entity_id"] == "light.permitted"
 
 
+async def test_subscribe_entities(hass, websocket_client, hass_admin_user):
+    """Test subscribe entities sends the states and then only what changed."""
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy(
+        {"entities": {"entity_ids": {"light.permitted": True, "light.new": True}}}
+    )
+    hass.states.async_set("light.permitted", "off", {"color": "red", "size": 1})
+    hass.states.async_set("light.not_permitted", "off")
+    state = hass.states.get("light.permitted")
+    context = Context(user_id="user")
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {
+            "light.permitted": {
+                "s": "off",
+                "a": {"color": "red", "size": 1},
+                "c": state.context.id,
+                "lc": state.last_changed.timestamp(),
+            }
+        }
+    }
+
+    hass.states.async_set("light.not_permitted", "on")
+    hass.states.async_set(
+        "light.permitted", "on", {"color": "blue", "size": 1}, context=context
+    )
+    state = hass.states.get("light.permitted")
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "s": "on",
+                    "a": {"color": "blue"},
+                    "c": {"id": context.id, "parent_id": None, "user_id": "user"},
+                    "lc": state.last_changed.timestamp(),
+                }
+            }
+        }
+    }
+
+    hass.states.async_set("light.permitted", "on", {"color": "blue"}, context=context)
+    state = hass.states.get("light.permitted")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {"lu": state.last_updated.timestamp()},
+                "-": {"a": ["size"]},
+            }
+        }
+    }
+
+    hass.states.async_set("light.new", "on")
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["light.new"]
+
+    hass.states.async_remove("light.permitted")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"r": ["light.permitted"]}
+
+
+async def test_subscribe_entities_batch(hass, websocket_client):
+    """Test subscribe entities sends a batch of state changes in one message."""
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.hall", "off")
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert set(msg["event"]["a"]) == {"light.kitchen", "light.hall"}
+
+    with hass.states.async_batch():
+        hass.states.async_set("light.kitchen", "on")
+        hass.states.async_remove("light.hall")
+        hass.states.async_set("light.new", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["event"]["c"]["light.kitchen"]["+"]["s"] == "on"
+    assert msg["event"]["r"] == ["light.hall"]
+    assert list(msg["event"]["a"]) == ["light.new"]
+
+    # An entity changing twice in a batch gets a message per change
+    with hass.states.async_batch():
+        hass.states.async_set("light.kitchen", "off")
+        hass.states.async_set("light.kitchen", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["c"]["light.kitchen"]["+"]["s"] == "off"
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["c"]["light.kitchen"]["+"]["s"] == "on"
+
+
+async def test_subscribe_entities_with_entity_ids(hass, websocket_client):
+    """Test subscribe entities only sends the requested entities."""
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.hall", "off")
+
+    await websocket_client.send_json(
+        {"id": 7, "type": "subscribe_entities", "entity_ids": ["light.kitchen"]}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["light.kitchen"]
+
+    hass.states.async_set("light.hall", "on")
+    hass.states.async_set("light.kitchen", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["c"]["light.kitchen"]["+"]["s"] == "on"
+
+    await websocket_client.send_json(
+        {"id": 8, "type": "unsubscribe_events", "subscription": 7}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+    assert msg["success"]
+
+    hass.states.async_set("light.kitchen", "off")
+    await websocket_client.send_json({"id": 9, "type": "ping"})
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 9
+    assert msg["type"] == "pong"
+
+
 async def test_render_template_renders_template(hass, websocket_client):
     """Test simple template is rendered and updated."""
     hass.states.async_set("light.test", "on")
@@ -706,6 +846,97 @@ async def test_render_template_renders_template(hass, websocket_client):
     }
 
 
+async def test_template_render_stats(hass, websocket_client, hass_admin_user):
+    """Test the render statistics of tracked templates."""
+    hass.states.async_set("light.test", "on")
+    await websocket_client.send_json(
+        {"id": 5, "type": "render_template", "template": "{{ states('light.test') }}"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["result"] == "on"
+
+    hass.states.async_set("light.test", "off")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["result"] == "off"
+
+    await websocket_client.send_json({"id": 6, "type": "template/render_stats"})
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["success"]
+    assert msg["result"]["state_changes"] == 1
+    templates = msg["result"]["templates"]
+    assert len(templates) == 1
+    assert templates[0]["template"] == "{{ states('light.test') }}"
+    # Rendered to set up the tracking, by the refresh and by the state change
+    assert templates[0]["renders"] == 3
+    assert templates[0]["total_time"] >= templates[0]["max_time"] > 0
+    assert templates[0]["listeners"]["entities"] == ["light.test"]
+
+    hass_admin_user.groups = []
+    await websocket_client.send_json({"id": 7, "type": "template/render_stats"})
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
+
+
+async def test_time_scheduler_stats(hass, websocket_client, hass_admin_user):
+    """Test the statistics of the time scheduler."""
+    async_track_point_in_utc_time(
+        hass, callback(lambda _: None), dt_util.utcnow() + datetime.timedelta(hours=1)
+    )
+    await websocket_client.send_json({"id": 5, "type": "time_scheduler/stats"})
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["success"]
+    assert msg["result"]["scheduled_jobs"] >= 1
+    assert msg["result"]["points_in_time"] >= 1
+
+    hass_admin_user.groups = []
+    await websocket_client.send_json({"id": 6, "type": "time_scheduler/stats"})
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
+
+
+async def test_entity_write_stats(hass, websocket_client, hass_admin_user):
+    """Test enabling, reading and disabling the entity write statistics."""
+    platform = MockEntityPlatform(hass)
+    ent = MockEntity(name="Test", state="on")
+    await platform.async_add_entities([ent])
+
+    await websocket_client.send_json({"id": 5, "type": "entity/write_stats"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"] is None
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "entity/write_stats", "enable": True}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["result"]["entities"] == []
+
+    ent.async_write_ha_state()
+    await websocket_client.send_json(
+        {"id": 7, "type": "entity/write_stats", "enable": False}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["result"]["entities"][0]["entity_id"] == "test_domain.test"
+    assert msg["result"]["entities"][0]["noop_writes"] == 1
+    assert msg["result"]["integrations"][0]["integration"] == "test_platform"
+
+    await websocket_client.send_json({"id": 8, "type": "entity/write_stats"})
+    msg = await websocket_client.receive_json()
+    assert msg["result"] is None
+
+    hass_admin_user.groups = []
+    await websocket_client.send_json({"id": 9, "type": "entity/write_stats"})
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
+
+
 async def test_render_template_manual_entity_ids_no_longer_needed(
     hass, websocket_client
 ):
@@ -7,6 +7,7 @@ from aiohttp import ServerDisconnectedError, WSMsgType, web
 import pytest
 
 from homeassistant.components.websocket_api import const, http
+from homeassistant.setup import async_setup_component
 from homeassistant.util.dt import utcnow
 
 from tests.common import async_fire_time_changed
@@ -92,3 +93,74 @@ async def test_prepare_fail(hass, hass_ws_client, caplog):
         await hass_ws_client(hass)
 
     assert "Timeout preparing request" in caplog.text
+
+
+async def test_coalesce_messages(hass, no_auth_websocket_client, hass_access_token):
+    """Test queued messages are sent as one frame if the client supports it."""
+    await no_auth_websocket_client.send_json(
+        {
+            "type": "auth",
+            "access_token": hass_access_token,
+            "supported_features": {const.FEATURE_COALESCE_MESSAGES: 1},
+        }
+    )
+    auth_msg = await no_auth_websocket_client.receive_json()
+    assert auth_msg["type"] == "auth_ok"
+
+    await no_auth_websocket_client.send_json(
+        {"id": 1, "type": "subscribe_events", "event_type": "state_changed"}
+    )
+    msg = await no_auth_websocket_client.receive_json()
+    assert msg["id"] == 1
+    assert msg["success"]
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+
+    msgs = await no_auth_websocket_client.receive_json()
+    assert isinstance(msgs, list)
+    assert [msg["event"]["data"]["new_state"]["state"] for msg in msgs] == [
+        "on",
+        "off",
+        "on",
+    ]
+
+    await no_auth_websocket_client.send_json({"id": 2, "type": "ping"})
+    msg = await no_auth_websocket_client.receive_json()
+    assert msg == {"id": 2, "type": "pong"}
+
+
+async def test_messages_not_coalesced_by_default(hass, websocket_client):
+    """Test queued messages are sent one per frame by default."""
+    await websocket_client.send_json(
+        {"id": 1, "type": "subscribe_events", "event_type": "state_changed"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.kitchen", "off")
+    await hass.async_block_till_done()
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["data"]["new_state"]["state"] == "on"
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["data"]["new_state"]["state"] == "off"
+
+
+async def test_compression_negotiated(hass, hass_client_no_auth):
+    """Test per message compression is negotiated with the client."""
+    assert await async_setup_component(hass, "websocket_api", {})
+    client = await hass_client_no_auth()
+
+    async with client.ws_connect(const.URL, compress=15) as wsock:
+        assert wsock.compress == 15
+        msg = await wsock.receive_json()
+        assert msg["type"] == "auth_required"
+
+    async with client.ws_connect(const.URL, compress=0) as wsock:
+        assert wsock.compress == 0
+        msg = await wsock.receive_json()
+        assert msg["type"] == "auth_required"
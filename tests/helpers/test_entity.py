@@ -729,6 +729,58 @@ async def test_setup_source(hass):
     assert entity.entity_sources(hass) == {}
 
 
+async def test_write_stats(hass):
+    """Test the state writes of entities are aggregated while enabled."""
+    platform = MockEntityPlatform(hass)
+    platform.config_entry = MockConfigEntry()
+    ent = MockEntity(name="Test", state="on", capability_attributes={"a": 1})
+    await platform.async_add_entities([ent])
+
+    assert entity.async_get_write_stats(hass) is None
+    entity.async_enable_write_stats(hass)
+
+    ent.async_write_ha_state()
+    ent.async_write_ha_state()
+    ent._values["state"] = "off"
+    ent.async_write_ha_state()
+
+    stats = entity.async_get_write_stats(hass)
+    assert stats["integrations"] == [
+        {
+            "integration": "test_platform",
+            "entities": 1,
+            "writes": 3,
+            "noop_writes": 2,
+            "total_time": stats["entities"][0]["total_time"],
+            "max_time": stats["entities"][0]["max_time"],
+        }
+    ]
+    assert stats["entities"] == [
+        {
+            "entity_id": "test_domain.test",
+            "integration": "test_platform",
+            "writes": 3,
+            "noop_writes": 2,
+            "total_time": stats["entities"][0]["total_time"],
+            "max_time": stats["entities"][0]["max_time"],
+            "attributes": 2,
+            "attributes_size": len('{"a":1,"friendly_name":"Test"}'),
+            "max_attributes_size": len('{"a":1,"friendly_name":"Test"}'),
+        }
+    ]
+    assert entity.async_get_write_stats(hass, "other")["entities"] == []
+    assert entity.async_get_write_stats(hass, platform.config_entry.entry_id) == stats
+
+    # A forced update is not a no-op
+    ent._attr_force_update = True
+    ent.async_write_ha_state()
+    assert entity.async_get_write_stats(hass)["entities"][0]["noop_writes"] == 2
+
+    entity.async_disable_write_stats(hass)
+    ent.async_write_ha_state()
+    assert entity.async_get_write_stats(hass) is None
+
+
 async def test_removing_entity_unavailable(hass):
     """Test removing an entity that is still registered creates an unavailable state."""
     entry = entity_registry.RegistryEntry(
@@ -20,6 +20,7 @@ from homeassistant.helpers.event import (
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_get_template_render_queue,
     async_track_point_in_time,
     async_track_point_in_utc_time,
     async_track_same_state,
@@ -1851,6 +1852,56 @@ async def test_track_template_result_with_wildcard(hass):
     assert "cover.office_skylight=open" in specific_runs[0]
 
 
+async def test_track_template_result_coalesces_state_changes(hass):
+    """Test state changes fired together render each template once."""
+    runs = []
+    template_entities = Template(
+        "{{ states('sensor.one') }}-{{ states('sensor.two') }}", hass
+    )
+    template_all = Template("{{ states | count }}", hass)
+
+    def run_callback(event, updates):
+        runs.append(
+            (
+                event.data["entity_id"],
+                {update.template: update.result for update in updates},
+            )
+        )
+
+    info = async_track_template_result(
+        hass,
+        [TrackTemplate(template_entities, None), TrackTemplate(template_all, None)],
+        run_callback,
+    )
+    await hass.async_block_till_done()
+    assert info.render_stats[template_entities].renders == 1
+    assert info.render_stats[template_all].renders == 1
+
+    for value in range(5):
+        hass.states.async_set("sensor.one", value)
+        hass.states.async_set("sensor.two", value)
+    hass.states.async_set("sensor.three", "on")
+    await hass.async_block_till_done()
+
+    # The first state change renders right away, the others once more together
+    assert runs == [("sensor.one", {template_entities: "4-4", template_all: 3})]
+    assert info.render_stats[template_entities].renders == 3
+    assert info.render_stats[template_all].renders == 3
+
+    stats = async_get_template_render_queue(hass).async_stats()
+    assert stats["state_changes"] == 11
+    assert stats["coalesced_state_changes"] == 10
+    assert [template["renders"] for template in stats["templates"]] == [3, 3]
+
+    hass.states.async_set("sensor.two", "off")
+    await hass.async_block_till_done()
+    assert runs[-1] == ("sensor.two", {template_entities: "4-off"})
+    assert info.render_stats[template_entities].renders == 4
+
+    info.async_remove()
+    assert async_get_template_render_queue(hass).async_stats()["templates"] == []
+
+
 async def test_track_template_result_with_group(hass):
     """Test tracking template with a group."""
     hass.states.async_set("sensor.power_1", 0)
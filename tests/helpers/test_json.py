@@ -1,10 +1,19 @@
 """Test Home Assistant remote methods and classes."""
 import datetime
+import json
 
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import ExtendedJSONEncoder, JSONEncoder
+from homeassistant.helpers import json as json_helper
+from homeassistant.helpers.json import (
+    ExtendedJSONEncoder,
+    JSONEncoder,
+    json_bytes,
+    json_dumps,
+    json_dumps_allow_nan,
+    json_dumps_indent,
+)
 from homeassistant.util import dt as dt_util
 
 
@@ -64,3 +73,94 @@ def test_extended_json_encoder(hass):
     # Default method falls back to repr(o)
     o = object()
     assert ha_json_enc.default(o) == {"__type": str(type(o)), "repr": repr(o)}
+
+
+@pytest.mark.parametrize(
+    "dumps",
+    (
+        json_dumps,
+        json_helper._python_json_dumps,
+        lambda obj: json_bytes(obj).decode("utf-8"),
+        lambda obj: json_helper._python_json_bytes(obj).decode("utf-8"),
+    ),
+)
+def test_json_dumps(hass, dumps):
+    """Test the encoders produce the same compact JSON."""
+    now = dt_util.utcnow()
+    state = core.State("test.test", "hello", {"friendly_name": "Test"})
+    data = {
+        "state": state,
+        "set": {"milk"},
+        "time": now,
+        "tuple": (1, 2),
+        "big": 2 ** 70,
+        1: "int key",
+    }
+    assert json.loads(dumps(data)) == {
+        "state": json.loads(json.dumps(state, cls=JSONEncoder)),
+        "set": ["milk"],
+        "time": now.isoformat(),
+        "tuple": [1, 2],
+        "big": 2 ** 70,
+        "1": "int key",
+    }
+    assert dumps({"a": [1, "b"]}) == '{"a":[1,"b"]}'
+
+    with pytest.raises(TypeError):
+        dumps({"bad": object()})
+
+
+@pytest.mark.parametrize(
+    "dumps",
+    (json_dumps, json_helper._python_json_dumps, json_helper._native_json_dumps),
+)
+def test_json_dumps_not_allows_nan(hass, dumps):
+    """Test the encoders refuse NaN and infinity."""
+    for value in (float("nan"), float("inf"), float("-inf")):
+        with pytest.raises(ValueError):
+            dumps({"a": [value]})
+    with pytest.raises(ValueError):
+        dumps([core.State("test.test", "on", {"a": {"b": (float("nan"),)}})])
+    with pytest.raises(ValueError):
+        dumps({"a": None, "b": {float("inf")}})
+    assert dumps({"a": None}) == '{"a":null}'
+
+
+@pytest.mark.parametrize(
+    "dumps",
+    (
+        json_dumps_allow_nan,
+        json_helper._python_json_dumps_allow_nan,
+        json_helper._native_json_dumps_allow_nan,
+    ),
+)
+def test_json_dumps_allow_nan(hass, dumps):
+    """Test the encoders write NaN and infinity like the standard library."""
+    data = {"a": [float("nan"), float("inf"), None], "time": dt_util.utcnow()}
+    assert dumps(data) == json.dumps(data, cls=JSONEncoder, separators=(",", ":"))
+    assert dumps({"a": None}) == '{"a":null}'
+
+
+@pytest.mark.parametrize(
+    "dumps",
+    (
+        json_dumps_indent,
+        lambda obj, **kwargs: json_helper._python_json_dumps_indent(
+            obj, kwargs.get("indent", 4), kwargs.get("encoder")
+        ),
+        lambda obj, **kwargs: json_helper._native_json_dumps_indent(
+            obj, kwargs.get("indent", 4), kwargs.get("encoder")
+        ),
+    ),
+)
+def test_json_dumps_indent(hass, dumps):
+    """Test the encoders produce the same indented JSON."""
+    data = {"a": [1, "b", None], "nan": float("nan"), "time": dt_util.utcnow()}
+    for indent in (2, 4):
+        assert dumps(data, indent=indent) == json.dumps(
+            data, indent=indent, cls=JSONEncoder
+        )
+    assert dumps({"a": 1}, encoder=json.JSONEncoder) == '{\n    "a": 1\n}'
+
+    with pytest.raises(TypeError):
+        dumps({"bad": object()}, indent=2)
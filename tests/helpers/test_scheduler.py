@@ -0,0 +1,195 @@
+"""Test the time scheduler."""
+from datetime import timedelta
+
+from homeassistant.core import HassJob, callback
+from homeassistant.helpers.event import (
+    async_get_time_scheduler,
+    async_track_point_in_utc_time,
+    async_track_utc_time_change,
+)
+import homeassistant.util.dt as dt_util
+
+from tests.common import async_fire_time_changed
+
+
+async def test_jobs_at_same_time_share_one_timer(hass):
+    """Test jobs due at the same time run from a single timer."""
+    scheduler = async_get_time_scheduler(hass)
+    runs = []
+    point_in_time = dt_util.utcnow() + timedelta(seconds=10)
+
+    for idx in range(3):
+        async_track_point_in_utc_time(
+            hass, callback(lambda now, idx=idx: runs.append((idx, now))), point_in_time
+        )
+    handles = [
+        handle
+        for handle in hass.loop._scheduled
+        if handle._callback == scheduler._async_fire
+    ]
+    assert len(handles) == 1
+
+    stats = scheduler.async_stats()
+    assert stats["scheduled_jobs"] == 3
+    assert stats["points_in_time"] == 1
+
+    async_fire_time_changed(hass, point_in_time + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert runs == [(0, point_in_time), (1, point_in_time), (2, point_in_time)]
+
+    stats = scheduler.async_stats()
+    assert stats["scheduled_jobs"] == 0
+    assert stats["fired_jobs"] == 3
+    assert stats["last_latency"] == 1
+
+
+async def test_due_jobs_run_in_order(hass):
+    """Test all jobs that are due run in the order of their time."""
+    runs = []
+    now = dt_util.utcnow()
+
+    for seconds in (3, 1, 2):
+        async_track_point_in_utc_time(
+            hass,
+            callback(lambda _, seconds=seconds: runs.append(seconds)),
+            now + timedelta(seconds=seconds),
+        )
+
+    async_fire_time_changed(hass, now + timedelta(seconds=5))
+    await hass.async_block_till_done()
+    assert runs == [1, 2, 3]
+
+    stats = async_get_time_scheduler(hass).async_stats()
+    assert stats["last_latency"] == 4
+    assert stats["max_latency"] == 4
+
+
+async def test_cancel_job(hass):
+    """Test a cancelled job does not run and cancelling twice is harmless."""
+    scheduler = async_get_time_scheduler(hass)
+    runs = []
+    point_in_time = dt_util.utcnow() + timedelta(seconds=10)
+
+    cancel = async_track_point_in_utc_time(
+        hass, callback(lambda _: runs.append("cancelled")), point_in_time
+    )
+    async_track_point_in_utc_time(
+        hass, callback(lambda _: runs.append("kept")), point_in_time
+    )
+    cancel()
+    cancel()
+    assert scheduler.async_stats()["scheduled_jobs"] == 1
+
+    async_fire_time_changed(hass, point_in_time + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert runs == ["kept"]
+    assert scheduler.async_stats()["scheduled_jobs"] == 0
+
+
+async def test_cancel_job_due_in_same_pass(hass, caplog):
+    """Test a job cancelled by a job due in the same pass does not run."""
+    runs = []
+    point_in_time = dt_util.utcnow() + timedelta(seconds=10)
+
+    @callback
+    def cancel_other(_):
+        runs.append("first")
+        cancel()
+
+    async_track_point_in_utc_time(hass, cancel_other, point_in_time)
+    cancel = async_track_point_in_utc_time(
+        hass, callback(lambda _: runs.append("cancelled")), point_in_time
+    )
+
+    async_fire_time_changed(hass, point_in_time + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert runs == ["first"]
+    assert "Error running scheduled job" not in caplog.text
+    assert async_get_time_scheduler(hass).async_stats()["scheduled_jobs"] == 0
+
+
+async def test_failing_job_does_not_stop_others(hass, caplog):
+    """Test a job raising does not keep other due jobs from running."""
+    runs = []
+    point_in_time = dt_util.utcnow() + timedelta(seconds=10)
+
+    @callback
+    def failing(_):
+        raise ValueError("boom")
+
+    async_track_point_in_utc_time(hass, failing, point_in_time)
+    async_track_point_in_utc_time(
+        hass, callback(lambda now: runs.append(now)), point_in_time
+    )
+
+    async_fire_time_changed(hass, point_in_time + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert runs == [point_in_time]
+    assert "Error running scheduled job" in caplog.text
+
+
+async def test_identical_patterns_are_deduplicated(hass):
+    """Test listeners of the same time pattern share one scheduled job."""
+    scheduler = async_get_time_scheduler(hass)
+    runs = []
+    now = dt_util.utcnow()
+    next_minute = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+
+    unsubs = [
+        async_track_utc_time_change(
+            hass, callback(lambda now, idx=idx: runs.append((idx, now))), second=0
+        )
+        for idx in range(3)
+    ]
+    async_track_utc_time_change(hass, callback(lambda _: None), second=30)
+
+    stats = scheduler.async_stats()
+    assert stats["time_patterns"] == 2
+    assert stats["time_pattern_listeners"] == 4
+    assert stats["scheduled_jobs"] == 2
+
+    async_fire_time_changed(hass, next_minute + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    fired = next_minute + timedelta(seconds=1)
+    assert runs == [(0, fired), (1, fired), (2, fired)]
+
+    for unsub in unsubs:
+        unsub()
+    stats = scheduler.async_stats()
+    assert stats["time_patterns"] == 1
+    assert stats["scheduled_jobs"] == 1
+
+    async_fire_time_changed(hass, next_minute + timedelta(minutes=1, seconds=1))
+    await hass.async_block_till_done()
+    assert len(runs) == 3
+
+
+async def test_remove_pattern_listener_twice(hass):
+    """Test removing a time pattern listener twice is harmless."""
+    scheduler = async_get_time_scheduler(hass)
+    unsub = async_track_utc_time_change(hass, callback(lambda _: None), second=0)
+    unsub()
+    # The pattern is created again for a new listener
+    async_track_utc_time_change(hass, callback(lambda _: None), second=0)
+    unsub()
+
+    stats = scheduler.async_stats()
+    assert stats["time_patterns"] == 1
+    assert stats["time_pattern_listeners"] == 1
+    assert stats["scheduled_jobs"] == 1
+
+
+async def test_heap_is_compacted(hass):
+    """Test cancelled points in time are dropped from the heap."""
+    scheduler = async_get_time_scheduler(hass)
+    now = dt_util.utcnow()
+    job = HassJob(callback(lambda _: None))
+
+    cancels = [
+        scheduler.async_schedule(job, now + timedelta(seconds=idx + 1))
+        for idx in range(1100)
+    ]
+    for cancel in cancels[1:]:
+        cancel()
+    assert len(scheduler._heap) < 1000
+    assert scheduler.async_stats()["points_in_time"] == 1
@@ -13,6 +13,7 @@ from homeassistant.components import group
 from homeassistant.config import async_process_ha_core_config
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_STARTED,
     LENGTH_METERS,
     LENGTH_MILLIMETERS,
     MASS_GRAMS,
@@ -31,6 +32,7 @@ from homeassistant.util.unit_system import UnitSystem
 
 from tests.common import (
     MockConfigEntry,
+    async_fire_time_changed,
     mock_area_registry,
     mock_device_registry,
     mock_registry,
@@ -3256,6 +3258,153 @@ async def test_cache_garbage_collection():
     )  # pylint: disable=protected-access
 
 
+async def test_templates_share_compiled_template(hass):
+    """Test templates with the same source share the compiled template."""
+    tpl = template.Template("{{ 'shared' }}", hass)
+    tpl2 = template.Template("{{ 'shared' }}", hass)
+    assert tpl.async_render() == tpl2.async_render() == "shared"
+    assert tpl._compiled is tpl2._compiled  # pylint: disable=protected-access
+
+
+async def test_bytecode_cache(hass, hass_storage):
+    """Test the bytecode of compiled templates is stored and loaded."""
+    template_string = "{{ 'from' ~ ' bytecode' }}"
+    await template.async_load_bytecode_cache(hass)
+    tpl = template.Template(template_string, hass)
+    assert tpl.async_render() == "from bytecode"
+    assert template._NO_HASS_ENV.bytecode_cache is None
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    await hass.async_block_till_done()
+    async_fire_time_changed(
+        hass,
+        dt_util.utcnow() + timedelta(seconds=template.BYTECODE_CACHE_SAVE_DELAY),
+    )
+    await hass.async_block_till_done()
+
+    stored = hass_storage[template.BYTECODE_CACHE_STORAGE_KEY]["data"]["templates"]
+    assert len(stored) == 1
+    (key,) = stored
+    assert key.startswith("default-")
+
+    # Compiling after a restart loads the stored bytecode
+    bytecode_cache = template.TemplateBytecodeCache(stored)
+    env = template.TemplateEnvironment(None)
+    env.bytecode_cache = bytecode_cache
+    code = env.compile(template_string)
+    assert (bytecode_cache.hits, bytecode_cache.misses) == (1, 0)
+    assert not bytecode_cache.changed
+    assert template.jinja2.Template.from_code(
+        env, code, env.globals, None
+    ).render() == ("from bytecode")
+
+    # Bytecode that can not be loaded is compiled again
+    bytecode_cache = template.TemplateBytecodeCache(
+        {key: {"compile_time": 1.0, "bytecode": "Z2FyYmFnZQ=="}}
+    )
+    env = template.TemplateEnvironment(None)
+    env.bytecode_cache = bytecode_cache
+    env.compile(template_string)
+    assert (bytecode_cache.hits, bytecode_cache.misses) == (0, 1)
+    assert bytecode_cache.changed
+    bytecode_cache = template.TemplateBytecodeCache(
+        bytecode_cache.as_dict()["templates"]
+    )
+    env = template.TemplateEnvironment(None)
+    env.bytecode_cache = bytecode_cache
+    env.compile(template_string)
+    assert (bytecode_cache.hits, bytecode_cache.misses) == (1, 0)
+
+
+@pytest.mark.parametrize(
+    "template_string,fast",
+    [
+        ("{{ states('sensor.temperature') | float > 20 }}", True),
+        ("{{ states('sensor.temperature') }}", True),
+        ("{{ states('sensor.missing') }}", True),
+        ("{{ states('sensor.text') | float(default=1) }}", True),
+        ("{{ states('sensor.temperature') | round(0) }}", True),
+        ("{{ states('sensor.text') > 20 }}", True),
+        ("{{ is_state('light.kitchen', 'on') }}", True),
+        (
+            "{{ not is_state('light.kitchen', 'on') or is_state('light.missing', 'off') }}",
+            True,
+        ),
+        ("{{ state_attr('light.kitchen', 'brightness') | int >= 100 }}", True),
+        ("{{ state_attr('light.kitchen', 'missing') }}", True),
+        ("{{ is_state_attr('light.kitchen', 'brightness', 128) }}", True),
+        ("{{ states('sensor.temperature') | float + 1 }}", False),
+        ("{{ states.sensor.temperature.state }}", False),
+        ("{{ states('sensor.temperature') }} °C", False),
+        ("{{ is_state(entity, 'on') }}", False),
+    ],
+)
+async def test_fast_render(hass, template_string, fast):
+    """Test templates of common shapes render the same without Jinja."""
+    hass.states.async_set("sensor.temperature", "21.5")
+    hass.states.async_set("sensor.text", "abc")
+    hass.states.async_set("light.kitchen", "on", {"brightness": 128})
+
+    tpl = template.Template(template_string, hass)
+    info = tpl.async_render_to_info({"entity": "light.kitchen"})
+    assert (tpl._fast_render is not None) is fast  # pylint: disable=protected-access
+
+    with patch(
+        "homeassistant.helpers.template._compile_fast_render", return_value=None
+    ):
+        jinja_tpl = template.Template(template_string, hass)
+        jinja_info = jinja_tpl.async_render_to_info({"entity": "light.kitchen"})
+
+    assert info.entities == jinja_info.entities
+    if jinja_info.exception:
+        assert str(info.exception) == str(jinja_info.exception)
+    else:
+        assert info.exception is None
+        assert info.result() == jinja_info.result()
+        assert info.result().__class__ is jinja_info.result().__class__
+        variables = {"entity": "light.kitchen"}
+        assert tpl.async_render(variables, parse_result=False) == (
+            jinja_tpl.async_render(variables, parse_result=False)
+        )
+
+
+async def test_fast_render_shadowed_names(hass):
+    """Test templates render with Jinja when variables shadow functions."""
+    hass.states.async_set("light.kitchen", "on")
+    tpl = template.Template("{{ is_state('light.kitchen', 'on') }}", hass)
+    assert tpl.async_render() is True
+    assert tpl._fast_render is not None  # pylint: disable=protected-access
+    assert tpl.async_render({"is_state": lambda *args: "shadowed"}) == "shadowed"
+    assert tpl.async_render({"states": "not used"}) is True
+
+
+async def test_fast_render_parses_once(hass):
+    """Test checking for a fast render does not parse the templates again."""
+    hass.states.async_set("light.kitchen", "on")
+    source = "{{ is_state('light.kitchen', 'on') }}"
+    env = template.TemplateEnvironment
+    with patch.object(env, "parse", autospec=True, side_effect=env.parse) as parse:
+        tpl = template.Template(source, hass)
+        assert tpl.async_render() is True
+        # The tree parsed to compile the template is used
+        assert not parse.called
+        assert tpl._fast_render is not None  # pylint: disable=protected-access
+
+        # The expression is shared by templates with the same source
+        tpl._env.last_parsed = None  # pylint: disable=protected-access
+        other = template.Template(source, hass)
+        assert other.async_render() is True
+        assert not parse.called
+        assert other._fast_render is not None  # pylint: disable=protected-access
+
+        # Code from a cache has no tree
+        tpl = template.Template("{{ is_state('light.kitchen', 'off') }}", hass)
+        tpl.ensure_valid()
+        tpl._env.last_parsed = None  # pylint: disable=protected-access
+        assert tpl.async_render() is False
+        assert parse.call_count == 1
+
+
 def test_is_template_string():
     """Test is template string."""
     assert template.is_template_string("{{ x }}") is True
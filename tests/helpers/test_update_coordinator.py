@@ -10,8 +10,8 @@ import pytest
 import requests
 
 from homeassistant import config_entries
-from homeassistant.const import EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import CoreState
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED
+from homeassistant.core import CoreState, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import update_coordinator
 from homeassistant.util.dt import utcnow
@@ -313,6 +313,27 @@ async def test_async_set_updated_data(crd):
     assert crd._unsub_refresh is not old_refresh
 
 
+async def test_listener_state_writes_are_batched(hass, crd):
+    """Test the states written by the listeners are fired as one batch."""
+    batches = []
+    hass.bus.async_listen_batch(
+        EVENT_STATE_CHANGED, callback(lambda events: batches.append(events))
+    )
+    for entity_id in ("sensor.one", "sensor.two"):
+        crd.async_add_listener(
+            lambda entity_id=entity_id: hass.states.async_set(entity_id, crd.data)
+        )
+
+    await crd.async_refresh()
+    await hass.async_block_till_done()
+
+    assert len(batches) == 1
+    assert [event.data["entity_id"] for event in batches[0]] == [
+        "sensor.one",
+        "sensor.two",
+    ]
+
+
 async def test_stop_refresh_on_ha_stop(hass, crd):
     """Test no update interval refresh when Home Assistant is stopping."""
     # Add subscriber
@@ -33,6 +33,7 @@ from homeassistant.const import (
 )
 import homeassistant.core as ha
 from homeassistant.exceptions import (
+    HomeAssistantError,
     InvalidEntityFormatError,
     InvalidStateError,
     MaxLengthExceeded,
@@ -383,6 +384,27 @@ def test_state_as_dict():
     assert state.as_dict() is state.as_dict()
 
 
+def test_state_as_dict_json():
+    """Test a State as JSON."""
+    last_time = datetime(1984, 12, 8, 12, 0, 0)
+    state = ha.State(
+        "happy.happy",
+        "on",
+        {"pig": "dog"},
+        last_updated=last_time,
+        last_changed=last_time,
+        context=ha.Context(id="01H0D6K3RFJAYAV2093ZW30PCW"),
+    )
+    expected = (
+        b'{"entity_id":"happy.happy","state":"on","attributes":{"pig":"dog"},'
+        b'"last_changed":"1984-12-08T12:00:00","last_updated":"1984-12-08T12:00:00",'
+        b'"context":{"id":"01H0D6K3RFJAYAV2093ZW30PCW","parent_id":null,"user_id":null}}'
+    )
+    assert state.as_dict_json == expected
+    # 2nd time to verify cache
+    assert state.as_dict_json is state.as_dict_json
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -431,6 +453,142 @@ async def test_eventbus_filtered_listener(hass):
     unsub()
 
 
+async def test_eventbus_entity_listener(hass):
+    """Test listening for events of specific entities and domains."""
+    calls = []
+    old_count = len(hass.bus.async_listeners())
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event.data["entity_id"])
+
+    @ha.callback
+    def filter(event):
+        """Mock filter."""
+        return not event.data.get("filtered")
+
+    unsub = hass.bus.async_listen_entities(
+        "test", listener, entity_ids=["Light.Kitchen", "switch.fan"], domains=["light"]
+    )
+    unsub_filtered = hass.bus.async_listen_entities(
+        "test", listener, entity_ids=["sensor.temp"], event_filter=filter
+    )
+    assert hass.bus.async_listeners()["test"] == 2
+
+    for entity_id in ("light.kitchen", "light.hall", "switch.fan", "switch.other"):
+        hass.bus.async_fire("test", {"entity_id": entity_id})
+    hass.bus.async_fire("test", {"entity_id": "sensor.temp", "filtered": True})
+    hass.bus.async_fire("test", {"entity_id": "sensor.temp"})
+    hass.bus.async_fire("test")
+    hass.bus.async_fire("other", {"entity_id": "light.kitchen"})
+    # Each listener gets an event about several entities once
+    entity_ids = ["light.kitchen", "switch.fan", "sensor.temp", None]
+    hass.bus.async_fire("test", {"entity_id": entity_ids})
+    await hass.async_block_till_done()
+
+    assert calls == [
+        "light.kitchen",
+        "light.hall",
+        "switch.fan",
+        "sensor.temp",
+        entity_ids,
+        entity_ids,
+    ]
+
+    unsub()
+    unsub_filtered()
+    assert len(hass.bus.async_listeners()) == old_count
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+    assert len(calls) == 6
+
+
+async def test_eventbus_entity_listener_update_entities(hass):
+    """Test adding and removing the entities of an entity listener."""
+    calls = []
+    old_count = len(hass.bus.async_listeners())
+
+    unsub = hass.bus.async_listen_entities(
+        "test", lambda event: calls.append(event.data["entity_id"])
+    )
+    hass.bus.async_add_listener_entities(unsub, ["Light.Kitchen", "switch.fan"])
+    hass.bus.async_add_listener_entities(unsub, ["light.kitchen"], domains=["sensor"])
+    assert hass.bus.async_listeners()["test"] == 1
+
+    for entity_id in ("light.kitchen", "switch.fan", "sensor.temp", "light.hall"):
+        hass.bus.async_fire("test", {"entity_id": entity_id})
+    await hass.async_block_till_done()
+    assert calls == ["light.kitchen", "switch.fan", "sensor.temp"]
+
+    hass.bus.async_remove_listener_entities(
+        unsub, ["light.kitchen", "light.hall"], domains=["sensor"]
+    )
+    for entity_id in ("light.kitchen", "switch.fan", "sensor.temp"):
+        hass.bus.async_fire("test", {"entity_id": entity_id})
+    await hass.async_block_till_done()
+    assert calls == ["light.kitchen", "switch.fan", "sensor.temp", "switch.fan"]
+
+    # The listener stays registered without entities
+    hass.bus.async_remove_listener_entities(unsub, ["switch.fan"])
+    assert hass.bus.async_listeners()["test"] == 1
+    hass.bus.async_add_listener_entities(unsub, ["light.hall"])
+    hass.bus.async_fire("test", {"entity_id": "light.hall"})
+    await hass.async_block_till_done()
+    assert calls[-1] == "light.hall"
+
+    unsub()
+    assert len(hass.bus.async_listeners()) == old_count
+
+
+async def test_eventbus_entity_listener_filter_must_be_callback(hass):
+    """Test the event filter of an entity listener must be a callback."""
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen_entities(
+            "test", lambda event: None, entity_ids=["light.kitchen"], event_filter=bool
+        )
+
+
+async def test_eventbus_batch_listener(hass):
+    """Test listening for batches of events."""
+    batches = []
+    single = []
+    old_count = len(hass.bus.async_listeners())
+
+    @ha.callback
+    def filter(event):
+        """Mock filter."""
+        return not event.data.get("filtered")
+
+    unsub = hass.bus.async_listen_batch(
+        "test", lambda events: batches.append(list(events)), event_filter=filter
+    )
+    hass.bus.async_listen("test", lambda event: single.append(event))
+    assert hass.bus.async_listeners()["test"] == 2
+
+    events = [ha.Event("test", {"idx": idx}) for idx in range(3)]
+    hass.bus.async_fire_batch(events)
+    hass.bus.async_fire("test", {"idx": 3})
+    hass.bus.async_fire("test", {"filtered": True})
+    hass.bus.async_fire_batch([ha.Event("test", {"filtered": True})])
+    await hass.async_block_till_done()
+
+    assert batches == [events, [single[3]]]
+    assert single[:3] == events
+    assert len(single) == 6
+
+    unsub()
+    assert hass.bus.async_listeners()["test"] == 1
+    hass.bus.async_fire_batch(events)
+    await hass.async_block_till_done()
+    assert len(batches) == 2
+    assert len(hass.bus.async_listeners()) == old_count + 1
+
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen_batch("test", lambda events: None, event_filter=bool)
+
+
 async def test_eventbus_unsubscribe_listener(hass):
     """Test unsubscribe listener from returned function."""
     calls = []
@@ -728,6 +886,52 @@ async def test_statemachine_force_update(hass):
     assert len(events) == 1
 
 
+async def test_statemachine_set_many(hass):
+    """Test state changes set together are fired as one batch."""
+    hass.states.async_set("light.bowl", "on")
+    batches = []
+    hass.bus.async_listen_batch(
+        EVENT_STATE_CHANGED, ha.callback(lambda events: batches.append(events))
+    )
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    hass.states.async_set_many(
+        [
+            ("light.bowl", "on", None),
+            ("light.kitchen", "off", {"brightness": 10}),
+            ("switch.fan", "on", None),
+        ]
+    )
+    await hass.async_block_till_done()
+
+    # Unchanged states are not part of the batch
+    assert len(batches) == 1
+    assert [event.data["entity_id"] for event in batches[0]] == [
+        "light.kitchen",
+        "switch.fan",
+    ]
+    assert events == list(batches[0])
+    assert hass.states.get("light.kitchen").attributes == {"brightness": 10}
+
+    with hass.states.async_batch():
+        hass.states.async_set("light.bowl", "off")
+        with hass.states.async_batch():
+            hass.states.async_remove("switch.fan")
+        # States are set right away, events are fired when the batch ends
+        assert hass.states.get("light.bowl").state == "off"
+        assert hass.states.get("switch.fan") is None
+        assert len(events) == 2
+
+    await hass.async_block_till_done()
+    assert len(batches) == 2
+    assert [
+        (event.data["entity_id"], event.data["new_state"]) for event in events[2:]
+    ] == [
+        ("light.bowl", hass.states.get("light.bowl")),
+        ("switch.fan", None),
+    ]
+
+
 def test_service_call_repr():
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")